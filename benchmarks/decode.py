@@ -0,0 +1,35 @@
+"""Compares decoding through `BaseTag.load_from_buffer` with `nbt_helper.decoder`.
+
+Usage: python -m benchmarks.decode [entities] [repeat]
+"""
+
+import sys
+import timeit
+from io import BytesIO
+
+from nbt_helper.decoder import decode
+from nbt_helper.tags import BinaryHandler, ByteOrder, TagCompound, TagString
+from benchmarks.tag_memory import make_data
+
+
+def load_from_buffer(data: bytes) -> TagCompound:
+    handler = BinaryHandler(ByteOrder.BIG)
+    buffer = BytesIO(data)
+    buffer.seek(1)
+    name = TagString(handler, buffer=buffer).value
+    return TagCompound(handler, name=name, buffer=buffer)
+
+
+def main() -> None:
+    entities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    data = make_data(entities)
+    assert load_from_buffer(data) == decode(data)[0]
+
+    for name, func in (("load_from_buffer", load_from_buffer), ("decoder", decode)):
+        best = min(timeit.repeat(lambda: func(data), number=1, repeat=repeat))
+        print(f"{name:>16}: {best * 1000:.1f} ms ({len(data) / best / 1e6:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measures memory used by decoded tags.
+
+Usage: python benchmarks/tag_memory.py [entities]
+"""
+
+import sys
+import tracemalloc
+from io import BytesIO
+
+from nbt_helper.file import JE_Uncompressed
+from nbt_helper.tags import (
+    BinaryHandler,
+    ByteOrder,
+    TagCompound,
+    TagDouble,
+    TagInt,
+    TagList,
+    TagString,
+)
+
+
+def make_data(entities: int) -> bytes:
+    handler = BinaryHandler(ByteOrder.BIG)
+    items = [
+        TagCompound(
+            handler,
+            value=[
+                TagString(handler, name="id", value="minecraft:chest"),
+                TagInt(handler, name="x", value=index),
+                TagInt(handler, name="y", value=64),
+                TagInt(handler, name="z", value=-index),
+                TagList(
+                    handler,
+                    name="Motion",
+                    value=[TagDouble(handler, value=0.5) for _ in range(3)],
+                ),
+            ],
+        )
+        for index in range(entities)
+    ]
+    buffer = BytesIO()
+    JE_Uncompressed.write(
+        TagCompound(handler, value=[TagList(handler, name="Entities", value=items)]), buffer
+    )
+    return buffer.getvalue()
+
+
+def count_tags(tag) -> int:
+    if isinstance(tag, (TagCompound, TagList)):
+        return 1 + sum(count_tags(item) for item in tag)
+    return 1
+
+
+def main() -> None:
+    entities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = make_data(entities)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = JE_Uncompressed.read(BytesIO(data))
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    tags = count_tags(root)
+    print(f"{tags} tags, {used} bytes, {used / tags:.1f} bytes per tag")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
 from . import region
 from . import tags
 from . import file
+from . import compression
+from . import world
+from . import stream
+from . import decoder
+from . import blocks
+from . import transcode
 
 __version__ = "0.4.0"
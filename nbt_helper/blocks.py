@@ -0,0 +1,257 @@
+__all__ = [
+    "SECTION_VOLUME",
+    "BIOME_VOLUME",
+    "HEIGHTMAP_AREA",
+    "BLOCK_MIN_BITS",
+    "BIOME_MIN_BITS",
+    "bits_for_palette",
+    "unpack_long_array",
+    "pack_long_array",
+    "PalettedContainer",
+    "Section",
+    "get_sections",
+    "get_heightmap",
+    "block_histogram",
+    "count_blocks",
+]
+
+import sys
+from array import array
+from collections import Counter
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
+
+from nbt_helper.tags import BaseTag, TagCompound
+
+SECTION_VOLUME = 16 * 16 * 16
+BIOME_VOLUME = 4 * 4 * 4
+HEIGHTMAP_AREA = 16 * 16
+MAX_BITS = 16
+BLOCK_MIN_BITS = 4
+BIOME_MIN_BITS = 1
+
+LongArray = Union[array, Sequence[int]]
+
+_LOW_NIBBLES = bytes(value & 0xF for value in range(256))
+_HIGH_NIBBLES = bytes(value >> 4 for value in range(256))
+
+
+def _as_unsigned(values: LongArray) -> memoryview:
+    """Returns values of the long array as unsigned 64-bit integers without copying if possible."""
+
+    if not isinstance(values, array) or values.typecode not in "qQ":
+        values = array("q", values)
+    return memoryview(values).cast("B").cast("Q")
+
+
+def _bits_per_entry(count: int, longs: int) -> int:
+    """Entries never span two longs, so the number of bits follows from the array length.
+
+    Several widths may give the same length (for example, 3 and 4 bits for 64 entries), the smallest width that fits
+    is returned, so it is only valid when data has no palette (heightmaps always use the smallest width).
+    """
+
+    values_per_long = -(-count // longs)
+    return 64 // values_per_long
+
+
+def unpack_long_array(
+    values: LongArray, count: int, bits: Optional[int] = None
+) -> array:
+    """Unpacks entries of a packed long array (block states, biomes, heightmaps) into `array.array("H")`.
+
+    Entries are stored from the least significant bits and never span two longs (format used since 1.16).
+    All widths are unpacked in bulk: 4 and 8 bits per entry with byte operations, other widths lane by lane
+    with shifts and masks over the whole array as a single integer.
+
+    Args:
+        count (int): number of entries, for example `SECTION_VOLUME`.
+        bits (Optional[int], optional): bits per entry. If None, it is computed from the array length, which is correct
+            for heightmaps but ambiguous for paletted data, use `bits_for_palette` for it. Defaults to None.
+
+    Raises:
+        ValueError: if the array is too short or bits per entry is not in range 1-16.
+    """
+
+    longs = _as_unsigned(values)
+    if not longs:
+        return array("H", bytes(count * 2))
+    if bits is None:
+        bits = _bits_per_entry(count, len(longs))
+    if not 0 < bits <= MAX_BITS:
+        raise ValueError(f"Bits per entry must be in range 1-{MAX_BITS}.")
+    values_per_long = 64 // bits
+    if len(longs) * values_per_long < count:
+        raise ValueError("Long array is too short.")
+
+    data = longs.tobytes()
+    if sys.byteorder == "big":
+        swapped = array("Q", data)
+        swapped.byteswap()
+        data = swapped.tobytes()
+
+    if bits == 8:
+        return array("H", array("B", data[:count]))
+    if bits == 4:
+        nibbles = bytearray(len(data) * 2)
+        nibbles[0::2] = data.translate(_LOW_NIBBLES)
+        nibbles[1::2] = data.translate(_HIGH_NIBBLES)
+        return array("H", array("B", nibbles[:count]))
+
+    # Entry k of every long is extracted at once: the array is shifted by k entries as a single integer
+    # and masked with the entry mask repeated for every long. Entries then sit in the low 2 bytes of 8-byte slots.
+    longs_count = len(longs)
+    packed = int.from_bytes(data, "little")
+    mask = int.from_bytes(((1 << bits) - 1).to_bytes(8, "little") * longs_count, "little")
+    result = array("H", bytes(2 * longs_count * values_per_long))
+    lane = bytearray(2 * longs_count)
+    for index in range(values_per_long):
+        slots = ((packed >> (index * bits)) & mask).to_bytes(8 * longs_count, "little")
+        lane[0::2] = slots[0::8]
+        lane[1::2] = slots[1::8]
+        entries = array("H", lane)
+        if sys.byteorder == "big":
+            entries.byteswap()
+        result[index::values_per_long] = entries
+    del result[count:]
+    return result
+
+
+def pack_long_array(values: Sequence[int], bits: int) -> array:
+    """Packs entries into `array.array("q")` in the format read by `unpack_long_array`."""
+
+    if not 0 < bits <= MAX_BITS:
+        raise ValueError(f"Bits per entry must be in range 1-{MAX_BITS}.")
+    values_per_long = 64 // bits
+    longs = array("Q", bytes(8 * -(-len(values) // values_per_long)))
+    for index, value in enumerate(values):
+        longs[index // values_per_long] |= value << (index % values_per_long * bits)
+    return array("q", longs.tobytes())
+
+
+def bits_for_palette(palette_size: int, min_bits: int = BIOME_MIN_BITS) -> int:
+    """Returns bits per entry of paletted data: enough bits for every palette index, but not less than `min_bits`
+    (`BLOCK_MIN_BITS` for block states, `BIOME_MIN_BITS` for biomes)."""
+
+    return max(min_bits, (palette_size - 1).bit_length())
+
+
+def _palette_name(tag: BaseTag) -> str:
+    if isinstance(tag, TagCompound):
+        return tag.get_value("Name", "")
+    return tag.value
+
+
+class PalettedContainer(NamedTuple):
+    palette: list
+    """Palette tags: compounds with "Name" and "Properties" for blocks, strings for biomes."""
+    indices: array
+    """Palette index of every entry, `array.array("H")`."""
+
+    @classmethod
+    def from_tag(
+        cls, container: TagCompound, count: int, min_bits: int = BIOME_MIN_BITS
+    ) -> "PalettedContainer":
+        """Reads "palette" and "data" tags (or "Palette" and "BlockStates" of 1.16-1.17 sections).
+
+        Args:
+            min_bits (int, optional): minimum bits per entry, see `bits_for_palette`. Defaults to BIOME_MIN_BITS.
+        """
+
+        palette = list(container.get_tag("palette") or container.get_tag("Palette") or ())
+        data = container.get_tag("data") or container.get_tag("BlockStates")
+        values = data.value if data is not None else ()
+        bits = bits_for_palette(len(palette), min_bits)
+        return cls(palette, unpack_long_array(values, count, bits))
+
+    def get(self, index: int) -> BaseTag:
+        return self.palette[self.indices[index]]
+
+    def histogram(self) -> Counter:
+        """Returns number of entries by palette name."""
+
+        result: Counter = Counter()
+        for index, count in Counter(self.indices).items():
+            result[_palette_name(self.palette[index])] += count
+        return result
+
+
+class Section(NamedTuple):
+    y: int
+    blocks: Optional[PalettedContainer]
+    biomes: Optional[PalettedContainer]
+
+    def get_block(self, x: int, y: int, z: int) -> BaseTag:
+        """Returns palette entry of the block by its coordinates inside the section (0-15)."""
+
+        return self.blocks.get((y * 16 + z) * 16 + x)  # type: ignore
+
+    def get_biome(self, x: int, y: int, z: int) -> BaseTag:
+        """Returns biome by block coordinates inside the section (0-15), biomes are stored per 4x4x4 cells."""
+
+        return self.biomes.get(((y >> 2) * 4 + (z >> 2)) * 4 + (x >> 2))  # type: ignore
+
+
+def get_sections(chunk_data: TagCompound) -> list[Section]:
+    """Decodes block states and biomes of all chunk sections.
+
+    Supports "sections" of 1.18+ chunks and "Level"/"Sections" of 1.16-1.17 chunks.
+    """
+
+    sections = chunk_data.get_tag("sections")
+    if sections is None:
+        level = chunk_data.get_tag("Level")
+        if level is not None:
+            sections = level.get_tag("Sections")
+
+    result = []
+    for section in sections or ():
+        blocks = section.get_tag("block_states")
+        if blocks is None and "Palette" in section:
+            blocks = section
+        biomes = section.get_tag("biomes")
+        result.append(
+            Section(
+                section.get_value("Y", 0),
+                PalettedContainer.from_tag(blocks, SECTION_VOLUME, BLOCK_MIN_BITS)
+                if blocks
+                else None,
+                PalettedContainer.from_tag(biomes, BIOME_VOLUME, BIOME_MIN_BITS)
+                if biomes
+                else None,
+            )
+        )
+    return result
+
+
+def get_heightmap(chunk_data: TagCompound, name: str = "WORLD_SURFACE") -> Optional[array]:
+    """Returns 256 heights of the heightmap (index is `z * 16 + x`) or None if there is no such heightmap.
+
+    Heights are stored relative to the bottom of the world, as in the chunk data.
+    """
+
+    heightmaps = chunk_data.get_tag("Heightmaps")
+    if heightmaps is None:
+        level = chunk_data.get_tag("Level")
+        heightmaps = level.get_tag("Heightmaps") if level is not None else None
+    if heightmaps is None or name not in heightmaps:
+        return None
+    return unpack_long_array(heightmaps[name].value, HEIGHTMAP_AREA)
+
+
+def block_histogram(chunk_data: TagCompound) -> Counter:
+    """Returns number of blocks by name in the whole chunk."""
+
+    result: Counter = Counter()
+    for section in get_sections(chunk_data):
+        if section.blocks is not None:
+            result.update(section.blocks.histogram())
+    return result
+
+
+def count_blocks(chunk_data: TagCompound, names: Union[str, Iterable[str]]) -> int:
+    """Returns number of blocks with the given names, for example "minecraft:diamond_ore"."""
+
+    if isinstance(names, str):
+        names = (names,)
+    histogram = block_histogram(chunk_data)
+    return sum(histogram[name] for name in set(names))
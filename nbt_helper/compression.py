@@ -0,0 +1,479 @@
+__all__ = [
+    "Codec",
+    "UncompressedCodec",
+    "GzipCodec",
+    "ZlibCodec",
+    "LZ4Codec",
+    "CODECS",
+    "register_codec",
+    "get_codec",
+    "DecompressingReader",
+    "CompressingWriter",
+    "decompress_stream",
+    "compress_stream",
+]
+
+import io
+import gzip
+import zlib
+import struct
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional, Union
+
+try:
+    import lz4.block as lz4_block  # type: ignore
+except ImportError:
+    lz4_block = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+UNCOMPRESSED = 0
+GZIP_COMPRESSED = 1
+ZLIB_COMPRESSED = 2
+LZ4_COMPRESSED = 4
+
+STREAM_CHUNK_SIZE = 1 << 16
+"""Size of chunks read from and written to the underlying file by streaming readers and writers."""
+
+
+class Codec(ABC):
+    """This class describes interface of compression codecs used for chunk payloads and NBT files."""
+
+    @abstractmethod
+    def compress(self, data: BytesLike, level: Optional[int] = None) -> bytes:
+        """Compresses data.
+
+        Args:
+            level (Optional[int], optional): codec specific compression level, codec default is used if None. Defaults to None.
+        """
+
+    @abstractmethod
+    def decompress(self, data: BytesLike) -> bytes: ...
+
+    def decompressobj(self):
+        """Returns object with `decompress(data)` and `flush()` methods for streaming decompression.
+
+        By default, data is collected and decompressed on `flush`.
+        """
+
+        return _BufferedDecompressor(self)
+
+    def compressobj(self, level: Optional[int] = None):
+        """Returns object with `compress(data)` and `flush()` methods for streaming compression.
+
+        By default, data is collected and compressed on `flush`.
+        """
+
+        return _BufferedCompressor(self, level)
+
+
+class _BufferedCompressor:
+    def __init__(self, codec: Codec, level: Optional[int]) -> None:
+        self._codec = codec
+        self._level = level
+        self._data = bytearray()
+
+    def compress(self, data: BytesLike) -> bytes:
+        self._data += data
+        return b""
+
+    def flush(self) -> bytes:
+        data, self._data = self._data, bytearray()
+        return self._codec.compress(data, self._level)
+
+
+class _BufferedDecompressor:
+    def __init__(self, codec: Codec) -> None:
+        self._codec = codec
+        self._data = bytearray()
+
+    def decompress(self, data: BytesLike) -> bytes:
+        self._data += data
+        return b""
+
+    def flush(self) -> bytes:
+        data, self._data = self._data, bytearray()
+        return self._codec.decompress(data)
+
+
+class _PassThrough:
+    def compress(self, data: BytesLike) -> bytes:
+        return bytes(data)
+
+    def decompress(self, data: BytesLike) -> bytes:
+        return bytes(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class UncompressedCodec(Codec):
+    def compress(self, data: BytesLike, level: Optional[int] = None) -> bytes:
+        return bytes(data)
+
+    def decompress(self, data: BytesLike) -> bytes:
+        return bytes(data)
+
+    def decompressobj(self):
+        return _PassThrough()
+
+    def compressobj(self, level: Optional[int] = None):
+        return _PassThrough()
+
+
+class GzipCodec(Codec):
+    def compress(self, data: BytesLike, level: Optional[int] = None) -> bytes:
+        return gzip.compress(data, 9 if level is None else level)
+
+    def decompress(self, data: BytesLike) -> bytes:
+        return gzip.decompress(data)
+
+    def decompressobj(self):
+        return zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+    def compressobj(self, level: Optional[int] = None):
+        return zlib.compressobj(9 if level is None else level, wbits=zlib.MAX_WBITS | 16)
+
+
+class ZlibCodec(Codec):
+    def compress(self, data: BytesLike, level: Optional[int] = None) -> bytes:
+        return zlib.compress(data, -1 if level is None else level)
+
+    def decompress(self, data: BytesLike) -> bytes:
+        return zlib.decompress(data)
+
+    def decompressobj(self):
+        return zlib.decompressobj()
+
+    def compressobj(self, level: Optional[int] = None):
+        return zlib.compressobj(-1 if level is None else level)
+
+
+LZ4_MAGIC = b"LZ4Block"
+LZ4_BLOCK_SIZE = 1 << 16
+LZ4_METHOD_RAW = 0x10
+LZ4_METHOD_LZ4 = 0x20
+LZ4_SEED = 0x9747B28C
+_LZ4_HEADER = struct.Struct("<8sBiii")
+
+_XXH_PRIME1 = 2654435761
+_XXH_PRIME2 = 2246822519
+_XXH_PRIME3 = 3266489917
+_XXH_PRIME4 = 668265263
+_XXH_PRIME5 = 374761393
+_MASK32 = 0xFFFFFFFF
+
+
+def _rotl32(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (32 - shift))) & _MASK32
+
+
+def xxhash32(data: BytesLike, seed: int = 0) -> int:
+    """Pure Python implementation of the XXH32 hash function."""
+
+    data = memoryview(data).cast("B")
+    length = len(data)
+    stripes_end = length - length % 16
+
+    if length >= 16:
+        v1 = (seed + _XXH_PRIME1 + _XXH_PRIME2) & _MASK32
+        v2 = (seed + _XXH_PRIME2) & _MASK32
+        v3 = seed & _MASK32
+        v4 = (seed - _XXH_PRIME1) & _MASK32
+        for a, b, c, d in struct.iter_unpack("<4I", data[:stripes_end]):
+            v1 = _rotl32((v1 + a * _XXH_PRIME2) & _MASK32, 13) * _XXH_PRIME1 & _MASK32
+            v2 = _rotl32((v2 + b * _XXH_PRIME2) & _MASK32, 13) * _XXH_PRIME1 & _MASK32
+            v3 = _rotl32((v3 + c * _XXH_PRIME2) & _MASK32, 13) * _XXH_PRIME1 & _MASK32
+            v4 = _rotl32((v4 + d * _XXH_PRIME2) & _MASK32, 13) * _XXH_PRIME1 & _MASK32
+        result = (
+            _rotl32(v1, 1) + _rotl32(v2, 7) + _rotl32(v3, 12) + _rotl32(v4, 18)
+        ) & _MASK32
+    else:
+        stripes_end = 0
+        result = (seed + _XXH_PRIME5) & _MASK32
+
+    result = (result + length) & _MASK32
+    position = stripes_end
+    while position + 4 <= length:
+        (word,) = struct.unpack_from("<I", data, position)
+        result = _rotl32((result + word * _XXH_PRIME3) & _MASK32, 17) * _XXH_PRIME4
+        result &= _MASK32
+        position += 4
+    while position < length:
+        result = _rotl32((result + data[position] * _XXH_PRIME5) & _MASK32, 11)
+        result = result * _XXH_PRIME1 & _MASK32
+        position += 1
+
+    result ^= result >> 15
+    result = result * _XXH_PRIME2 & _MASK32
+    result ^= result >> 13
+    result = result * _XXH_PRIME3 & _MASK32
+    result ^= result >> 16
+    return result
+
+
+def lz4_block_decompress(data: BytesLike, size: int) -> bytes:
+    """Decompresses a single raw LZ4 block, `size` is the size of decompressed data."""
+
+    if lz4_block is not None:
+        return lz4_block.decompress(data, uncompressed_size=size)
+
+    src = memoryview(data).cast("B")
+    dst = bytearray()
+    position = 0
+    end = len(src)
+    while position < end:
+        token = src[position]
+        position += 1
+
+        literals = token >> 4
+        if literals == 15:
+            while True:
+                extra = src[position]
+                position += 1
+                literals += extra
+                if extra != 255:
+                    break
+        dst += src[position : position + literals]
+        position += literals
+        if position >= end:
+            break
+
+        offset = src[position] | (src[position + 1] << 8)
+        position += 2
+        if offset == 0 or offset > len(dst):
+            raise ValueError("Corrupted LZ4 block: wrong match offset.")
+
+        match_length = token & 15
+        if match_length == 15:
+            while True:
+                extra = src[position]
+                position += 1
+                match_length += extra
+                if extra != 255:
+                    break
+        match_length += 4
+
+        start = len(dst) - offset
+        if offset >= match_length:
+            dst += dst[start : start + match_length]
+        else:
+            pattern = dst[start:]
+            dst += (pattern * (match_length // offset + 1))[:match_length]
+
+    if len(dst) != size:
+        raise ValueError("Corrupted LZ4 block: wrong decompressed size.")
+    return bytes(dst)
+
+
+class LZ4Codec(Codec):
+    """LZ4 codec compatible with the block stream format of lz4-java (`LZ4BlockOutputStream`).
+
+    The `lz4` package is used if it is installed. Otherwise, blocks are decompressed in pure Python
+    and written without compression (this is still a valid stream).
+    """
+
+    def compress(self, data: BytesLike, level: Optional[int] = None) -> bytes:
+        data = memoryview(data).cast("B")
+        result = bytearray()
+        compression_level = max(LZ4_BLOCK_SIZE.bit_length() - 1 - 10, 0)
+        for start in range(0, len(data), LZ4_BLOCK_SIZE):
+            block = data[start : start + LZ4_BLOCK_SIZE]
+            method, payload = LZ4_METHOD_RAW, bytes(block)
+            if lz4_block is not None:
+                mode = "default" if level is None or level < 3 else "high_compression"
+                compressed = lz4_block.compress(
+                    block, mode=mode, compression=level or 0, store_size=False
+                )
+                if len(compressed) < len(block):
+                    method, payload = LZ4_METHOD_LZ4, compressed
+            checksum = xxhash32(block, LZ4_SEED) & 0xFFFFFFF
+            result += _LZ4_HEADER.pack(
+                LZ4_MAGIC,
+                method | compression_level,
+                len(payload),
+                len(block),
+                checksum,
+            )
+            result += payload
+
+        result += _LZ4_HEADER.pack(
+            LZ4_MAGIC, LZ4_METHOD_RAW | compression_level, 0, 0, 0
+        )
+        return bytes(result)
+
+    def decompress(self, data: BytesLike) -> bytes:
+        data = memoryview(data).cast("B")
+        result = bytearray()
+        position = 0
+        while position < len(data):
+            magic, token, compressed_length, length, checksum = _LZ4_HEADER.unpack_from(
+                data, position
+            )
+            if magic != LZ4_MAGIC:
+                raise ValueError("Corrupted LZ4 stream: wrong magic number.")
+            position += _LZ4_HEADER.size
+            if length == 0:
+                break
+
+            payload = data[position : position + compressed_length]
+            position += compressed_length
+            method = token & 0xF0
+            if method == LZ4_METHOD_RAW:
+                block = bytes(payload)
+            elif method == LZ4_METHOD_LZ4:
+                block = lz4_block_decompress(payload, length)
+            else:
+                raise ValueError(f"Unknown LZ4 compression method {method}.")
+
+            if xxhash32(block, LZ4_SEED) & 0xFFFFFFF != checksum:
+                raise ValueError("Corrupted LZ4 stream: wrong checksum.")
+            result += block
+        return bytes(result)
+
+
+CODECS: dict[int, Codec] = {
+    UNCOMPRESSED: UncompressedCodec(),
+    GZIP_COMPRESSED: GzipCodec(),
+    ZLIB_COMPRESSED: ZlibCodec(),
+    LZ4_COMPRESSED: LZ4Codec(),
+}
+
+
+def register_codec(compression: int, codec: Codec) -> None:
+    """Registers codec for the compression type (0-127), replaces existing one."""
+
+    if not 0 <= compression < 128:
+        raise ValueError("Compression type must be in range 0-127.")
+    CODECS[compression] = codec
+
+
+def get_codec(compression: int) -> Codec:
+    """Returns codec for the compression type.
+
+    Raises:
+        ValueError: if there is no codec for the compression type.
+    """
+
+    try:
+        return CODECS[compression]
+    except KeyError:
+        raise ValueError(f"Undefined compression type {compression}")
+
+
+def _check_eof(decompressor) -> None:
+    """Checks that the whole compressed stream was read, when the decompressor knows where the stream ends.
+
+    Raises:
+        ValueError: if the source ended before the end of the compressed stream.
+    """
+
+    if not getattr(decompressor, "eof", True):
+        raise ValueError("Compressed stream is truncated.")
+
+
+class DecompressingReader(io.RawIOBase):
+    """Readable stream of decompressed data, the source is read and decompressed in chunks of `STREAM_CHUNK_SIZE`.
+
+    Wrap it in `io.BufferedReader` when data is read in many small parts (for example, tag by tag).
+    """
+
+    def __init__(self, source: BinaryIO, codec: Codec) -> None:
+        self._source = source
+        self._decompressor = codec.decompressobj()
+        # zlib decompressors can limit the size of the output, so a small chunk of the source never expands too much.
+        self._limited = hasattr(self._decompressor, "unconsumed_tail")
+        self._pending = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._eof:
+            self._pending = memoryview(self._decompress())
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def _decompress(self) -> bytes:
+        if self._limited:
+            if getattr(self._decompressor, "eof", False):
+                self._eof = True
+                return b""
+            data = self._decompressor.unconsumed_tail or self._source.read(
+                STREAM_CHUNK_SIZE
+            )
+            if data:
+                return self._decompressor.decompress(data, STREAM_CHUNK_SIZE)
+        else:
+            data = self._source.read(STREAM_CHUNK_SIZE)
+            if data:
+                return self._decompressor.decompress(data)
+        self._eof = True
+        data = self._decompressor.flush()
+        _check_eof(self._decompressor)
+        return data
+
+
+class CompressingWriter(io.RawIOBase):
+    """Writable stream that compresses data straight into the target file.
+
+    Wrap it in `io.BufferedWriter` when data is written in many small parts. `close` writes the rest of compressed data,
+    but does not close the target.
+    """
+
+    def __init__(
+        self, target: BinaryIO, codec: Codec, level: Optional[int] = None
+    ) -> None:
+        self._target = target
+        self._compressor = codec.compressobj(level)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        compressed = self._compressor.compress(data)
+        if compressed:
+            self._target.write(compressed)
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._target.write(self._compressor.flush())
+        super().close()
+
+
+def decompress_stream(source: BinaryIO, codec: Codec) -> bytearray:
+    """Decompresses the rest of the source into a single buffer.
+
+    The source is read in chunks of `STREAM_CHUNK_SIZE`, so the whole compressed data is never kept in memory
+    together with the result.
+    """
+
+    decompressor = codec.decompressobj()
+    result = bytearray()
+    while True:
+        data = source.read(STREAM_CHUNK_SIZE)
+        if not data:
+            break
+        result += decompressor.decompress(data)
+    result += decompressor.flush()
+    _check_eof(decompressor)
+    return result
+
+
+def compress_stream(
+    data: BytesLike, target: BinaryIO, codec: Codec, level: Optional[int] = None
+) -> None:
+    """Compresses the data into the target in slices of `STREAM_CHUNK_SIZE`, so the whole compressed data is never
+    kept in memory."""
+
+    compressor = codec.compressobj(level)
+    view = memoryview(data).cast("B")
+    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+        compressed = compressor.compress(view[offset : offset + STREAM_CHUNK_SIZE])
+        if compressed:
+            target.write(compressed)
+    target.write(compressor.flush())
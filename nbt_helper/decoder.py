@@ -0,0 +1,371 @@
+__all__ = ["Decoder", "get_decoder", "decode"]
+
+import struct
+from array import array
+from typing import Callable, Optional, Union
+
+from nbt_helper.tags import (
+    TAG_SIZES,
+    ARRAY_ITEM_SIZES,
+    NATIVE_BYTE_ORDER,
+    TAGS,
+    BaseTag,
+    ByteOrder,
+    TagByte,
+    TagShort,
+    TagInt,
+    TagLong,
+    TagFloat,
+    TagDouble,
+    TagByteArray,
+    TagString,
+    TagList,
+    TagCompound,
+    TagIntArray,
+    TagLongArray,
+    TAG_END,
+    TAG_BYTE,
+    TAG_SHORT,
+    TAG_INT,
+    TAG_LONG,
+    TAG_FLOAT,
+    TAG_DOUBLE,
+    TAG_BYTE_ARRAY,
+    TAG_STRING,
+    TAG_LIST,
+    TAG_COMPOUND,
+    TAG_INT_ARRAY,
+    TAG_LONG_ARRAY,
+)
+
+BytesLike = Union[bytes, bytearray, memoryview]
+Reader = Callable[[BytesLike, int, str], tuple[BaseTag, int]]
+
+_new = object.__new__
+
+_NUMBER_TAGS = {
+    TAG_BYTE: (TagByte, "b"),
+    TAG_SHORT: (TagShort, "h"),
+    TAG_INT: (TagInt, "i"),
+    TAG_LONG: (TagLong, "q"),
+    TAG_FLOAT: (TagFloat, "f"),
+    TAG_DOUBLE: (TagDouble, "d"),
+}
+
+
+def _make_tag(tag_cls: type, name: str, value) -> BaseTag:
+    tag = _new(tag_cls)
+    tag.name = name
+    tag.value = value
+    return tag
+
+
+class Decoder:
+    """Decodes NBT data from `bytes`, `bytearray` or `memoryview` with an integer offset and `struct.unpack_from`.
+
+    It is a faster alternative to `BaseTag.load_from_buffer`: there are no intermediate buffer reads,
+    tags are created without calling their constructors and readers are dispatched by tag id with a table.
+    """
+
+    def __init__(self, byte_order: ByteOrder = ByteOrder.BIG) -> None:
+        self._byte_order = byte_order
+        self._order = byte_order.value
+        self._ushort = struct.Struct(f"{self._order}H")
+        self._int = struct.Struct(f"{self._order}i")
+        self._swap = byte_order is not NATIVE_BYTE_ORDER
+
+        self._readers: dict[int, Reader] = {
+            TAG_BYTE_ARRAY: self._read_byte_array,
+            TAG_STRING: self._read_string,
+            TAG_LIST: self._read_list,
+            TAG_COMPOUND: self._read_compound,
+            TAG_INT_ARRAY: self._array_reader(TagIntArray),
+            TAG_LONG_ARRAY: self._array_reader(TagLongArray),
+        }
+        for tag_id, (tag_cls, fmt) in _NUMBER_TAGS.items():
+            self._readers[tag_id] = self._number_reader(tag_cls, fmt)
+
+    def get_byte_order(self) -> ByteOrder:
+        return self._byte_order
+
+    def decode(
+        self,
+        data: BytesLike,
+        offset: int = 0,
+        tag_id: Optional[int] = None,
+        lazy: bool = False,
+    ) -> tuple[BaseTag, int]:
+        """Decodes a single tag.
+
+        Args:
+            offset (int, optional): position of the tag in the data. Defaults to 0.
+            tag_id (Optional[int], optional): if specified, the data holds only the payload of unnamed tag with this id.
+                Otherwise, the data starts with tag id and name. Defaults to None.
+            lazy (bool, optional): if True, only the top level of the tag is decoded. Nested compounds and lists keep
+                their payload as raw bytes (a `memoryview` of `bytes` data without copying), they are decoded on first access
+                and written back as is while untouched. Defaults to False.
+
+        Returns:
+            tuple[BaseTag, int]: decoded tag and offset right after it.
+
+        Raises:
+            ValueError: if the data is truncated or contains unknown tag id.
+        """
+
+        try:
+            name = ""
+            if tag_id is None:
+                tag_id = data[offset]
+                name, offset = self._read_name(data, offset + 1)
+            if lazy and tag_id == TAG_COMPOUND:
+                return self._read_lazy_compound(data, offset, name)
+            if lazy and tag_id == TAG_LIST:
+                return self._read_lazy_list(data, offset, name)
+            return self._get_reader(tag_id)(data, offset, name)
+        except (struct.error, IndexError) as error:
+            raise ValueError("NBT data is truncated.") from error
+
+    def skip(self, data: BytesLike, offset: int, tag_id: int) -> int:
+        """Returns offset right after the payload of the tag that starts at `offset`, without decoding it.
+
+        Raises:
+            ValueError: if the data contains unknown tag id.
+        """
+
+        if tag_id in TAG_SIZES:
+            return offset + TAG_SIZES[tag_id]
+        if tag_id == TAG_STRING:
+            return offset + 2 + self._ushort.unpack_from(data, offset)[0]
+        if tag_id in ARRAY_ITEM_SIZES:
+            length = self._int.unpack_from(data, offset)[0]
+            return offset + 4 + max(length, 0) * ARRAY_ITEM_SIZES[tag_id]
+        if tag_id == TAG_LIST:
+            items_tag_id = data[offset]
+            length = self._int.unpack_from(data, offset + 1)[0]
+            offset += 5
+            if items_tag_id in TAG_SIZES:
+                return offset + max(length, 0) * TAG_SIZES[items_tag_id]
+            for _ in range(length):
+                offset = self.skip(data, offset, items_tag_id)
+            return offset
+        if tag_id == TAG_COMPOUND:
+            unpack_ushort = self._ushort.unpack_from
+            while data[offset]:
+                name_length = unpack_ushort(data, offset + 1)[0]
+                offset = self.skip(data, offset + 3 + name_length, data[offset])
+            return offset + 1
+        raise ValueError(f"Unknown tag id {tag_id}.")
+
+    def _make_raw(
+        self, tag_cls: type, data: BytesLike, offset: int, name: str
+    ) -> tuple[BaseTag, int]:
+        """Creates compound or list that keeps its payload as raw bytes."""
+
+        end = self.skip(data, offset, tag_cls.TAG_ID)
+        if end > len(data):
+            raise ValueError("NBT data is truncated.")
+        tag = _new(tag_cls)
+        tag.name = name
+        if tag_cls is TagList:
+            tag.tag_id = data[offset]
+        if isinstance(data, bytes):
+            tag._raw = (memoryview(data)[offset:end], self._byte_order)
+        else:
+            tag._raw = (bytes(data[offset:end]), self._byte_order)
+        return tag, end
+
+    def _read_lazy_compound(
+        self, data: BytesLike, offset: int, name: str
+    ) -> tuple[BaseTag, int]:
+        readers = self._readers
+        unpack_ushort = self._ushort.unpack_from
+        tags = {}
+        while True:
+            tag_id = data[offset]
+            offset += 1
+            if tag_id == TAG_END:
+                break
+            (length,) = unpack_ushort(data, offset)
+            offset += 2
+            item_name = str(data[offset : offset + length], "utf-8")
+            offset += length
+            if tag_id == TAG_COMPOUND or tag_id == TAG_LIST:
+                tags[item_name], offset = self._make_raw(
+                    TAGS[tag_id], data, offset, item_name
+                )
+                continue
+            try:
+                read = readers[tag_id]
+            except KeyError:
+                raise ValueError(f"Unknown tag id {tag_id}.")
+            tags[item_name], offset = read(data, offset, item_name)
+
+        tag = _new(TagCompound)
+        tag.name = name
+        tag._tags = tags
+        tag._raw = None
+        return tag, offset
+
+    def _read_lazy_list(
+        self, data: BytesLike, offset: int, name: str
+    ) -> tuple[BaseTag, int]:
+        items_tag_id = data[offset]
+        if items_tag_id != TAG_COMPOUND and items_tag_id != TAG_LIST:
+            return self._read_list(data, offset, name)
+
+        (length,) = self._int.unpack_from(data, offset + 1)
+        offset += 5
+        items = []
+        for _ in range(length):
+            item, offset = self._make_raw(TAGS[items_tag_id], data, offset, "")
+            items.append(item)
+
+        tag = _new(TagList)
+        tag.name = name
+        tag.tag_id = items_tag_id
+        tag._items, tag._numbers, tag._raw = items, None, None
+        return tag, offset
+
+    def _get_reader(self, tag_id: int) -> Reader:
+        try:
+            return self._readers[tag_id]
+        except KeyError:
+            raise ValueError(f"Unknown tag id {tag_id}.")
+
+    def _read_name(self, data: BytesLike, offset: int) -> tuple[str, int]:
+        (length,) = self._ushort.unpack_from(data, offset)
+        offset += 2
+        end = offset + length
+        if end > len(data):
+            raise ValueError(f"String length not equal: {length=}.")
+        return str(data[offset:end], "utf-8"), end
+
+    def _number_reader(self, tag_cls: type, fmt: str) -> Reader:
+        unpack_from = struct.Struct(f"{self._order}{fmt}").unpack_from
+        size = struct.calcsize(fmt)
+
+        def read(data: BytesLike, offset: int, name: str) -> tuple[BaseTag, int]:
+            return _make_tag(tag_cls, name, unpack_from(data, offset)[0]), offset + size
+
+        return read
+
+    def _read_string(
+        self, data: BytesLike, offset: int, name: str
+    ) -> tuple[BaseTag, int]:
+        value, offset = self._read_name(data, offset)
+        return _make_tag(TagString, name, value), offset
+
+    def _read_byte_array(
+        self, data: BytesLike, offset: int, name: str
+    ) -> tuple[BaseTag, int]:
+        (length,) = self._int.unpack_from(data, offset)
+        offset += 4
+        end = offset + length
+        if length < 0 or end > len(data):
+            raise ValueError("NBT data is truncated.")
+        if isinstance(data, bytes):
+            # `bytes` cannot change, so the tag can safely reference them without copying.
+            value: BytesLike = memoryview(data)[offset:end]
+        else:
+            value = bytearray(data[offset:end])
+        return _make_tag(TagByteArray, name, value), end
+
+    def _array_reader(self, tag_cls: type) -> Reader:
+        typecode = tag_cls.TYPECODE
+        item_size = tag_cls.ITEM_SIZE
+        swap = self._swap
+
+        def read(data: BytesLike, offset: int, name: str) -> tuple[BaseTag, int]:
+            (length,) = self._int.unpack_from(data, offset)
+            offset += 4
+            end = offset + length * item_size
+            if length < 0 or end > len(data):
+                raise ValueError("NBT data is truncated.")
+            values = array(typecode)
+            values.frombytes(memoryview(data)[offset:end])
+            if swap:
+                values.byteswap()
+            return _make_tag(tag_cls, name, values), end
+
+        return read
+
+    def _read_list(self, data: BytesLike, offset: int, name: str) -> tuple[BaseTag, int]:
+        items_tag_id = data[offset]
+        (length,) = self._int.unpack_from(data, offset + 1)
+        offset += 5
+
+        tag = _new(TagList)
+        tag.name = name
+        tag.tag_id = items_tag_id
+        if items_tag_id in _NUMBER_TAGS:
+            # Numbers are copied into compact array storage, item tags are not created.
+            _, typecode = _NUMBER_TAGS[items_tag_id]
+            numbers = array(typecode)
+            end = offset + max(length, 0) * numbers.itemsize
+            if end > len(data):
+                raise ValueError("NBT data is truncated.")
+            numbers.frombytes(memoryview(data)[offset:end])
+            if self._swap:
+                numbers.byteswap()
+            tag._items, tag._numbers, tag._raw = None, numbers, None
+            return tag, end
+
+        items = []
+        if length > 0:
+            read = self._get_reader(items_tag_id)
+            for _ in range(length):
+                item, offset = read(data, offset, "")
+                items.append(item)
+        tag._items, tag._numbers, tag._raw = items, None, None
+        return tag, offset
+
+    def _read_compound(
+        self, data: BytesLike, offset: int, name: str
+    ) -> tuple[BaseTag, int]:
+        readers = self._readers
+        unpack_ushort = self._ushort.unpack_from
+        tags = {}
+        while True:
+            tag_id = data[offset]
+            offset += 1
+            if tag_id == TAG_END:
+                break
+            (length,) = unpack_ushort(data, offset)
+            offset += 2
+            item_name = str(data[offset : offset + length], "utf-8")
+            offset += length
+            try:
+                read = readers[tag_id]
+            except KeyError:
+                raise ValueError(f"Unknown tag id {tag_id}.")
+            tags[item_name], offset = read(data, offset, item_name)
+
+        tag = _new(TagCompound)
+        tag.name = name
+        tag._tags = tags
+        tag._raw = None
+        return tag, offset
+
+    def __repr__(self) -> str:
+        return f"Decoder({self._byte_order})"
+
+
+_DECODERS = {byte_order: Decoder(byte_order) for byte_order in ByteOrder}
+
+
+def get_decoder(byte_order: ByteOrder = ByteOrder.BIG) -> Decoder:
+    """Returns shared decoder for the byte order."""
+
+    return _DECODERS[byte_order]
+
+
+def decode(
+    data: BytesLike,
+    byte_order: ByteOrder = ByteOrder.BIG,
+    offset: int = 0,
+    tag_id: Optional[int] = None,
+    lazy: bool = False,
+) -> tuple[BaseTag, int]:
+    """Decodes a single tag with the shared decoder, see `Decoder.decode`."""
+
+    return _DECODERS[byte_order].decode(data, offset, tag_id, lazy)
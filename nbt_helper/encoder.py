@@ -0,0 +1,227 @@
+__all__ = ["Encoder", "get_encoder", "encode"]
+
+import struct
+from typing import Callable, Optional
+
+from nbt_helper.tags import (
+    BaseTag,
+    BinaryHandler,
+    ByteOrder,
+    TagCompound,
+    TagIntArray,
+    TagList,
+    TagLongArray,
+    TAG_END,
+    TAG_BYTE,
+    TAG_SHORT,
+    TAG_INT,
+    TAG_LONG,
+    TAG_FLOAT,
+    TAG_DOUBLE,
+    TAG_BYTE_ARRAY,
+    TAG_STRING,
+    TAG_LIST,
+    TAG_COMPOUND,
+    TAG_INT_ARRAY,
+    TAG_LONG_ARRAY,
+)
+
+Writer = Callable[[BaseTag, bytearray, int], int]
+
+_NUMBER_FORMATS = {
+    TAG_BYTE: "b",
+    TAG_SHORT: "h",
+    TAG_INT: "i",
+    TAG_LONG: "q",
+    TAG_FLOAT: "f",
+    TAG_DOUBLE: "d",
+}
+
+
+class Encoder:
+    """Serializes tags into a single preallocated `bytearray`.
+
+    The size of the result is computed with `BaseTag.encoded_size`, then the buffer is filled in one pass with `struct.pack_into`.
+    """
+
+    def __init__(self, byte_order: ByteOrder = ByteOrder.BIG) -> None:
+        self._byte_order = byte_order
+        self._order = byte_order.value
+        self._ushort = struct.Struct(f"{self._order}H")
+        self._int = struct.Struct(f"{self._order}i")
+        self._tag_header = struct.Struct(f"{self._order}BH")
+        self._handler = BinaryHandler(byte_order)
+
+        self._writers: dict[int, Writer] = {
+            TAG_BYTE_ARRAY: self._write_byte_array,
+            TAG_STRING: self._write_string,
+            TAG_LIST: self._write_list,
+            TAG_COMPOUND: self._write_compound,
+            TAG_INT_ARRAY: self._array_writer(TagIntArray.TYPECODE),
+            TAG_LONG_ARRAY: self._array_writer(TagLongArray.TYPECODE),
+        }
+        self._numbers: dict[int, tuple[Callable, int]] = {}
+        for tag_id, fmt in _NUMBER_FORMATS.items():
+            self._writers[tag_id] = self._number_writer(fmt)
+            packer = struct.Struct(f"{self._order}{fmt}")
+            self._numbers[tag_id] = (packer.pack_into, packer.size)
+
+    def get_byte_order(self) -> ByteOrder:
+        return self._byte_order
+
+    def encode(self, tag: BaseTag, name: Optional[str] = "", prefix: int = 0) -> bytearray:
+        """Encodes the tag.
+
+        Args:
+            name (Optional[str], optional): name written after the tag id. If None, only the payload is written. Defaults to "".
+            prefix (int, optional): number of zero bytes reserved at the start of the result,
+                so headers (for example, length fields) can be filled in later without copying the data. Defaults to 0.
+        """
+
+        size = prefix + tag.encoded_size()
+        encoded_name = b""
+        if name is not None:
+            encoded_name = name.encode("utf-8")
+            size += 3 + len(encoded_name)
+
+        buffer = bytearray(size)
+        offset = prefix
+        if name is not None:
+            offset = self._write_name(buffer, offset, tag.TAG_ID, encoded_name)
+        offset = self.encode_into(tag, buffer, offset)
+        if offset != size:
+            raise ValueError("Encoded size of the tag does not match its payload.")
+        return buffer
+
+    def encode_into(self, tag: BaseTag, buffer: bytearray, offset: int) -> int:
+        """Writes the payload of the tag into the buffer at the offset, returns offset right after it."""
+
+        return self._writers[tag.TAG_ID](tag, buffer, offset)
+
+    def _write_name(
+        self, buffer: bytearray, offset: int, tag_id: int, name: bytes
+    ) -> int:
+        self._tag_header.pack_into(buffer, offset, tag_id, len(name))
+        offset += 3
+        end = offset + len(name)
+        buffer[offset:end] = name
+        return end
+
+    def _number_writer(self, fmt: str) -> Writer:
+        pack_into = struct.Struct(f"{self._order}{fmt}").pack_into
+        size = struct.calcsize(fmt)
+
+        def write(tag: BaseTag, buffer: bytearray, offset: int) -> int:
+            pack_into(buffer, offset, tag.value)
+            return offset + size
+
+        return write
+
+    def _array_writer(self, typecode: str) -> Writer:
+        handler = self._handler
+
+        def write(tag: BaseTag, buffer: bytearray, offset: int) -> int:
+            data = memoryview(handler.array_bytes(tag.value, typecode)).cast("B")
+            self._int.pack_into(buffer, offset, len(tag.value))
+            offset += 4
+            buffer[offset : offset + len(data)] = data
+            return offset + len(data)
+
+        return write
+
+    def _write_byte_array(self, tag: BaseTag, buffer: bytearray, offset: int) -> int:
+        length = len(tag.value)
+        self._int.pack_into(buffer, offset, length)
+        offset += 4
+        buffer[offset : offset + length] = tag.value
+        return offset + length
+
+    def _write_string(self, tag: BaseTag, buffer: bytearray, offset: int) -> int:
+        data = tag.value.encode("utf-8")
+        self._ushort.pack_into(buffer, offset, len(data))
+        offset += 2
+        buffer[offset : offset + len(data)] = data
+        return offset + len(data)
+
+    def _write_raw(self, tag: BaseTag, buffer: bytearray, offset: int) -> int:
+        """Copies the raw payload of an untouched lazily decoded tag, returns -1 if it has to be encoded."""
+
+        data, byte_order = tag._raw  # type: ignore
+        if byte_order is not self._byte_order:
+            return -1
+        buffer[offset : offset + len(data)] = data
+        return offset + len(data)
+
+    def _write_list(self, tag: TagList, buffer: bytearray, offset: int) -> int:
+        if tag._raw is not None:
+            end = self._write_raw(tag, buffer, offset)
+            if end >= 0:
+                return end
+        length = len(tag)
+        items_tag_id = tag.tag_id
+        if items_tag_id == TAG_END and length:
+            items_tag_id = tag.tag_id = tag.value[0].TAG_ID
+        buffer[offset] = items_tag_id
+        self._int.pack_into(buffer, offset + 1, length)
+        offset += 5
+        if not length:
+            return offset
+
+        if items_tag_id in _NUMBER_FORMATS:
+            # Numbers are written with a single copy, compact lists do not create item tags.
+            numbers = tag._numbers_array()
+            data = memoryview(self._handler.array_bytes(numbers, numbers.typecode)).cast("B")
+            buffer[offset : offset + len(data)] = data
+            return offset + len(data)
+
+        write = self._writers[items_tag_id]
+        for item in tag.value:
+            offset = write(item, buffer, offset)
+        return offset
+
+    def _write_compound(self, tag: TagCompound, buffer: bytearray, offset: int) -> int:
+        if tag._raw is not None:
+            end = self._write_raw(tag, buffer, offset)
+            if end >= 0:
+                return end
+        writers = self._writers
+        numbers = self._numbers
+        pack_header = self._tag_header.pack_into
+        for item in tag.get_tags().values():
+            name = item.name.encode("utf-8")
+            tag_id = item.TAG_ID
+            pack_header(buffer, offset, tag_id, len(name))
+            offset += 3 + len(name)
+            buffer[offset - len(name) : offset] = name
+            if tag_id in numbers:
+                # Numbers are the most common tags, so they are written without a function call.
+                pack_into, size = numbers[tag_id]
+                pack_into(buffer, offset, item.value)
+                offset += size
+            else:
+                offset = writers[tag_id](item, buffer, offset)
+        buffer[offset] = TAG_END
+        return offset + 1
+
+    def __repr__(self) -> str:
+        return f"Encoder({self._byte_order})"
+
+
+_ENCODERS = {byte_order: Encoder(byte_order) for byte_order in ByteOrder}
+
+
+def get_encoder(byte_order: ByteOrder = ByteOrder.BIG) -> Encoder:
+    """Returns shared encoder for the byte order."""
+
+    return _ENCODERS[byte_order]
+
+
+def encode(
+    tag: BaseTag,
+    byte_order: ByteOrder = ByteOrder.BIG,
+    name: Optional[str] = "",
+    prefix: int = 0,
+) -> bytearray:
+    """Encodes the tag with the shared encoder, see `Encoder.encode`."""
+
+    return _ENCODERS[byte_order].encode(tag, name, prefix)
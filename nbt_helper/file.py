@@ -9,21 +9,31 @@ __all__ = [
     "NBTFile",
 ]
 
+import io
 import struct
-import zlib
-import gzip
 from pathlib import Path
-from io import BytesIO
 from abc import ABC, abstractmethod
 from typing import BinaryIO, Optional, Union
 from enum import Enum
 
+from nbt_helper.compression import (
+    get_codec,
+    compress_stream,
+    decompress_stream,
+    CompressingWriter,
+    DecompressingReader,
+    GZIP_COMPRESSED,
+    STREAM_CHUNK_SIZE,
+    ZLIB_COMPRESSED,
+)
+from nbt_helper.decoder import BytesLike, decode
+from nbt_helper.encoder import encode
 from nbt_helper.tags import (
     BinaryHandler,
     ByteOrder,
     TagCompound,
-    TAG_COMPOUND,
     TagString,
+    TAG_COMPOUND,
 )
 
 BEDROCK_EDITION_MAGIC_NUMBER = 8
@@ -33,6 +43,9 @@ PLAIN_NBT_MAGIC_NUMBER = b"\n\x00\x00"
 
 StrOrPath = Union[str, Path]
 
+# Magic number and payload size in front of Bedrock Edition files with header.
+BE_HEADER = struct.Struct("<iI")
+
 
 class FileTypes(Enum):
     JE_UNCOMPRESSED = 0
@@ -57,17 +70,99 @@ class DataHandler(ABC):
 class Uncompressed(DataHandler):
     @staticmethod
     def read(buffer: BinaryIO, byte_order: ByteOrder) -> TagCompound:
+        seekable = buffer.seekable()
+        start = buffer.tell() if seekable else 0
+        data, end = Uncompressed.decode(buffer.read(), byte_order)
+        if seekable:
+            buffer.seek(start + end)
+        return data
+
+    @staticmethod
+    def decode(
+        data: BytesLike, byte_order: ByteOrder, lazy: bool = False
+    ) -> tuple[TagCompound, int]:
+        """Decodes the root compound from bytes, returns it and offset right after it.
+
+        Args:
+            lazy (bool, optional): if True, nested compounds and lists are decoded on first access, see `Decoder.decode`. Defaults to False.
+        """
+
+        if not data or data[0] != TAG_COMPOUND:
+            raise ValueError("File data must starts with Compound tag.")
+        return decode(data, byte_order, lazy=lazy)  # type: ignore
+
+    @staticmethod
+    def write(data: TagCompound, buffer: BinaryIO, byte_order: ByteOrder) -> None:
+        buffer.write(Uncompressed.encode(data, byte_order))
+
+    @staticmethod
+    def encode(data: TagCompound, byte_order: ByteOrder, prefix: int = 0) -> bytearray:
+        """Encodes the root compound with empty name into a single buffer, see `Encoder.encode`."""
+
+        return encode(data, byte_order, "", prefix)
+
+    @staticmethod
+    def read_stream(buffer: BinaryIO, byte_order: ByteOrder) -> TagCompound:
+        """Reads the root compound tag by tag, without reading the whole buffer into memory first."""
+
         binary_handler = BinaryHandler(byte_order)
-        tag_id = binary_handler.read_byte(buffer)
-        if tag_id != TAG_COMPOUND:
+        if binary_handler.read_byte(buffer) != TAG_COMPOUND:
             raise ValueError("File data must starts with Compound tag.")
         name = TagString(binary_handler, buffer=buffer).value
-        return TagCompound(binary_handler, buffer=buffer, name=name)
+        return TagCompound(binary_handler, name=name, buffer=buffer)
 
     @staticmethod
-    def write(data: TagCompound, buffer: BinaryIO) -> None:
-        buffer.write(PLAIN_NBT_MAGIC_NUMBER)
-        data.write_to_buffer(buffer)
+    def write_stream(data: TagCompound, buffer: BinaryIO, byte_order: ByteOrder) -> None:
+        """Writes the root compound with empty name tag by tag, without building the whole payload in memory first."""
+
+        binary_handler = BinaryHandler(byte_order)
+        binary_handler.write_byte(buffer, TAG_COMPOUND)
+        TagString().write_to_buffer(buffer, binary_handler)
+        data.write_to_buffer(buffer, binary_handler)
+
+
+class Compressed(DataHandler):
+    """Compressed files are (de)compressed in chunks of `STREAM_CHUNK_SIZE`, so the whole compressed file is never kept
+    in memory.
+
+    By default, the file is decompressed into a single buffer and decoded with `nbt_helper.decoder`, and encoded
+    with `nbt_helper.encoder` and compressed in slices. With `streaming=True` tags are parsed straight from
+    a streaming decompressor and serialized straight into a streaming compressor, so the whole uncompressed payload
+    is not kept in memory either, but reading and writing tag by tag is about twice as slow.
+    """
+
+    @staticmethod
+    def read(
+        buffer: BinaryIO,
+        compression: int,
+        byte_order: ByteOrder,
+        streaming: bool = False,
+    ) -> TagCompound:
+        codec = get_codec(compression)
+        if not streaming:
+            return Uncompressed.decode(decompress_stream(buffer, codec), byte_order)[0]
+
+        reader = DecompressingReader(buffer, codec)
+        with io.BufferedReader(reader, STREAM_CHUNK_SIZE) as stream:
+            return Uncompressed.read_stream(stream, byte_order)
+
+    @staticmethod
+    def write(
+        data: TagCompound,
+        buffer: BinaryIO,
+        compression: int,
+        byte_order: ByteOrder,
+        level: Optional[int] = None,
+        streaming: bool = False,
+    ) -> None:
+        codec = get_codec(compression)
+        if not streaming:
+            compress_stream(Uncompressed.encode(data, byte_order), buffer, codec, level)
+            return
+
+        writer = CompressingWriter(buffer, codec, level)
+        with io.BufferedWriter(writer, STREAM_CHUNK_SIZE) as stream:
+            Uncompressed.write_stream(data, stream, byte_order)
 
 
 class JE_Uncompressed(DataHandler):
@@ -77,9 +172,7 @@ class JE_Uncompressed(DataHandler):
 
     @staticmethod
     def write(data: TagCompound, buffer: BinaryIO) -> None:
-        if data.get_byte_order() is ByteOrder.LITTLE:
-            data.change_byte_order(ByteOrder.BIG)
-        Uncompressed.write(data, buffer)
+        Uncompressed.write(data, buffer, ByteOrder.BIG)
 
 
 class BE_Uncompressed(DataHandler):
@@ -89,35 +182,37 @@ class BE_Uncompressed(DataHandler):
 
     @staticmethod
     def write(data: TagCompound, buffer: BinaryIO) -> None:
-        if data.get_byte_order() is ByteOrder.BIG:
-            data.change_byte_order(ByteOrder.LITTLE)
-        Uncompressed.write(data, buffer)
+        Uncompressed.write(data, buffer, ByteOrder.LITTLE)
 
 
 class JE_ZlibCompressed(DataHandler):
     @staticmethod
-    def read(buffer: BinaryIO) -> TagCompound:
-        buffer = BytesIO(zlib.decompress(buffer.read()))
-        return JE_Uncompressed.read(buffer)
+    def read(buffer: BinaryIO, streaming: bool = False) -> TagCompound:
+        return Compressed.read(buffer, ZLIB_COMPRESSED, ByteOrder.BIG, streaming)
 
     @staticmethod
-    def write(data: TagCompound, buffer: BinaryIO) -> None:
-        temp_buffer = BytesIO()
-        JE_Uncompressed.write(data, temp_buffer)
-        buffer.write(zlib.compress(temp_buffer.getvalue()))
+    def write(
+        data: TagCompound,
+        buffer: BinaryIO,
+        level: Optional[int] = None,
+        streaming: bool = False,
+    ) -> None:
+        Compressed.write(data, buffer, ZLIB_COMPRESSED, ByteOrder.BIG, level, streaming)
 
 
 class JE_GzipCompressed(DataHandler):
     @staticmethod
-    def read(buffer: BinaryIO) -> TagCompound:
-        buffer = BytesIO(gzip.decompress(buffer.read()))
-        return JE_Uncompressed.read(buffer)
+    def read(buffer: BinaryIO, streaming: bool = False) -> TagCompound:
+        return Compressed.read(buffer, GZIP_COMPRESSED, ByteOrder.BIG, streaming)
 
     @staticmethod
-    def write(data: TagCompound, buffer: BinaryIO) -> None:
-        temp_buffer = BytesIO()
-        JE_Uncompressed.write(data, temp_buffer)
-        buffer.write(gzip.compress(temp_buffer.getvalue()))
+    def write(
+        data: TagCompound,
+        buffer: BinaryIO,
+        level: Optional[int] = None,
+        streaming: bool = False,
+    ) -> None:
+        Compressed.write(data, buffer, GZIP_COMPRESSED, ByteOrder.BIG, level, streaming)
 
 
 class BE_WithHeader(DataHandler):
@@ -128,19 +223,15 @@ class BE_WithHeader(DataHandler):
         if magic_number != BEDROCK_EDITION_MAGIC_NUMBER:
             raise ValueError("Wrong data handler used! Unknown magic number")
         size = binary_handler.read_int(buffer, signed=False)
-        buffer = BytesIO(buffer.read(size))
-        return BE_Uncompressed.read(buffer)
+        return Uncompressed.decode(buffer.read(size), ByteOrder.LITTLE)[0]
 
     @staticmethod
     def write(data: TagCompound, buffer: BinaryIO) -> None:
-        binary_handler = BinaryHandler(ByteOrder.LITTLE)
-        binary_handler.write_int(buffer, BEDROCK_EDITION_MAGIC_NUMBER)
-        temp_buffer = BytesIO()
-
-        BE_Uncompressed.write(data, temp_buffer)
-
-        binary_handler.write_int(buffer, temp_buffer.tell(), signed=False)
-        buffer.write(temp_buffer.getvalue())
+        encoded = Uncompressed.encode(data, ByteOrder.LITTLE, BE_HEADER.size)
+        BE_HEADER.pack_into(
+            encoded, 0, BEDROCK_EDITION_MAGIC_NUMBER, len(encoded) - BE_HEADER.size
+        )
+        buffer.write(encoded)
 
 
 class NBTFile:
@@ -153,38 +244,53 @@ class NBTFile:
         filepath: Optional[StrOrPath] = None,
         buffer: Optional[BinaryIO] = None,
         type: FileTypes = FileTypes.JE_GZIP_COMPRESSED,
+        streaming: bool = False,
     ) -> None:
+        """
+        Args:
+            streaming (bool, optional): passed to `load`. Defaults to False.
+        """
+
         super().__init__()
         self._type = type
         self._handler = HANDLERS[self._type]
-        self.data = TagCompound(BinaryHandler())
+        self.data = TagCompound()
 
         if filepath:
             with open(filepath, "rb") as file:
-                self.load(file)
+                self.load(file, streaming)
         elif buffer:
-            self.load(buffer)
+            self.load(buffer, streaming)
 
     def get_file_type(self) -> FileTypes:
         return self._type
 
-    def load(self, buffer: BinaryIO) -> None:
+    def load(self, buffer: BinaryIO, streaming: bool = False) -> None:
         """Loads data from the buffer
 
+        Args:
+            streaming (bool, optional): if True, compressed data is decompressed while tags are parsed,
+                see `Compressed.read`. Ignored by uncompressed file types. Defaults to False.
+
         Raises:
-            ValueError: if the file type cannot be guessed.
+            ValueError: if the file type cannot be guessed or compressed data is truncated.
         """
 
         if not self.guess(buffer):
             raise ValueError("Unknown file format.")
         self._handler = HANDLERS[self._type]
-        self.data = self._handler.read(buffer=buffer)
+        kwargs = {}
+        if streaming and self._type in COMPRESSED_FILE_TYPES:
+            kwargs["streaming"] = True
+        self.data = self._handler.read(buffer=buffer, **kwargs)
 
     def save(
         self,
         filepath: Optional[StrOrPath] = None,
         buffer: Optional[BinaryIO] = None,
         type: Optional[FileTypes] = None,
+        compression_level: Optional[int] = None,
+        streaming: bool = False,
     ) -> None:
         """Save file data to buffer or file.
 
@@ -192,16 +298,25 @@ class NBTFile:
             filepath (Optional[StrOrPath], optional): if specified, the data is written to the file. Defaults to None.
             buffer (Optional[BinaryIO], optional): if specified, the data is written to the buffer. Defaults to None.
             type (Optional[FileTypes], optional): if specified, changes file type. Defaults to None.
+            compression_level (Optional[int], optional): compression level of compressed file types, ignored by others. Defaults to None.
+            streaming (bool, optional): if True, tags are compressed as they are encoded, see `Compressed.write`.
+                Ignored by uncompressed file types. Defaults to False.
         """
 
         if type:
             self._type = type
             self._handler = HANDLERS[self._type]
+
+        kwargs = {}
+        if compression_level is not None and self._type in COMPRESSED_FILE_TYPES:
+            kwargs["level"] = compression_level
+        if streaming and self._type in COMPRESSED_FILE_TYPES:
+            kwargs["streaming"] = True
         if buffer:
-            self._handler.write(buffer=buffer, data=self.data)
+            self._handler.write(buffer=buffer, data=self.data, **kwargs)
         if filepath:
             with open(filepath, "wb") as file:
-                self._handler.write(buffer=file, data=self.data)
+                self._handler.write(buffer=file, data=self.data, **kwargs)
 
     def guess(self, buffer: BinaryIO) -> bool:
         """Guess NBT file type based on header (first 6 bytes). Does not chnage stream position.
@@ -244,3 +359,4 @@ HANDLERS = {
     FileTypes.JE_GZIP_COMPRESSED: JE_GzipCompressed,
     FileTypes.JE_ZLIB_COMPRESSED: JE_ZlibCompressed,
 }
+COMPRESSED_FILE_TYPES = (FileTypes.JE_GZIP_COMPRESSED, FileTypes.JE_ZLIB_COMPRESSED)
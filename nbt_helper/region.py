@@ -1,32 +1,155 @@
-__all__ = ["SECTOR_SIZE", "Region", "Chunk", "CompressionTypes"]
+__all__ = [
+    "SECTOR_SIZE",
+    "Region",
+    "RegionReader",
+    "SectorAllocator",
+    "Chunk",
+    "ChunkInfo",
+    "CompactionReport",
+    "CompressionTypes",
+    "read_chunk_infos",
+    "compact_region_file",
+]
 
 import os
-import gzip
-import zlib
+import mmap
+import hashlib
 import re
+import shutil
+import struct
+import threading
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import Optional, Union, BinaryIO
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Iterable, NamedTuple, Optional, Union, BinaryIO
 from pathlib import Path
 
-from nbt_helper.file import JE_Uncompressed
+from nbt_helper.file import Uncompressed
+from nbt_helper.compression import get_codec
+from nbt_helper.decoder import get_decoder
+from nbt_helper.stream import TagPath, read_paths
 from nbt_helper.tags import (
+    BaseTag,
     BinaryHandler,
     ByteOrder,
     TagCompound,
+    TAG_INT,
+    TAG_COMPOUND,
 )
 
 SECTOR_SIZE = 4096
 INT_SIZE = 4
+HEADER_ENTRIES = SECTOR_SIZE // INT_SIZE
+MAX_CHUNK_SECTORS = 0xFF
+EXTERNAL_FLAG = 0x80
+DEFAULT_CACHE_SIZE = 64
 MCA_FILE_PATTERN = re.compile(r"r\.-?\d+\.-?\d+\.mca")
 
 StrOrPath = Union[str, Path]
 
+_HEADER_TABLE = struct.Struct(f">{HEADER_ENTRIES}I")
+_CHUNK_HEADER = struct.Struct(">IB")
+_INT = struct.Struct(">i")
+_USHORT = struct.Struct(">H")
+
 
 class CompressionTypes(Enum):
     UNCOMPRESSED = 0
     GZIP_COMPRESSED = 1
     ZLIB_COMPRESSED = 2
+    LZ4_COMPRESSED = 4
+
+
+class ChunkInfo(NamedTuple):
+    """Chunk information stored in the region header and the chunk's length field."""
+
+    x: int
+    z: int
+    offset: int
+    """Offset of chunk data in sectors."""
+    sector_count: int
+    length: int
+    """Exact length of the chunk payload in bytes."""
+    compression: int
+    timestamp: int
+
+
+class CompactionReport(NamedTuple):
+    file_size: int
+    """Size of the region file before compaction in bytes."""
+    compacted_size: int
+    """Size of the region file after compaction in bytes."""
+    free_sectors: int
+    """Number of unused sectors between and after chunks."""
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return self.file_size - self.compacted_size
+
+    @property
+    def fragmentation(self) -> float:
+        """Share of the file occupied by unused sectors."""
+
+        if self.file_size == 0:
+            return 0.0
+        return self.reclaimed_bytes / self.file_size
+
+
+def _patch_position(data: bytearray, x: int, z: int) -> None:
+    """Overwrites `xPos` and `zPos` int tags of uncompressed chunk data in place.
+
+    Tags are searched in the root compound and in the "Level" compound used by old chunk format.
+    """
+
+    if data[0] != TAG_COMPOUND:
+        raise ValueError("Chunk data must starts with Compound tag.")
+    values = {b"xPos": x, b"zPos": z}
+    compounds = [3 + _USHORT.unpack_from(data, 1)[0]]
+    while compounds:
+        offset = compounds.pop()
+        while data[offset]:
+            tag_id = data[offset]
+            name_length = _USHORT.unpack_from(data, offset + 1)[0]
+            name = bytes(data[offset + 3 : offset + 3 + name_length])
+            offset += 3 + name_length
+            if tag_id == TAG_INT and name in values:
+                _INT.pack_into(data, offset, values[name])
+            elif tag_id == TAG_COMPOUND and name == b"Level":
+                compounds.append(offset)
+            offset = get_decoder(ByteOrder.BIG).skip(data, offset, tag_id)
+
+
+def _digest(data: Union[bytes, memoryview]) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _is_external(body: bytes) -> bool:
+    """Checks whether chunk body points to an external file. Empty body does not."""
+
+    return bool(body) and bool(body[_CHUNK_HEADER.size - 1] & EXTERNAL_FLAG)
+
+
+def sectors_for(length: int) -> int:
+    """Returns number of sectors occupied by `length` bytes of chunk body."""
+
+    return (length + SECTOR_SIZE - 1) // SECTOR_SIZE
+
+
+def external_chunk_path(folder: StrOrPath, chunk_x: int, chunk_z: int) -> str:
+    """Returns path of the external file that stores oversized chunk, `chunk_x` and `chunk_z` are absolute chunk coordinates."""
+
+    return os.path.join(folder, f"c.{chunk_x}.{chunk_z}.mcc")
+
+
+def cords_from_filepath(filepath: StrOrPath) -> tuple[int, int]:
+    """Gets x and z coordinates from the region file name."""
+
+    filepath = os.path.basename(filepath)
+    filepath = filepath.replace("r.", "").replace(".mca", "")
+    x, z = map(int, filepath.split("."))
+    return x, z
 
 
 def cords_from_location(location: int) -> tuple[int, int]:
@@ -57,10 +180,36 @@ class Chunk:
         self.compression = compression
         self.timestamp = timestamp
 
+        self._raw: Optional[bytes] = None
+        self._raw_compression = compression
+        self._lazy_tags = False
+        self._digest: Optional[bytes] = None
+        # Set when `data` is handed out: chunk data that nobody got cannot have been changed.
+        self._exposed = True
+        self._dirty = True
+
         if data is None:
-            data = TagCompound(self._binary_handler)
+            data = TagCompound()
         self.data = data
-        self.data.binary_handler = self._binary_handler
+
+    @property
+    def data(self) -> TagCompound:
+        """Root compound of the chunk. Chunk read without decoding is decoded on first access."""
+
+        self._exposed = True
+        return self._get_data()
+
+    def _get_data(self) -> TagCompound:
+        """Returns chunk data without marking it as handed out, for reading it inside the module."""
+
+        if self._data is None:
+            self._decode_raw()
+        return self._data  # type: ignore
+
+    @data.setter
+    def data(self, value: TagCompound) -> None:
+        self._data: Optional[TagCompound] = value
+        self._dirty = True
 
     def read_chunk(self, index: int, buffer: BinaryIO) -> None:
         self.x, self.z = cords_from_location(index)
@@ -79,9 +228,140 @@ class Chunk:
 
     def _read_body(self, buffer: BinaryIO) -> None:
         length = self._binary_handler.read_int(buffer, signed=False)
-        self.compression = self._binary_handler.read_byte(buffer, signed=False)
-        chunk_data = self._decompress_chunk(buffer.read(length))
-        self.data = JE_Uncompressed.read(chunk_data)
+        compression = self._binary_handler.read_byte(buffer, signed=False)
+        if compression & EXTERNAL_FLAG:
+            self._read_external(self._external_path(buffer), compression)
+            return
+        self.compression = compression
+        self._read_payload(buffer.read(length))
+
+    def _external_path(self, buffer: BinaryIO) -> str:
+        """Returns path of the external file of the chunk, which lies next to the region file of the buffer.
+
+        Raises:
+            ValueError: if the buffer is not a region file opened by its path.
+        """
+
+        filepath = getattr(buffer, "name", None)
+        if not isinstance(filepath, str) or not MCA_FILE_PATTERN.fullmatch(
+            os.path.basename(filepath)
+        ):
+            raise ValueError(
+                f"Chunk {self.x}, {self.z} is stored in an external file, which can only be found for a region file opened by its path."
+            )
+        region_x, region_z = cords_from_filepath(filepath)
+        return external_chunk_path(
+            os.path.dirname(filepath), region_x * 32 + self.x, region_z * 32 + self.z
+        )
+
+    def _read_payload(
+        self,
+        payload: Union[bytes, memoryview],
+        decode: bool = True,
+        lazy_tags: bool = False,
+    ) -> None:
+        """Stores compressed chunk payload (without the length and compression fields).
+
+        Args:
+            decode (bool, optional): if False, the payload is decoded on first access to `data`. Defaults to True.
+            lazy_tags (bool, optional): if True, nested compounds and lists are decoded on first access, see `Decoder.decode`.
+                Defaults to False.
+        """
+
+        self._raw = bytes(payload)
+        self._raw_compression = self.compression
+        self._lazy_tags = lazy_tags
+        self._data = None
+        self._digest = None
+        self._exposed = False
+        self._dirty = False
+        if decode:
+            self._decode_raw()
+
+    def _read_external(
+        self,
+        filepath: StrOrPath,
+        compression: int,
+        decode: bool = True,
+        lazy_tags: bool = False,
+    ) -> None:
+        """Stores payload of the chunk kept in an external file, same as `_read_payload`.
+
+        The payload becomes the original payload of the chunk, so an untouched chunk is clean and is written back as is.
+        """
+
+        self.compression = compression & ~EXTERNAL_FLAG
+        with open(filepath, "rb") as file:
+            payload = file.read()
+        self._read_payload(payload, decode, lazy_tags)
+
+    def _decode_raw(self, chunk_data: Optional[bytes] = None) -> None:
+        """Parses the stored payload.
+
+        Args:
+            chunk_data (Optional[bytes], optional): result of `_decompress_raw`, if it was already called. Defaults to None.
+        """
+
+        if chunk_data is None:
+            chunk_data = self._decompress_raw()
+        # The digest is computed once, so the decompressed data does not have to be kept for `is_dirty`.
+        self._digest = _digest(chunk_data)
+        # Byte arrays of the chunk reference the decompressed data without copying.
+        self._data = Uncompressed.decode(chunk_data, ByteOrder.BIG, self._lazy_tags)[0]
+
+    def _decompress_raw(self) -> bytes:
+        """Decompresses the stored payload, does not touch chunk state so it can be called from worker threads."""
+
+        return get_codec(self._raw_compression).decompress(self._raw)  # type: ignore
+
+    def _may_be_modified(self) -> bool:
+        """Cheap check for `is_dirty`: False means the chunk is clean for sure, True means it has to be serialized."""
+
+        return not self._has_raw_payload() or (self._data is not None and self._exposed)
+
+    def read_paths(self, paths: Iterable[TagPath]) -> dict[TagPath, BaseTag]:
+        """Returns only the requested tags of the chunk data, see `nbt_helper.stream.read_paths`.
+
+        Chunk that was not decoded yet stays undecoded, only the requested subtrees are built.
+        """
+
+        if self._data is None:
+            buffer = self._decompress_chunk(self._raw, self._raw_compression)  # type: ignore
+            return read_paths(buffer, paths)
+
+        result = {}
+        for path in paths:
+            tag: Optional[BaseTag] = self._data
+            names = path.split("/") if isinstance(path, str) else path
+            for name in names:
+                if not isinstance(tag, TagCompound):
+                    tag = None
+                    break
+                tag = tag.get_tag(name)
+            if tag is not None:
+                result[path] = tag
+        return result
+
+    def _is_decoded(self) -> bool:
+        return self._data is not None
+
+    def is_dirty(self) -> bool:
+        """Checks whether the chunk differs from the payload it was read from.
+
+        Chunk whose `data` was never accessed is clean. Otherwise the data is serialized and its digest is compared
+        with the digest of the original data.
+        """
+
+        if not self._has_raw_payload():
+            return True
+        if not self._may_be_modified():
+            return False
+        return _digest(self._serialize()) != self._digest
+
+    def mark_dirty(self) -> None:
+        """Forces the chunk to be serialized and compressed again on the next write."""
+
+        self._dirty = True
 
     def write_chunk(self, buffer: BinaryIO, offset: int) -> int:
         """Writes chunk to the buffer.
@@ -93,13 +373,20 @@ class Chunk:
             int: number of occupied sectors.
         """
 
-        chunk_data_pos = offset * SECTOR_SIZE
-        buffer.seek(chunk_data_pos)
-        length = self._write_body(buffer)
-        occupied_sectors = length // SECTOR_SIZE + 1
-        self._add_padding(buffer, length, occupied_sectors)
+        return self._write_encoded(buffer, offset, self._encode_body())
+
+    def _write_encoded(self, buffer: BinaryIO, offset: int, body: bytes) -> int:
+        occupied_sectors = sectors_for(len(body))
+        if occupied_sectors > MAX_CHUNK_SECTORS:
+            raise ValueError(
+                f"Chunk {self.x}, {self.z} is too big, it must be stored in an external file."
+            )
+
+        buffer.seek(offset * SECTOR_SIZE)
+        buffer.write(body)
+        self._add_padding(buffer, len(body), occupied_sectors)
 
-        location = (offset << 8) | (occupied_sectors & 0b11111111)
+        location = (offset << 8) | occupied_sectors
 
         self._seek_to_location_table(buffer)
         self._binary_handler.write_int(buffer, location, signed=False)
@@ -119,74 +406,368 @@ class Chunk:
     def _add_padding(
         self, buffer: BinaryIO, length: int, occupied_sectors: int
     ) -> None:
-        padding = abs(length - SECTOR_SIZE * occupied_sectors) - 1
-        buffer.seek(padding, os.SEEK_CUR)
-        buffer.write(b"\x00")
+        buffer.write(bytes(SECTOR_SIZE * occupied_sectors - length))
 
-    def _write_body(self, buffer: BinaryIO) -> int:
-        temp_buffer = BytesIO()
-        JE_Uncompressed.write(self.data, temp_buffer)
-        chunk_data = self._compress_chunk(temp_buffer.getvalue())
+    def _encode_body(self, level: Optional[int] = None) -> bytes:
+        """Returns chunk body: payload length, compression type and compressed payload.
 
-        self._binary_handler.write_int(buffer, len(chunk_data), signed=False)
-        self._binary_handler.write_byte(buffer, self.compression, signed=False)
-        return buffer.write(chunk_data)
+        If the chunk is clean, the original compressed payload is reused.
 
-    def _decompress_chunk(self, chunk_data: bytes) -> BytesIO:
-        try:
-            compression_type = CompressionTypes(self.compression)
-        except ValueError:
-            raise ValueError(f"Undefined compression type {self.compression}")
+        Args:
+            level (Optional[int], optional): compression level of a chunk that has to be compressed. Defaults to None.
+        """
 
-        if compression_type == CompressionTypes.GZIP_COMPRESSED:
-            data = gzip.decompress(chunk_data)
-        elif compression_type == CompressionTypes.ZLIB_COMPRESSED:
-            data = zlib.decompress(chunk_data)
-        elif compression_type == CompressionTypes.UNCOMPRESSED:
-            data = chunk_data
+        payload = self._encode_payload(level)
+        return self._body_from_payload(payload)
 
-        return BytesIO(data)  # type: ignore
+    def _body_from_payload(self, payload: bytes) -> bytes:
+        return _CHUNK_HEADER.pack(len(payload), self.compression) + payload
 
-    def _compress_chunk(self, chunk_data: bytes) -> bytes:
-        try:
-            compression_type = CompressionTypes(self.compression)
-        except ValueError:
-            raise ValueError(f"Undefined compression type {self.compression}")
-
-        compression_type = CompressionTypes(self.compression)
-        if compression_type == CompressionTypes.GZIP_COMPRESSED:
-            data = gzip.compress(chunk_data)
-        elif compression_type == CompressionTypes.ZLIB_COMPRESSED:
-            data = zlib.compress(chunk_data)
-        elif compression_type == CompressionTypes.UNCOMPRESSED:
-            data = chunk_data
-        return data  # type: ignore
+    def _encode_payload(self, level: Optional[int] = None) -> bytes:
+        payload, chunk_data = self._reuse_payload()
+        if payload is not None:
+            return payload
+        return self._compress_chunk(chunk_data, level)  # type: ignore
+
+    def _reuse_payload(self) -> tuple[Optional[bytes], Optional[bytes]]:
+        """Returns the original payload if it can be written as is, otherwise serialized uncompressed chunk data."""
+
+        if not self._has_raw_payload():
+            return None, self._serialize()
+        if not self._may_be_modified():
+            return self._raw, None
+
+        chunk_data = self._serialize()
+        if _digest(chunk_data) == self._digest:
+            return self._raw, None
+        return None, chunk_data
+
+    def _has_raw_payload(self) -> bool:
+        """Checks whether the original compressed payload can be written as is."""
+
+        return (
+            not self._dirty
+            and self._raw is not None
+            and self.compression == self._raw_compression
+        )
+
+    def _set_payload(self, payload: bytes, digest: bytes) -> None:
+        """Makes the written payload the one the chunk is compared with, so the saved chunk is clean."""
+
+        self._raw = payload
+        self._raw_compression = self.compression
+        self._digest = digest
+        self._dirty = False
+
+    def _serialize(self) -> bytearray:
+        return Uncompressed.encode(self._get_data(), ByteOrder.BIG)
+
+    def _decompress_chunk(
+        self, chunk_data: Union[bytes, memoryview], compression: Optional[int] = None
+    ) -> BytesIO:
+        if compression is None:
+            compression = self.compression
+        return BytesIO(get_codec(compression).decompress(chunk_data))
+
+    def _compress_chunk(self, chunk_data: bytes, level: Optional[int] = None) -> bytes:
+        return get_codec(self.compression).compress(chunk_data, level)
 
     def __repr__(self) -> str:
-        return f"Chunk(x={self.x}, z={self.z}, compression={self.compression}, timestamp={self.timestamp}, data={self.data})"
+        return f"Chunk(x={self.x}, z={self.z}, compression={self.compression}, timestamp={self.timestamp}, data={self._get_data()})"
 
     def is_empty(self) -> bool:
-        return not self.data.value
+        if self._data is None:
+            return self._raw is None
+        return not self._data.value
+
+    def __getstate__(self) -> dict:
+        """Decoded chunk is pickled without its original payload, so it is not sent twice to another process.
+        The unpickled chunk is compressed again when it is written."""
+
+        state = self.__dict__.copy()
+        if self._data is not None:
+            state.update(_raw=None, _digest=None, _exposed=True, _dirty=True)
+        return state
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Chunk):
             return False
-        return all((self.data == other.data, self.x == other.x, self.z == other.z))
+        return all(
+            (self._get_data() == other._get_data(), self.x == other.x, self.z == other.z)
+        )
+
+
+class RegionReader:
+    """Reads chunks from a memory-mapped region file.
+
+    Chunk payloads are sliced straight out of the mapping and passed to the decompressor as `memoryview`,
+    so several threads can read chunks of the same file at once without sharing a file position.
+    """
+
+    def __init__(self, filepath: StrOrPath) -> None:
+        self._filepath = filepath
+        with open(filepath, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.locations = list(_HEADER_TABLE.unpack_from(self._view, 0))
+        self.timestamps = list(_HEADER_TABLE.unpack_from(self._view, SECTOR_SIZE))
+
+    def read_raw(self, index: int) -> Optional[tuple[int, memoryview]]:
+        """Returns compression type and compressed payload of the chunk, or None if the chunk does not exist.
+
+        Raises:
+            ValueError: if the chunk data lies outside of the file.
+        """
+
+        offset = (self.locations[index] >> 8) * SECTOR_SIZE
+        if offset == 0:
+            return None
+
+        if offset + _CHUNK_HEADER.size > len(self._view):
+            raise ValueError(f"Chunk {index} lies outside of the region file.")
+        length, compression = _CHUNK_HEADER.unpack_from(self._view, offset)
+        start = offset + _CHUNK_HEADER.size
+        # Same as `Chunk._read_body`: `length` bytes are taken after the compression byte.
+        end = min(start + length, len(self._view))
+        return compression, self._view[start:end]
+
+    def external_path(self, index: int) -> str:
+        """Returns path of the external file of the chunk."""
+
+        region_x, region_z = cords_from_filepath(self._filepath)
+        x, z = cords_from_location(index)
+        return external_chunk_path(
+            os.path.dirname(self._filepath), region_x * 32 + x, region_z * 32 + z
+        )
+
+    def read_sectors(self, offset: int, count: int) -> memoryview:
+        """Returns `count` sectors starting at `offset`, the last sector may be shorter if the file is truncated."""
+
+        return self._view[offset * SECTOR_SIZE : (offset + count) * SECTOR_SIZE]
+
+    def chunk_infos(self) -> list[ChunkInfo]:
+        """Returns information about every existing chunk without decompressing anything."""
+
+        infos = []
+        file_size = len(self._view)
+        for index, location in enumerate(self.locations):
+            offset = location >> 8
+            if offset == 0:
+                continue
+
+            position = offset * SECTOR_SIZE
+            length, compression = 0, 0
+            if position + _CHUNK_HEADER.size <= file_size:
+                length, compression = _CHUNK_HEADER.unpack_from(self._view, position)
+            infos.append(
+                ChunkInfo(
+                    *cords_from_location(index),
+                    offset=offset,
+                    sector_count=location & 0xFF,
+                    length=length,
+                    compression=compression,
+                    timestamp=self.timestamps[index],
+                )
+            )
+        return infos
+
+    def read_chunk(
+        self, index: int, decode: bool = True, lazy_tags: bool = False
+    ) -> Chunk:
+        """Reads chunk by its index in the location table.
+
+        Args:
+            decode (bool, optional): if False, the chunk is decoded on first access to its data. Defaults to True.
+            lazy_tags (bool, optional): if True, nested compounds and lists of the chunk data are decoded on first access
+                and written back as is while untouched. Defaults to False.
+        """
+
+        chunk = Chunk(*cords_from_location(index))
+        raw = self.read_raw(index)
+        if raw is None:
+            return chunk
+
+        compression, payload = raw
+        with payload:
+            if compression & EXTERNAL_FLAG:
+                chunk._read_external(
+                    self.external_path(index), compression, decode, lazy_tags
+                )
+            else:
+                chunk.compression = compression
+                chunk._read_payload(payload, decode, lazy_tags)
+        chunk.timestamp = self.timestamps[index]
+        return chunk
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "RegionReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class SectorAllocator:
+    """Keeps track of used sectors of the region file."""
+
+    def __init__(self, locations: Sequence[int], file_size: int) -> None:
+        self._used = bytearray(max(sectors_for(file_size), 2))
+        self.mark_used(0, 2)
+        for location in locations:
+            offset = location >> 8
+            if offset:
+                self.mark_used(offset, location & 0xFF)
+
+    def mark_used(self, offset: int, count: int) -> None:
+        end = offset + count
+        if end > len(self._used):
+            self._used.extend(bytes(end - len(self._used)))
+        self._used[offset:end] = b"\x01" * count
+
+    def free(self, offset: int, count: int) -> None:
+        end = min(offset + count, len(self._used))
+        self._used[offset:end] = bytes(end - offset)
+
+    def allocate(self, count: int) -> int:
+        """Finds and marks as used the first run of `count` free sectors.
+
+        Returns:
+            int: offset of the run in sectors. If there is no such run, it is placed at the end of the file.
+        """
+
+        offset = self._used.find(bytes(count))
+        if offset == -1:
+            offset = len(self._used.rstrip(b"\x00"))
+        self.mark_used(offset, count)
+        return offset
+
+    def sector_count(self) -> int:
+        """Returns number of sectors up to the last used one."""
+
+        return len(self._used.rstrip(b"\x00"))
+
+
+def read_chunk_infos(filepath: StrOrPath) -> list[ChunkInfo]:
+    """Reads information about every existing chunk of the region file, only the header and chunk length fields are read."""
+
+    with RegionReader(filepath) as reader:
+        return reader.chunk_infos()
+
+
+def compact_region_file(filepath: StrOrPath, dry_run: bool = False) -> CompactionReport:
+    """Rewrites chunks of the region file contiguously, removing unused sectors.
+
+    Chunk sectors are copied as is, nothing is decompressed. Chunks keep their order in the file.
+
+    Args:
+        dry_run (bool, optional): if True, only the header is read and the file is left untouched. Defaults to False.
+    """
+
+    file_size = os.path.getsize(filepath)
+    with RegionReader(filepath) as reader:
+        used = sorted(
+            (location >> 8, location & 0xFF, index)
+            for index, location in enumerate(reader.locations)
+            if location >> 8
+        )
+        used_sectors = 2 + sum(count for _, count, _ in used)
+        report = CompactionReport(
+            file_size=file_size,
+            compacted_size=used_sectors * SECTOR_SIZE,
+            free_sectors=max(sectors_for(file_size) - used_sectors, 0),
+        )
+        if dry_run or report.reclaimed_bytes <= 0:
+            return report
+
+        temp_filepath = f"{filepath}.tmp"
+        locations = [0] * HEADER_ENTRIES
+        with open(temp_filepath, "wb") as file:
+            file.seek(SECTOR_SIZE * 2)
+            new_offset = 2
+            for offset, count, index in used:
+                with reader.read_sectors(offset, count) as data:
+                    file.write(data)
+                    file.write(bytes(count * SECTOR_SIZE - len(data)))
+                locations[index] = (new_offset << 8) | count
+                new_offset += count
+
+            file.seek(0)
+            file.write(_HEADER_TABLE.pack(*locations))
+            file.write(_HEADER_TABLE.pack(*reader.timestamps))
+
+    os.replace(temp_filepath, filepath)
+    return report
+
+
+class _LazyChunks(Sequence):
+    """Read-only sequence of region chunks that are decoded on first access."""
+
+    def __init__(self, region: "Region") -> None:
+        self._region = region
+
+    def __len__(self) -> int:
+        return HEADER_ENTRIES
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if not -HEADER_ENTRIES <= index < HEADER_ENTRIES:
+            raise IndexError("Chunk index out of range.")
+        return self._region._get_cached_chunk(index % HEADER_ENTRIES)
 
 
 class Region:
     def __init__(
-        self, x: int = 0, z: int = 0, filepath: Optional[StrOrPath] = None
+        self,
+        x: int = 0,
+        z: int = 0,
+        filepath: Optional[StrOrPath] = None,
+        lazy: bool = False,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        workers: Optional[int] = None,
+        lazy_tags: bool = False,
     ) -> None:
+        """
+        Args:
+            lazy (bool, optional): if True, only the region header is read on load and chunks are decoded on first access. Defaults to False.
+            cache_size (int, optional): maximum number of decoded chunks kept by a lazy region. Modified chunks are never
+                evicted, they are kept over the limit until they are saved. With 0, chunks are not kept at all, so changed
+                chunks have to be saved with `save_chunk` and `write_region_file` is not available. Defaults to DEFAULT_CACHE_SIZE.
+            workers (Optional[int], optional): number of threads used to decompress chunks on load, see `load_region_file`. Defaults to None.
+            lazy_tags (bool, optional): if True, nested compounds and lists of chunk data are decoded on first access
+                and untouched ones are written back as is, see `RegionReader.read_chunk`. Defaults to False.
+        """
+
         self._binary_handler = BinaryHandler(ByteOrder.BIG)
-        self.chunks: list[Chunk] = []
+        self.chunks: Sequence[Chunk] = []
         self.x, self.z = x, z
+        self._lazy = lazy
+        self._lazy_tags = lazy_tags
+        self._cache_size = cache_size
+        self._cache: OrderedDict[int, Chunk] = OrderedDict()
+        # Modified chunks evicted from the cache are kept here until they are saved.
+        self._pinned: dict[int, Chunk] = {}
+        self._cache_lock = threading.Lock()
+        self._reader: Optional[RegionReader] = None
+        self._filepath: Optional[StrOrPath] = None
+        self._locations: list[int] = []
+        self._timestamps: list[int] = []
+        self._allocator: Optional[SectorAllocator] = None
         if filepath:
-            self.load_region_file(filepath)
+            self.load_region_file(filepath, workers)
 
-    def load_region_file(self, filepath: StrOrPath) -> None:
+    def load_region_file(
+        self, filepath: StrOrPath, workers: Optional[int] = None
+    ) -> None:
         """Loads region file.
 
+        Args:
+            workers (Optional[int], optional): if greater than 1, chunks are decompressed by a thread pool while
+                already decompressed ones are parsed. Ignored by lazy regions. Defaults to None.
+
         Raises:
             ValueError: if the file name does not match pattern "x.z.mca".
             ValueError: if the file size is less than 8192.
@@ -202,32 +783,521 @@ class Region:
             raise ValueError(f"File '{filepath}' is too small.")
 
         self.x, self.z = self.cords_from_filepath(filepath)
+        self._filepath = filepath
+        self._allocator = None
+        self.close()
 
-        with open(filepath, "rb") as file:
-            for index in range(SECTOR_SIZE // INT_SIZE):
-                chunk = Chunk()
-                chunk.read_chunk(index, file)
-                self.chunks.append(chunk)
+        reader = RegionReader(filepath)
+        self._locations, self._timestamps = reader.locations, reader.timestamps
+        if self._lazy:
+            self._reader = reader
+            self.chunks = _LazyChunks(self)
+            return
+
+        with reader:
+            if not workers or workers <= 1:
+                self.chunks = [
+                    reader.read_chunk(index, lazy_tags=self._lazy_tags)
+                    for index in range(HEADER_ENTRIES)
+                ]
+                return
+
+            chunks = [
+                reader.read_chunk(index, decode=False, lazy_tags=self._lazy_tags)
+                for index in range(HEADER_ENTRIES)
+            ]
+        encoded = [chunk for chunk in chunks if not chunk._is_decoded()]
+        with ThreadPoolExecutor(workers) as pool:
+            for chunk, chunk_data in zip(
+                encoded, pool.map(Chunk._decompress_raw, encoded)
+            ):
+                chunk._decode_raw(chunk_data)
+        self.chunks = chunks
+
+    def get_chunk(self, x: int, z: int) -> Chunk:
+        """Returns chunk by its relative coordinates inside the region."""
+
+        return self.chunks[location_from_cords(x, z)]
+
+    def save_chunk(self, chunk: Chunk, compression_level: Optional[int] = None) -> None:
+        """Writes a single chunk back to the loaded region file without rewriting other chunks.
+
+        The chunk is written in place if it still fits into its sectors, otherwise into the first run of free sectors.
+        Empty chunk is removed from the file. Only the chunk's location and timestamp entries are updated in the header.
+
+        Args:
+            compression_level (Optional[int], optional): compression level used if the chunk has to be compressed. Defaults to None.
+
+        Raises:
+            ValueError: if the region was not loaded from a file.
+        """
+
+        if self._filepath is None:
+            raise ValueError("Region was not loaded from a file.")
+        if self._allocator is None:
+            self._allocator = SectorAllocator(
+                self._locations, os.path.getsize(self._filepath)
+            )
+
+        index = location_from_cords(chunk.x, chunk.z)
+        old_offset = self._locations[index] >> 8
+        old_count = self._locations[index] & 0xFF
+
+        body, payload = b"", None
+        if not chunk.is_empty():
+            body, payload = self._encode_saved_chunk(
+                chunk, os.path.dirname(self._filepath), compression_level
+            )
+        count = sectors_for(len(body))
+
+        if count and old_offset and count <= old_count:
+            offset = old_offset
+            self._allocator.free(offset + count, old_count - count)
+        else:
+            if old_offset:
+                self._allocator.free(old_offset, old_count)
+            offset = self._allocator.allocate(count) if count else 0
+
+        location = (offset << 8) | count
+        timestamp = chunk.timestamp if count else 0
+        with open(self._filepath, "r+b") as file:
+            if count:
+                file.seek(offset * SECTOR_SIZE)
+                file.write(body)
+                chunk._add_padding(file, len(body), count)
+            file.seek(index * INT_SIZE)
+            self._binary_handler.write_int(file, location, signed=False)
+            file.seek(index * INT_SIZE + SECTOR_SIZE)
+            self._binary_handler.write_int(file, timestamp, signed=False)
+
+        self._locations[index] = location
+        self._timestamps[index] = timestamp
+        if not _is_external(body):
+            self._remove_stale_external(os.path.dirname(self._filepath), chunk.x, chunk.z)
+        if payload is not None:
+            chunk._set_payload(*payload)
+        self._store_chunks([(index, chunk)])
+
+    def save_chunks(
+        self, chunks: Iterable[Chunk], compression_level: Optional[int] = None
+    ) -> int:
+        """Writes several chunks back to the loaded region file as a single atomic update.
+
+        Unlike `save_chunk`, chunks are never written in place: every chunk goes into free sectors, which are not
+        referenced by the header, and the header is written once, after the chunk data is flushed to disk.
+        If the process is interrupted before that, the file keeps the old version of every chunk.
+        Sectors of the replaced chunks become free only after the header is written.
+
+        `chunks` may be a generator, every chunk is written as soon as it is produced.
+
+        Args:
+            compression_level (Optional[int], optional): compression level used if a chunk has to be compressed. Defaults to None.
+
+        Returns:
+            int: number of saved chunks.
+
+        Raises:
+            ValueError: if the region was not loaded from a file.
+        """
+
+        if self._filepath is None:
+            raise ValueError("Region was not loaded from a file.")
+        if self._allocator is None:
+            self._allocator = SectorAllocator(
+                self._locations, os.path.getsize(self._filepath)
+            )
+
+        folder = os.path.dirname(self._filepath)
+        locations, timestamps = list(self._locations), list(self._timestamps)
+        replaced = []
+        saved = []
+        # External files can be removed only after the header stops pointing to them.
+        stale = []
+        # Lazy regions without cache would only drop the chunks after the update.
+        keep_chunks = not self._lazy or self._cache_size > 0
+        with open(self._filepath, "r+b") as file:
+            for chunk in chunks:
+                index = location_from_cords(chunk.x, chunk.z)
+                if locations[index] >> 8:
+                    replaced.append((locations[index] >> 8, locations[index] & 0xFF))
+
+                body, payload = b"", None
+                if not chunk.is_empty():
+                    body, payload = self._encode_saved_chunk(
+                        chunk, folder, compression_level
+                    )
+                count = sectors_for(len(body))
+                offset = self._allocator.allocate(count) if count else 0
+                if count:
+                    file.seek(offset * SECTOR_SIZE)
+                    file.write(body)
+                    chunk._add_padding(file, len(body), count)
+
+                locations[index] = (offset << 8) | count
+                timestamps[index] = chunk.timestamp if count else 0
+                if not _is_external(body):
+                    stale.append((chunk.x, chunk.z))
+                if keep_chunks:
+                    saved.append((index, chunk, payload))
+                else:
+                    saved.append((index, None, None))
+
+            if not saved:
+                return 0
+            file.flush()
+            os.fsync(file.fileno())
+            file.seek(0)
+            file.write(_HEADER_TABLE.pack(*locations))
+            file.write(_HEADER_TABLE.pack(*timestamps))
+            file.flush()
+            os.fsync(file.fileno())
+
+        for offset, count in replaced:
+            self._allocator.free(offset, count)
+        for x, z in stale:
+            self._remove_stale_external(folder, x, z)
+        self._locations, self._timestamps = locations, timestamps
+        for _, chunk, payload in saved:
+            if payload is not None:
+                chunk._set_payload(*payload)
+        self._store_chunks([(index, chunk) for index, chunk, _ in saved])
+        return len(saved)
+
+    def compact(self, dry_run: bool = False) -> CompactionReport:
+        """Compacts the loaded region file, see `compact_region_file`.
+
+        Raises:
+            ValueError: if the region was not loaded from a file.
+        """
+
+        if self._filepath is None:
+            raise ValueError("Region was not loaded from a file.")
+        if dry_run:
+            return compact_region_file(self._filepath, dry_run)
+
+        # The file is replaced, so the mapping is closed first: compaction must not run while other threads read chunks.
+        with self._cache_lock:
+            old_reader, self._reader = self._reader, None
+        if old_reader is not None:
+            old_reader.close()
+        report = compact_region_file(self._filepath)
+
+        self._allocator = None
+        reader = RegionReader(self._filepath)
+        self._locations, self._timestamps = reader.locations, reader.timestamps
+        if old_reader is not None:
+            with self._cache_lock:
+                self._reader = reader
+        else:
+            reader.close()
+        return report
+
+    def copy_chunk_from(
+        self,
+        source: "Region",
+        x: int,
+        z: int,
+        dest_x: Optional[int] = None,
+        dest_z: Optional[int] = None,
+        patch_position: bool = False,
+    ) -> Chunk:
+        """Copies compressed chunk payload from another region into the loaded region file without decoding it.
+
+        Args:
+            x (int): relative x coordinate of the chunk in the source region.
+            z (int): relative z coordinate of the chunk in the source region.
+            dest_x (Optional[int], optional): relative x coordinate in this region. Defaults to x.
+            dest_z (Optional[int], optional): relative z coordinate in this region. Defaults to z.
+            patch_position (bool, optional): if True, `xPos` and `zPos` tags are set to the new absolute chunk position.
+                The payload is decompressed and compressed again, but not parsed. Defaults to False.
+
+        Returns:
+            Chunk: copied chunk, decoded on first access to its data.
+        """
+
+        dest_x = x if dest_x is None else dest_x
+        dest_z = z if dest_z is None else dest_z
+        source_chunk = source._read_raw_chunk(location_from_cords(x, z))
+
+        chunk = Chunk(dest_x, dest_z, source_chunk.timestamp, source_chunk.compression)
+        if source_chunk.is_empty():
+            self.save_chunk(chunk)
+            return chunk
+
+        payload = source_chunk._encode_payload()
+        if patch_position:
+            data = bytearray(chunk._decompress_chunk(payload).getbuffer())
+            _patch_position(data, self.x * 32 + dest_x, self.z * 32 + dest_z)
+            payload = chunk._compress_chunk(bytes(data))
+
+        chunk._read_payload(payload, decode=False)
+        self.save_chunk(chunk)
+        return chunk
+
+    def _read_raw_chunk(self, index: int) -> Chunk:
+        """Returns chunk without decoding it, if it has not been decoded already."""
+
+        with self._cache_lock:
+            chunk = self._cache.get(index) or self._pinned.get(index)
+            reader = self._reader
+        if chunk is not None:
+            return chunk
+        if reader is not None:
+            return reader.read_chunk(index, decode=False, lazy_tags=self._lazy_tags)
+        if isinstance(self.chunks, list) and len(self.chunks) == HEADER_ENTRIES:
+            return self.chunks[index]
+        if self._filepath is not None:
+            with RegionReader(self._filepath) as reader:
+                return reader.read_chunk(
+                    index, decode=False, lazy_tags=self._lazy_tags
+                )
+        return Chunk(*cords_from_location(index))
+
+    def _store_chunks(self, chunks: list[tuple[int, Optional[Chunk]]]) -> None:
+        """Updates loaded chunks after they were written to the file, None means the chunk was not kept."""
+
+        if self._reader is not None:
+            # The mapping does not grow with the file. The old reader is not closed, other threads may still be
+            # reading chunks from it: its mapping is released when the last of them drops it.
+            reader = RegionReader(self._filepath)  # type: ignore
+            with self._cache_lock:
+                self._reader = reader
+            self._locations = reader.locations
+            self._timestamps = reader.timestamps
+            for index, chunk in chunks:
+                with self._cache_lock:
+                    self._pinned.pop(index, None)
+                    if chunk is None:
+                        self._cache.pop(index, None)
+                if chunk is not None:
+                    self._cache_put(index, chunk)
+        elif isinstance(self.chunks, list) and len(self.chunks) == HEADER_ENTRIES:
+            for index, chunk in chunks:
+                if chunk is not None:
+                    self.chunks[index] = chunk
+
+    def is_lazy(self) -> bool:
+        return self._lazy
+
+    def close(self) -> None:
+        """Releases the memory-mapped file of a lazy region. Must not be called while other threads read chunks."""
+
+        with self._cache_lock:
+            reader, self._reader = self._reader, None
+            self._cache.clear()
+            self._pinned.clear()
+        if reader is not None:
+            reader.close()
+
+    def _get_cached_chunk(self, index: int) -> Chunk:
+        """Returns decoded chunk from the LRU cache, decoding it from the file on a miss.
+
+        The chunk is decoded outside of the cache lock, so different chunks can be decoded by several threads at once.
+        """
+
+        with self._cache_lock:
+            chunk = self._cache.get(index)
+            if chunk is not None:
+                self._cache.move_to_end(index)
+                return chunk
+            pinned = self._pinned.get(index)
+            reader = self._reader
+        if pinned is not None:
+            # Pinned chunk that is used again goes back to the cache.
+            return self._cache_put(index, pinned)
+
+        if reader is None:
+            raise ValueError("Region file is closed.")
+        chunk = reader.read_chunk(index, lazy_tags=self._lazy_tags)
+
+        return self._cache_put(index, chunk, replace=False)
+
+    def _cache_put(self, index: int, chunk: Chunk, replace: bool = True) -> Chunk:
+        """Puts chunk into the LRU cache and returns the cached one.
+
+        Evicted chunks that were modified are pinned until they are saved, otherwise their changes would be lost
+        (for example, `write_region_file` would write the original data read from the file again).
+        Only chunks whose data was handed out can be modified, they are pinned at once and serialized to check
+        for changes outside of the lock, clean ones are unpinned after that.
+        """
+
+        suspects = []
+        with self._cache_lock:
+            if self._cache_size <= 0:
+                return chunk
+            pinned = self._pinned.pop(index, None)
+            if replace:
+                self._cache[index] = chunk
+            elif pinned is not None:
+                self._cache[index] = pinned
+            chunk = self._cache.setdefault(index, chunk)
+            self._cache.move_to_end(index)
+            while len(self._cache) > self._cache_size:
+                evicted_index, evicted = self._cache.popitem(last=False)
+                if evicted._may_be_modified():
+                    self._pinned[evicted_index] = evicted
+                    suspects.append((evicted_index, evicted))
+
+        for evicted_index, evicted in suspects:
+            if not evicted.is_dirty():
+                with self._cache_lock:
+                    if self._pinned.get(evicted_index) is evicted:
+                        del self._pinned[evicted_index]
+        return chunk
+
+    def __enter__(self) -> "Region":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     def cords_from_filepath(self, filepath: StrOrPath) -> tuple[int, int]:
         """Gets x and z coordinates from the region file name."""
 
-        filepath = os.path.basename(filepath)
-        filepath = filepath.replace("r.", "").replace(".mca", "")
-        x, z = map(int, filepath.split("."))
-        return x, z
+        return cords_from_filepath(filepath)
 
-    def write_region_file(self, output_folder: StrOrPath) -> None:
-        """Saves region data to file. The file name is generated automatically based on the x and z positions of the region file, so only the directory must be specified."""
+    def write_region_file(
+        self,
+        output_folder: StrOrPath,
+        compression_level: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Saves region data to file. The file name is generated automatically based on the x and z positions of the region file, so only the directory must be specified.
+
+        Args:
+            compression_level (Optional[int], optional): compression level of chunks that have to be compressed, codec default is used if None.
+                Clean chunks keep their original payload, use `Chunk.mark_dirty` to recompress them. Defaults to None.
+            workers (Optional[int], optional): if greater than 1, chunks are compressed by a thread pool while the next ones are serialized.
+                Chunks are written in the same order and at the same offsets as without workers. Ignored by lazy regions. Defaults to None.
+
+        Raises:
+            ValueError: if the region is lazy and has no cache (`cache_size=0`), such region does not keep modified chunks.
+        """
 
         filepath = os.path.join(output_folder, f"r.{self.x}.{self.z}.mca")
+        if self._lazy:
+            self._write_lazy_region_file(filepath, output_folder, compression_level)
+            return
+
+        chunks = [chunk for chunk in self.chunks if not chunk.is_empty()]
+        with open(filepath, "wb") as file:
+            self._init_tables(file)
+            offset = 2
+            if not workers or workers <= 1:
+                for chunk in chunks:
+                    body = self._encode_chunk(chunk, output_folder, compression_level)
+                    offset += chunk._write_encoded(file, offset, body)
+                    if not _is_external(body):
+                        self._remove_stale_external(output_folder, chunk.x, chunk.z)
+                return
+
+            def compress(
+                chunk: Chunk, payload: Optional[bytes], chunk_data: Optional[bytes]
+            ) -> bytes:
+                if payload is None:
+                    payload = chunk._compress_chunk(chunk_data, compression_level)  # type: ignore
+                return chunk._body_from_payload(payload)
+
+            with ThreadPoolExecutor(workers) as pool:
+                futures = [
+                    pool.submit(compress, chunk, *chunk._reuse_payload())
+                    for chunk in chunks
+                ]
+                for chunk, future in zip(chunks, futures):
+                    body = self._store_body(chunk, output_folder, future.result())
+                    offset += chunk._write_encoded(file, offset, body)
+                    if not _is_external(body):
+                        self._remove_stale_external(output_folder, chunk.x, chunk.z)
+
+    def _write_lazy_region_file(
+        self, filepath: StrOrPath, output_folder: StrOrPath, level: Optional[int]
+    ) -> None:
+        """Writes cached and pinned chunks of a lazy region, other chunks are copied from the file without decoding them."""
+
+        if self._cache_size <= 0:
+            raise ValueError(
+                "Lazy region without cache does not keep modified chunks, save them with save_chunk."
+            )
+        with self._cache_lock:
+            reader = self._reader
+            loaded = {**self._pinned, **self._cache}
+        if reader is None:
+            raise ValueError("Region file is closed.")
+
+        same_folder = os.path.realpath(output_folder) == os.path.realpath(
+            os.path.dirname(self._filepath)  # type: ignore
+        )
         with open(filepath, "wb") as file:
             self._init_tables(file)
             offset = 2
-            for chunk in self.chunks:
-                if chunk.is_empty():
+            for index in range(HEADER_ENTRIES):
+                chunk = loaded.get(index)
+                if chunk is not None:
+                    if chunk.is_empty():
+                        continue
+                    body = self._encode_chunk(chunk, output_folder, level)
+                    offset += chunk._write_encoded(file, offset, body)
+                    if not _is_external(body):
+                        self._remove_stale_external(output_folder, chunk.x, chunk.z)
+                    continue
+
+                raw = reader.read_raw(index)
+                if raw is None:
                     continue
-                offset += chunk.write_chunk(file, offset)
+                compression, payload = raw
+                with payload:
+                    body = _CHUNK_HEADER.pack(len(payload), compression) + payload
+                x, z = cords_from_location(index)
+                if compression & EXTERNAL_FLAG and not same_folder:
+                    shutil.copyfile(
+                        reader.external_path(index),
+                        external_chunk_path(output_folder, self.x * 32 + x, self.z * 32 + z),
+                    )
+                target = Chunk(x, z, timestamp=reader.timestamps[index])
+                offset += target._write_encoded(file, offset, body)
+
+    def _encode_chunk(
+        self, chunk: Chunk, folder: StrOrPath, level: Optional[int] = None
+    ) -> bytes:
+        return self._store_body(chunk, folder, chunk._encode_body(level))
+
+    def _encode_saved_chunk(
+        self, chunk: Chunk, folder: StrOrPath, level: Optional[int] = None
+    ) -> tuple[bytes, Optional[tuple[bytes, bytes]]]:
+        """Returns chunk body and, if the chunk was compressed again, the new payload with the digest of its data
+        for `Chunk._set_payload`."""
+
+        payload, chunk_data = chunk._reuse_payload()
+        if payload is not None:
+            return self._store_body(chunk, folder, chunk._body_from_payload(payload)), None
+        payload = chunk._compress_chunk(chunk_data, level)  # type: ignore
+        body = self._store_body(chunk, folder, chunk._body_from_payload(payload))
+        return body, (payload, _digest(chunk_data))  # type: ignore
+
+    def _store_body(self, chunk: Chunk, folder: StrOrPath, body: bytes) -> bytes:
+        """Returns chunk body. If the body does not fit into 255 sectors, the payload is written to an external file."""
+
+        if sectors_for(len(body)) <= MAX_CHUNK_SECTORS:
+            return body
+
+        filepath = external_chunk_path(
+            folder, self.x * 32 + chunk.x, self.z * 32 + chunk.z
+        )
+        # The previous version of the external file is replaced at once, never truncated.
+        temp_filepath = f"{filepath}.tmp"
+        with open(temp_filepath, "wb") as file:
+            file.write(memoryview(body)[_CHUNK_HEADER.size :])
+        os.replace(temp_filepath, filepath)
+        return _CHUNK_HEADER.pack(1, chunk.compression | EXTERNAL_FLAG)
+
+    def _remove_stale_external(self, folder: StrOrPath, x: int, z: int) -> None:
+        """Removes external file left by a bigger version of the chunk, once the written header no longer points to it."""
+
+        filepath = external_chunk_path(folder, self.x * 32 + x, self.z * 32 + z)
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
 
     def _init_tables(self, buffer: BinaryIO) -> None:
         """Initializes first 2 table (the location table and the timestamos table) with zeros."""
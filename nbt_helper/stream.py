@@ -0,0 +1,286 @@
+__all__ = ["EventTypes", "Event", "iterparse", "skip_payload", "read_paths"]
+
+import os
+from enum import Enum
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from nbt_helper.tags import (
+    TAGS,
+    BaseTag,
+    BinaryHandler,
+    TagCompound,
+    ByteOrder,
+    TAG_END,
+    TAG_BYTE,
+    TAG_SHORT,
+    TAG_INT,
+    TAG_LONG,
+    TAG_FLOAT,
+    TAG_DOUBLE,
+    TAG_BYTE_ARRAY,
+    TAG_STRING,
+    TAG_LIST,
+    TAG_COMPOUND,
+    TAG_INT_ARRAY,
+    TAG_LONG_ARRAY,
+    TAG_SIZES,
+    ARRAY_ITEM_SIZES,
+)
+
+
+TagPath = Union[str, tuple[str, ...]]
+
+
+class EventTypes(Enum):
+    START = "start"
+    """Start of TagCompound or TagList."""
+    END = "end"
+    """End of TagCompound or TagList."""
+    VALUE = "value"
+    """Any other tag."""
+
+
+class Event(NamedTuple):
+    type: EventTypes
+    tag_id: int
+    name: str
+    """Tag name, empty for list items."""
+    value: Any = None
+    """Tag value for VALUE events, tuple of items tag id and length for START event of TagList, None otherwise."""
+
+
+def _read_string(handler: BinaryHandler, buffer: BinaryIO) -> str:
+    length = handler.read_short(buffer, signed=False)
+    data = buffer.read(length)
+    if len(data) != length:
+        raise ValueError(f"String length not equal: {length=}, {data=}.")
+    return data.decode("utf-8")
+
+
+def _read_byte_array(handler: BinaryHandler, buffer: BinaryIO) -> bytes:
+    return buffer.read(handler.read_int(buffer))
+
+
+def _value_readers(handler: BinaryHandler) -> dict[int, Callable[[BinaryIO], Any]]:
+    return {
+        TAG_BYTE: handler.read_byte,
+        TAG_SHORT: handler.read_short,
+        TAG_INT: handler.read_int,
+        TAG_LONG: handler.read_long,
+        TAG_FLOAT: handler.read_float,
+        TAG_DOUBLE: handler.read_double,
+        TAG_STRING: lambda buffer: _read_string(handler, buffer),
+        TAG_BYTE_ARRAY: lambda buffer: _read_byte_array(handler, buffer),
+        TAG_INT_ARRAY: lambda buffer: handler.read_int_array(
+            buffer, handler.read_int(buffer)
+        ),
+        TAG_LONG_ARRAY: lambda buffer: handler.read_long_array(
+            buffer, handler.read_int(buffer)
+        ),
+    }
+
+
+def iterparse(
+    buffer: BinaryIO,
+    byte_order: ByteOrder = ByteOrder.BIG,
+    tag_id: Optional[int] = None,
+) -> Iterator[Event]:
+    """Parses NBT data from the buffer and yields events instead of building tags.
+
+    Only the currently open compounds and lists are kept in memory, so huge files can be processed in constant memory.
+
+    Args:
+        byte_order (ByteOrder, optional): byte order of the data. Defaults to ByteOrder.BIG.
+        tag_id (Optional[int], optional): if specified, the buffer holds the payload of unnamed tag with this id
+            (for example, decompressed chunk data without the root tag header). Otherwise, the buffer starts with
+            tag id and name of the root tag. Defaults to None.
+
+    Example:
+        >>> for event in iterparse(buffer):
+        ...     if event.type is EventTypes.VALUE and event.name == "Count":
+        ...         total += event.value
+    """
+
+    handler = BinaryHandler(byte_order)
+    readers = _value_readers(handler)
+    name = ""
+    if tag_id is None:
+        tag_id = handler.read_byte(buffer)
+        name = _read_string(handler, buffer)
+
+    # Each frame is [tag id, name, items tag id, remaining items], compounds do not use the last two.
+    stack: list[list] = []
+    while True:
+        if tag_id == TAG_COMPOUND:
+            yield Event(EventTypes.START, tag_id, name)
+            stack.append([tag_id, name, TAG_END, 0])
+        elif tag_id == TAG_LIST:
+            items_tag_id = handler.read_byte(buffer)
+            length = handler.read_int(buffer)
+            yield Event(EventTypes.START, tag_id, name, (items_tag_id, length))
+            stack.append([tag_id, name, items_tag_id, length])
+        elif tag_id in readers:
+            yield Event(EventTypes.VALUE, tag_id, name, readers[tag_id](buffer))
+        else:
+            raise ValueError(f"Unknown tag id {tag_id}.")
+
+        while stack:
+            frame = stack[-1]
+            if frame[0] == TAG_COMPOUND:
+                tag_id = handler.read_byte(buffer)
+                if tag_id != TAG_END:
+                    name = _read_string(handler, buffer)
+                    break
+            elif frame[3] > 0:
+                frame[3] -= 1
+                tag_id, name = frame[2], ""
+                break
+
+            stack.pop()
+            yield Event(EventTypes.END, frame[0], frame[1])
+        else:
+            return
+
+
+def skip_payload(handler: BinaryHandler, buffer: BinaryIO, tag_id: int) -> None:
+    """Moves the buffer position past the payload of the tag, without decoding it.
+
+    Fixed-size tags, strings, arrays and lists of fixed-size tags are skipped with a single seek.
+    """
+
+    if tag_id in TAG_SIZES:
+        buffer.seek(TAG_SIZES[tag_id], os.SEEK_CUR)
+    elif tag_id == TAG_STRING:
+        buffer.seek(handler.read_short(buffer, signed=False), os.SEEK_CUR)
+    elif tag_id in ARRAY_ITEM_SIZES:
+        length = handler.read_int(buffer)
+        buffer.seek(length * ARRAY_ITEM_SIZES[tag_id], os.SEEK_CUR)
+    elif tag_id == TAG_LIST:
+        items_tag_id = handler.read_byte(buffer)
+        length = handler.read_int(buffer)
+        if items_tag_id in TAG_SIZES:
+            buffer.seek(max(length, 0) * TAG_SIZES[items_tag_id], os.SEEK_CUR)
+        else:
+            for _ in range(length):
+                skip_payload(handler, buffer, items_tag_id)
+    elif tag_id == TAG_COMPOUND:
+        while True:
+            item_tag_id = handler.read_byte(buffer)
+            if item_tag_id == TAG_END:
+                break
+            buffer.seek(handler.read_short(buffer, signed=False), os.SEEK_CUR)
+            skip_payload(handler, buffer, item_tag_id)
+    else:
+        raise ValueError(f"Unknown tag id {tag_id}.")
+
+
+def _split_path(path: TagPath) -> tuple[str, ...]:
+    if isinstance(path, str):
+        return tuple(path.split("/"))
+    return tuple(path)
+
+
+def read_paths(
+    buffer: BinaryIO,
+    paths: Iterable[TagPath],
+    byte_order: ByteOrder = ByteOrder.BIG,
+    tag_id: Optional[int] = None,
+) -> dict[TagPath, BaseTag]:
+    """Decodes only the requested tags, all other subtrees are skipped with `skip_payload`.
+
+    Reading stops as soon as all paths are found, so the buffer position is undefined afterwards.
+
+    Args:
+        paths (Iterable[TagPath]): paths of tags from the root compound, either strings with names separated by "/"
+            (for example "Level/Status") or tuples of names. Paths can only go through compounds.
+        byte_order (ByteOrder, optional): byte order of the data. Defaults to ByteOrder.BIG.
+        tag_id (Optional[int], optional): see `iterparse`. Defaults to None.
+
+    Returns:
+        dict[TagPath, BaseTag]: found tags by requested paths, missing paths are omitted.
+    """
+
+    handler = BinaryHandler(byte_order)
+    if tag_id is None:
+        tag_id = handler.read_byte(buffer)
+        _read_string(handler, buffer)
+    if tag_id != TAG_COMPOUND:
+        raise ValueError("Data must starts with Compound tag.")
+
+    # Trie of requested names, None key marks the end of a requested path.
+    trie: dict = {}
+    requested: dict[tuple[str, ...], TagPath] = {}
+    for path in paths:
+        names = _split_path(path)
+        requested[names] = path
+        node = trie
+        for name in names:
+            node = node.setdefault(name, {})
+        node[None] = None
+
+    result: dict[TagPath, BaseTag] = {}
+    if requested:
+        _read_compound_paths(handler, buffer, trie, (), requested, result)
+    return result
+
+
+def _read_compound_paths(
+    handler: BinaryHandler,
+    buffer: BinaryIO,
+    trie: dict,
+    prefix: tuple[str, ...],
+    requested: dict[tuple[str, ...], TagPath],
+    result: dict[TagPath, BaseTag],
+) -> bool:
+    """Reads requested paths from the compound payload.
+
+    Returns:
+        bool: True if all requested paths are found and reading was stopped.
+    """
+
+    while True:
+        tag_id = handler.read_byte(buffer)
+        if tag_id == TAG_END:
+            return False
+        name = _read_string(handler, buffer)
+        node = trie.get(name)
+        if node is None:
+            skip_payload(handler, buffer, tag_id)
+            continue
+
+        names = prefix + (name,)
+        if None in node:
+            tag = TAGS[tag_id](handler, name=name, buffer=buffer)
+            _store_paths(tag, node, names, requested, result)
+            if len(result) == len(requested):
+                return True
+        elif tag_id == TAG_COMPOUND:
+            if _read_compound_paths(handler, buffer, node, names, requested, result):
+                return True
+        else:
+            skip_payload(handler, buffer, tag_id)
+
+
+def _store_paths(
+    tag: BaseTag,
+    trie: dict,
+    names: tuple[str, ...],
+    requested: dict[tuple[str, ...], TagPath],
+    result: dict[TagPath, BaseTag],
+) -> None:
+    """Stores the materialized tag and the requested tags nested in it."""
+
+    for name, node in trie.items():
+        if name is None:
+            result[requested[names]] = tag
+        elif isinstance(tag, TagCompound) and name in tag:
+            _store_paths(tag.get_tag(name), node, names + (name,), requested, result)
@@ -4,6 +4,7 @@ __all__ = [
     "BaseTag",
     "BaseNumTag",
     "BaseFloatTag",
+    "BaseArrayTag",
     "TagByte",
     "TagShort",
     "TagInt",
@@ -19,10 +20,13 @@ __all__ = [
 ]
 
 
+import sys
 import struct
+from array import array
 from enum import Enum
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Any, BinaryIO, Sequence, Optional, TypeVar
+from collections.abc import MutableSequence
+from typing import BinaryIO, Any, BinaryIO, Sequence, Optional, TypeVar, Union
 
 TAG_END = 0
 TAG_BYTE = 1
@@ -38,6 +42,21 @@ TAG_COMPOUND = 10
 TAG_INT_ARRAY = 11
 TAG_LONG_ARRAY = 12
 
+# Payload sizes of fixed-size tags and of array items, used to skip tags without decoding them.
+TAG_SIZES = {
+    TAG_BYTE: 1,
+    TAG_SHORT: 2,
+    TAG_INT: 4,
+    TAG_LONG: 8,
+    TAG_FLOAT: 4,
+    TAG_DOUBLE: 8,
+}
+ARRAY_ITEM_SIZES = {
+    TAG_BYTE_ARRAY: 1,
+    TAG_INT_ARRAY: 4,
+    TAG_LONG_ARRAY: 8,
+}
+
 V = TypeVar("V", bound="Any")
 
 
@@ -46,28 +65,73 @@ class ByteOrder(Enum):
     BIG = ">"
 
 
-class BinaryHandler:
-    """This class is used to read/write buffers with specified byte order."""
-
-    def __init__(self, byte_order: ByteOrder = ByteOrder.BIG) -> None:
-        self.change_byte_order(byte_order)
+NATIVE_BYTE_ORDER = ByteOrder.LITTLE if sys.byteorder == "little" else ByteOrder.BIG
 
-    def change_byte_order(self, new_order: ByteOrder) -> None:
-        self._order = new_order.value
-        self._byte = struct.Struct(f"{self._order}b")
-        self._short = struct.Struct(f"{self._order}h")
-        self._int = struct.Struct(f"{self._order}i")
-        self._long = struct.Struct(f"{self._order}q")
-        self._float = struct.Struct(f"{self._order}f")
-        self._double = struct.Struct(f"{self._order}d")
 
-        self._ubyte = struct.Struct(f"{self._order}B")
-        self._ushort = struct.Struct(f"{self._order}H")
-        self._uint = struct.Struct(f"{self._order}I")
-        self._ulong = struct.Struct(f"{self._order}Q")
+class BinaryHandler:
+    """This class is used to read/write buffers with specified byte order.
+
+    Handlers are immutable and cached: `BinaryHandler(byte_order)` returns the shared handler of the byte order,
+    so creating one costs nothing and the same handler can be used by many documents and threads at once.
+    To read or write with another byte order, take the handler of that order."""
+
+    __slots__ = (
+        "_byte_order",
+        "_order",
+        "_byte",
+        "_short",
+        "_int",
+        "_long",
+        "_float",
+        "_double",
+        "_ubyte",
+        "_ushort",
+        "_uint",
+        "_ulong",
+        "_swap",
+    )
+    _instances: dict[tuple[type, ByteOrder], "BinaryHandler"] = {}
+
+    def __new__(cls, byte_order: ByteOrder = ByteOrder.BIG) -> "BinaryHandler":
+        handler = BinaryHandler._instances.get((cls, byte_order))
+        if handler is None:
+            handler = super().__new__(cls)
+            handler._init(byte_order)
+            BinaryHandler._instances[(cls, byte_order)] = handler
+        return handler
+
+    def _init(self, byte_order: ByteOrder) -> None:
+        order = byte_order.value
+        fields = {
+            "_byte_order": byte_order,
+            "_order": order,
+            "_byte": struct.Struct(f"{order}b"),
+            "_short": struct.Struct(f"{order}h"),
+            "_int": struct.Struct(f"{order}i"),
+            "_long": struct.Struct(f"{order}q"),
+            "_float": struct.Struct(f"{order}f"),
+            "_double": struct.Struct(f"{order}d"),
+            "_ubyte": struct.Struct(f"{order}B"),
+            "_ushort": struct.Struct(f"{order}H"),
+            "_uint": struct.Struct(f"{order}I"),
+            "_ulong": struct.Struct(f"{order}Q"),
+            "_swap": byte_order is not NATIVE_BYTE_ORDER,
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("BinaryHandler is immutable.")
 
     def get_byte_order(self) -> ByteOrder:
-        return ByteOrder(self._order)
+        return self._byte_order
+
+    def __reduce__(self):
+        # `struct.Struct` cannot be pickled, the cached handler of the byte order is used instead.
+        return (BinaryHandler, (self.get_byte_order(),))
+
+    def __repr__(self) -> str:
+        return f"BinaryHandler({self.get_byte_order()})"
 
     def read_byte(self, buffer: BinaryIO, signed: bool = True) -> int:
         unpacker = self._byte if signed else self._ubyte
@@ -91,13 +155,24 @@ class BinaryHandler:
     def read_double(self, buffer: BinaryIO) -> float:
         return self._double.unpack(buffer.read(8))[0]
 
-    def read_int_array(self, buffer: BinaryIO, size: int) -> tuple[int]:
-        fmt = struct.Struct(f"{self._order}{size}i")
-        return fmt.unpack(buffer.read(fmt.size))
+    def read_int_array(self, buffer: BinaryIO, size: int) -> array:
+        return self.read_array(buffer, size, "i")
 
-    def read_long_array(self, buffer: BinaryIO, size: int) -> tuple[int]:
-        fmt = struct.Struct(f"{self._order}{size}q")
-        return fmt.unpack(buffer.read(fmt.size))
+    def read_long_array(self, buffer: BinaryIO, size: int) -> array:
+        return self.read_array(buffer, size, "q")
+
+    def read_array(self, buffer: BinaryIO, size: int, typecode: str) -> array:
+        """Reads `size` numbers into `array.array` with the typecode ("i" or "q") in native byte order."""
+
+        values = array(typecode)
+        if size > 0:
+            data = buffer.read(size * values.itemsize)
+            if len(data) != size * values.itemsize:
+                raise ValueError("Array data is truncated.")
+            values.frombytes(data)
+            if self._swap:
+                values.byteswap()
+        return values
 
     def write_byte(self, buffer: BinaryIO, value: int, signed: bool = True) -> None:
         packer = self._byte if signed else self._ubyte
@@ -122,47 +197,108 @@ class BinaryHandler:
         buffer.write(self._double.pack(value))
 
     def write_int_array(self, buffer: BinaryIO, values: Sequence[int]) -> None:
-        size = len(values)
-        fmt = struct.Struct(f"{self._order}{size}i")
-        buffer.write(fmt.pack(*values))
+        self.write_array(buffer, values, "i")
 
     def write_long_array(self, buffer: BinaryIO, values: Sequence[int]) -> None:
-        size = len(values)
-        fmt = struct.Struct(f"{self._order}{size}q")
-        buffer.write(fmt.pack(*values))
+        self.write_array(buffer, values, "q")
+
+    def write_array(self, buffer: BinaryIO, values: Sequence[int], typecode: str) -> None:
+        buffer.write(self.array_bytes(values, typecode))
+
+    def array_bytes(self, values: Sequence[int], typecode: str) -> Union[array, bytes]:
+        """Returns bytes-like object with numbers in the handler byte order. Native arrays are returned without copying."""
+
+        if not isinstance(values, array) or values.typecode != typecode:
+            values = array(typecode, values)
+        elif self._swap:
+            values = array(typecode, values)
+        if self._swap:
+            values.byteswap()
+        return values
+
+
+_DEFAULT_HANDLER = BinaryHandler(ByteOrder.BIG)
+
+_NUMBER_TYPECODES = {
+    TAG_BYTE: "b",
+    TAG_SHORT: "h",
+    TAG_INT: "i",
+    TAG_LONG: "q",
+    TAG_FLOAT: "f",
+    TAG_DOUBLE: "d",
+}
+"""Typecodes of `array.array` used by compact lists of numbers."""
+
+
+def _utf8_length(value: str) -> int:
+    if value.isascii():
+        return len(value)
+    return len(value.encode("utf-8"))
+
+
+def _decode_raw(tag: "BaseTag") -> "BaseTag":
+    """Decodes the raw payload of a lazily decoded compound or list, its own nested compounds and lists stay lazy."""
+
+    from nbt_helper.decoder import get_decoder
+
+    data, byte_order = tag._raw  # type: ignore
+    return get_decoder(byte_order).decode(data, tag_id=tag.TAG_ID, lazy=True)[0]
+
+
+def _write_raw(tag: "BaseTag", buffer: BinaryIO, binary_handler: BinaryHandler) -> bool:
+    """Writes the raw payload of a lazily decoded tag as is, if it is still raw and has the same byte order."""
+
+    raw = tag._raw  # type: ignore
+    if raw is None or raw[1] is not binary_handler.get_byte_order():
+        return False
+    buffer.write(raw[0])
+    return True
 
 
 class BaseTag(ABC):
-    """Base class for all NBT tags. 
-    
-    Children classes have to implement `load_from_buffer` and `write_to_buffer` methods."""
+    """Base class for all NBT tags.
+
+    Children classes have to implement `load_from_buffer` and `write_to_buffer` methods.
+    Tags do not store byte order, `BinaryHandler` is passed when data is read or written (big-endian by default).
+    Tags use `__slots__`, so children classes must declare `__slots__` too."""
 
+    __slots__ = ("name", "value")
     TAG_ID = TAG_END
+    PAYLOAD_SIZE = 0
+    """Size of the payload of fixed-size tags in bytes."""
 
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
         value: Any = None,
         buffer: Optional[BinaryIO] = None,
     ) -> None:
-        self.binary_handler = binary_handler
+        """
+        Args:
+            binary_handler (Optional[BinaryHandler], optional): used only to load data from the buffer. Defaults to None (big-endian).
+            buffer (Optional[BinaryIO], optional): if specified, the tag payload is loaded from it. Defaults to None.
+        """
+
         self.name = name
         self.value = value
         if buffer:
-            self.load_from_buffer(buffer)
+            self.load_from_buffer(buffer, binary_handler or _DEFAULT_HANDLER)
 
     @abstractmethod
-    def load_from_buffer(self, buffer: BinaryIO) -> None: ...
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None: ...
 
     @abstractmethod
-    def write_to_buffer(self, buffer: BinaryIO) -> None: ...
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None: ...
 
-    def get_byte_order(self) -> ByteOrder:
-        return self.binary_handler.get_byte_order()
+    def encoded_size(self) -> int:
+        """Returns size of the encoded payload in bytes (without tag id and name). It does not depend on byte order."""
 
-    def change_byte_order(self, new_byte_order: ByteOrder) -> None:
-        self.binary_handler.change_byte_order(new_byte_order)
+        return self.PAYLOAD_SIZE
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.name!r}): {self.value}"
@@ -180,9 +316,11 @@ class BaseTag(ABC):
 
 
 class BaseNumTag(BaseTag):
+    __slots__ = ()
+
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
         value: int = 0,
         buffer: Optional[BinaryIO] = None,
@@ -196,49 +334,75 @@ class BaseNumTag(BaseTag):
 
 
 class TagByte(BaseNumTag):
+    __slots__ = ()
     TAG_ID = TAG_BYTE
+    PAYLOAD_SIZE = 1
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.value = self.binary_handler.read_byte(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.value = binary_handler.read_byte(buffer)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        self.binary_handler.write_byte(buffer, self.value)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        binary_handler.write_byte(buffer, self.value)
 
 
 class TagShort(BaseNumTag):
+    __slots__ = ()
     TAG_ID = TAG_SHORT
+    PAYLOAD_SIZE = 2
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.value = self.binary_handler.read_short(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.value = binary_handler.read_short(buffer)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        self.binary_handler.write_short(buffer, self.value)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        binary_handler.write_short(buffer, self.value)
 
 
 class TagInt(BaseNumTag):
+    __slots__ = ()
     TAG_ID = TAG_INT
+    PAYLOAD_SIZE = 4
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.value = self.binary_handler.read_int(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.value = binary_handler.read_int(buffer)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        self.binary_handler.write_int(buffer, self.value)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        binary_handler.write_int(buffer, self.value)
 
 
 class TagLong(BaseNumTag):
+    __slots__ = ()
     TAG_ID = TAG_LONG
+    PAYLOAD_SIZE = 8
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.value = self.binary_handler.read_long(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.value = binary_handler.read_long(buffer)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        self.binary_handler.write_long(buffer, self.value)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        binary_handler.write_long(buffer, self.value)
 
 
 class BaseFloatTag(BaseTag):
+    __slots__ = ()
+
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
         value: float = 0,
         buffer: Optional[BinaryIO] = None,
@@ -252,89 +416,220 @@ class BaseFloatTag(BaseTag):
 
 
 class TagFloat(BaseFloatTag):
+    __slots__ = ()
     TAG_ID = TAG_FLOAT
+    PAYLOAD_SIZE = 4
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.value = self.binary_handler.read_float(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.value = binary_handler.read_float(buffer)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        self.binary_handler.write_float(buffer, self.value)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        binary_handler.write_float(buffer, self.value)
 
 
 class TagDouble(BaseFloatTag):
+    __slots__ = ()
     TAG_ID = TAG_DOUBLE
+    PAYLOAD_SIZE = 8
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.value = self.binary_handler.read_double(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.value = binary_handler.read_double(buffer)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        self.binary_handler.write_double(buffer, self.value)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        binary_handler.write_double(buffer, self.value)
 
 
 class TagString(BaseTag):
+    __slots__ = ()
     TAG_ID = TAG_STRING
 
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
         value: str = "",
         buffer: Optional[BinaryIO] = None,
     ) -> None:
         super().__init__(binary_handler, name, value, buffer)
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        length = self.binary_handler.read_short(buffer)
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        length = binary_handler.read_short(buffer)
         data = buffer.read(length)
         if len(data) != length:
             raise ValueError(f"String length not equal: {length=}, {data=}.")
         self.value = data.decode("utf-8")
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
+    def encoded_size(self) -> int:
+        return 2 + _utf8_length(self.value)
+
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
         data = self.value.encode("utf-8")
-        self.binary_handler.write_short(buffer, len(data))
+        binary_handler.write_short(buffer, len(data))
         buffer.write(data)
 
 
 class TagList(BaseTag):
+    """List tag. Lists of numbers (TagByte, TagShort, TagInt, TagLong, TagFloat and TagDouble) are stored compactly:
+    their values are kept in `array.array` and decoded and encoded with a single bulk copy, without creating a tag per item.
+
+    Item tags are created only when they are needed: `value`, iteration, indexing and other list-of-tags access
+    switches the list to a list of tags. Use `get_numbers` to work with the numbers without creating tags."""
+
+    __slots__ = ("tag_id", "_items", "_numbers", "_raw")
     TAG_ID = TAG_LIST
 
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
-        value: Optional[Sequence] = None,
+        value: Optional[Union[Sequence, array]] = None,
         buffer: Optional[BinaryIO] = None,
         tag_id: int = TAG_END,
     ) -> None:
+        """
+        Args:
+            value (Optional[Union[Sequence, array]], optional): tags or, for lists of numbers, `array.array` with their values
+                (`tag_id` must be specified then). Defaults to None.
+        """
+
         self.tag_id = tag_id
         super().__init__(binary_handler, name, [], buffer)
 
-        if value:
+        if isinstance(value, array):
+            self.value = value
+        elif value:
             self.value.extend(value)
             self.tag_id = value[0].TAG_ID
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        self.tag_id = self.binary_handler.read_byte(buffer)
-        length = self.binary_handler.read_int(buffer)
+    @property
+    def value(self) -> list[BaseTag]:
+        if self._items is None:
+            tag_cls = TAGS[self.tag_id]
+            self._items = [tag_cls(value=number) for number in self._numbers]
+            self._numbers = None
+        return self._items
+
+    @value.setter
+    def value(self, value: Union[Sequence, array]) -> None:
+        if isinstance(value, array):
+            typecode = _NUMBER_TYPECODES.get(self.tag_id)
+            if typecode is None:
+                raise ValueError("Only lists of numbers can be stored in array.")
+            if value.typecode != typecode:
+                value = array(typecode, value)
+            self._items, self._numbers = None, value
+        else:
+            self._items, self._numbers = list(value), None
+        self._raw = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Items of lazily decoded list are not set until they are accessed for the first time.
+        if name in ("_items", "_numbers") and self._raw is not None:
+            decoded = _decode_raw(self)
+            self._items, self._numbers = decoded._items, decoded._numbers
+            self._raw = None
+            return getattr(self, name)
+        raise AttributeError(name)
+
+    def is_raw(self) -> bool:
+        """Returns True if the list is lazily decoded and was not accessed yet, see `TagCompound`."""
+
+        return self._raw is not None
+
+    def is_compact(self) -> bool:
+        """Returns True if the numbers are stored in `array.array` and item tags are not created."""
+
+        return self._numbers is not None
+
+    def get_numbers(self) -> array:
+        """Switches the list of numbers to compact storage and returns `array.array` with the numbers.
+
+        The array is the storage itself, so changing it changes the list. Item tags obtained before are detached from the list.
+
+        Raises:
+            ValueError: if items of the list are not numbers.
+        """
+
+        if self._numbers is None:
+            self.value = self._numbers_array()
+        return self._numbers  # type: ignore
+
+    def _numbers_array(self) -> array:
+        if self._numbers is not None:
+            return self._numbers
+        if self.tag_id == TAG_END and self._items:
+            self.tag_id = self._items[0].TAG_ID
+        typecode = _NUMBER_TYPECODES.get(self.tag_id)
+        if typecode is None:
+            raise ValueError("Items of the list are not numbers.")
+        return array(typecode, [tag.value for tag in self._items])  # type: ignore
+
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        self.tag_id = binary_handler.read_byte(buffer)
+        length = binary_handler.read_int(buffer)
+        if self.tag_id in _NUMBER_TYPECODES:
+            self.value = binary_handler.read_array(
+                buffer, length, _NUMBER_TYPECODES[self.tag_id]
+            )
+            return
         self.value = [
-            TAGS[self.tag_id](self.binary_handler, buffer=buffer) for _ in range(length)
+            TAGS[self.tag_id](binary_handler, buffer=buffer) for _ in range(length)
         ]
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        if self.tag_id == TAG_END and self.value:
-            self.tag_id = self.value[0].TAG_ID
-        self.binary_handler.write_byte(buffer, self.tag_id)
-        self.binary_handler.write_int(buffer, len(self.value))
-
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        if _write_raw(self, buffer, binary_handler):
+            return
+        if self.tag_id == TAG_END and self._items:
+            self.tag_id = self._items[0].TAG_ID
+        binary_handler.write_byte(buffer, self.tag_id)
+        binary_handler.write_int(buffer, len(self))
+
+        if self.tag_id in _NUMBER_TYPECODES:
+            binary_handler.write_array(
+                buffer, self._numbers_array(), _NUMBER_TYPECODES[self.tag_id]
+            )
+            return
         for tag in self.value:
-            tag.write_to_buffer(buffer)
+            tag.write_to_buffer(buffer, binary_handler)
+
+    def encoded_size(self) -> int:
+        if self._raw is not None:
+            return len(self._raw[0])
+        if self._numbers is not None:
+            return 5 + len(self._numbers) * self._numbers.itemsize
+        if self.value and self.value[0].PAYLOAD_SIZE:
+            return 5 + len(self.value) * self.value[0].PAYLOAD_SIZE
+        return 5 + sum(tag.encoded_size() for tag in self.value)
 
     def append(self, item: BaseTag) -> None:
-        self.value.append(item)
+        if self._numbers is not None and item.TAG_ID == self.tag_id:
+            self._numbers.append(item.value)
+        else:
+            self.value.append(item)
 
     def __repr__(self) -> str:
-        return f"TagList('{self.name}') [{len(self.value)}]"
+        return f"TagList('{self.name}') [{len(self)}]"
+
+    def __reduce__(self):
+        # Compact lists are pickled as arrays, without creating item tags.
+        value = self._items if self._items is not None else self._numbers
+        return (TagList, (None, self.name, value, None, self.tag_id))
 
     def __iter__(self):
         yield from self.value
@@ -350,101 +645,208 @@ class TagList(BaseTag):
             raise ValueError("Index must be a string.")
         if not issubclass(type(item), BaseTag):
             raise ValueError("Value must be a subclass of BaseTag.")
-        self.value[index] = item
+        if self._numbers is not None and item.TAG_ID == self.tag_id:
+            self._numbers[index] = item.value
+        else:
+            self.value[index] = item
 
     def __len__(self) -> int:
-        return len(self.value)
+        if self._numbers is not None:
+            return len(self._numbers)
+        return len(self._items)  # type: ignore
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, TagList):
             return False
-        return all(
-            (
-                self.tag_id == other.tag_id,
-                self.name == other.name,
-                self.value == other.value,
+        if self.tag_id != other.tag_id or self.name != other.name:
+            return False
+        if self.tag_id in _NUMBER_TYPECODES:
+            # Numbers are compared without creating item tags.
+            return self._numbers_array() == other._numbers_array()
+        return self.value == other.value
+
+
+class _CompoundTags(MutableSequence):
+    """List-like view of compound tags, returned by `TagCompound.value`.
+
+    Iteration, `len`, `append` and `extend` work on the underlying dictionary directly, while positional access
+    and changes by index are O(n). Tags with an already existing name replace the old ones, as in the compound."""
+
+    __slots__ = ("_compound",)
+
+    def __init__(self, compound: "TagCompound") -> None:
+        self._compound = compound
+
+    def __len__(self) -> int:
+        return len(self._compound._tags)
+
+    def __iter__(self):
+        return iter(self._compound._tags.values())
+
+    def __getitem__(self, index):
+        return list(self._compound._tags.values())[index]
+
+    def __setitem__(self, index, value) -> None:
+        tags = list(self._compound._tags.values())
+        tags[index] = value
+        self._compound.value = tags
+
+    def __delitem__(self, index) -> None:
+        tags = list(self._compound._tags.values())
+        del tags[index]
+        self._compound.value = tags
+
+    def insert(self, index: int, value: "BaseTag") -> None:
+        tags = list(self._compound._tags.values())
+        tags.insert(index, value)
+        self._compound.value = tags
+
+    def append(self, value: "BaseTag") -> None:
+        self._compound._tags[value.name] = value
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _CompoundTags):
+            # Order of the tags matters, as it did when the value was a list.
+            return list(self._compound._tags.items()) == list(
+                other._compound._tags.items()
             )
-        )
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 class TagCompound(BaseTag):
+    """Compound tag. Tags are stored in insertion-ordered dictionary by their names,
+    so keyed access is O(1) while iteration and write order stay the same.
+
+    Tag with an already existing name replaces the old one and keeps its position.
+
+    `value` is a list-like view of the tags (iteration yields tags, integer indexes and `append` work as with a list),
+    `get_tags` returns the dictionary itself.
+
+    Compound decoded with `lazy=True` (see `nbt_helper.decoder.decode`) keeps its payload as raw bytes until it is
+    accessed for the first time, while it is untouched it is written back as is."""
+
+    __slots__ = ("_tags", "_raw")
     TAG_ID = TAG_COMPOUND
 
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
         value: Optional[Sequence] = None,
         buffer: Optional[BinaryIO] = None,
     ) -> None:
-        super().__init__(binary_handler, name, [], buffer)
-        if value:
-            self.value.extend(value)
+        super().__init__(binary_handler, name, value, buffer)
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
+    @property
+    def value(self) -> _CompoundTags:
+        return _CompoundTags(self)
+
+    @value.setter
+    def value(self, value: Optional[Sequence]) -> None:
+        if isinstance(value, dict):
+            value = value.values()
+        tags: dict[str, BaseTag] = {}
+        for tag in value or ():
+            tags[tag.name] = tag
+        self._tags: dict[str, BaseTag] = tags
+        self._raw: Optional[tuple[Any, ByteOrder]] = None
+
+    def get_tags(self) -> dict[str, BaseTag]:
+        """Returns the insertion-ordered dictionary of tags by their names, changes of it change the compound."""
+
+        return self._tags
+
+    def __getattr__(self, name: str) -> Any:
+        # Tags of lazily decoded compound are not set until they are accessed for the first time.
+        if name == "_tags" and self._raw is not None:
+            self._tags = _decode_raw(self)._tags
+            self._raw = None
+            return self._tags
+        raise AttributeError(name)
+
+    def is_raw(self) -> bool:
+        """Returns True if the compound is lazily decoded and was not accessed yet."""
+
+        return self._raw is not None
+
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
         while True:
-            tag_type = self.binary_handler.read_byte(buffer)
+            tag_type = binary_handler.read_byte(buffer)
             if tag_type == TAG_END:
                 break
-            name = TagString(self.binary_handler, buffer=buffer).value
-            tag = TAGS[tag_type](self.binary_handler, name=name, buffer=buffer)
-            self.value.append(tag)
+            name = TagString(binary_handler, buffer=buffer).value
+            tag = TAGS[tag_type](binary_handler, name=name, buffer=buffer)
+            self._tags[name] = tag
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        for tag in self.value:
-            self.binary_handler.write_byte(buffer, tag.TAG_ID)
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        if _write_raw(self, buffer, binary_handler):
+            return
+        for tag in self._tags.values():
+            binary_handler.write_byte(buffer, tag.TAG_ID)
             TagString(
-                self.binary_handler,
+                binary_handler,
                 value=tag.name,
-            ).write_to_buffer(buffer)
+            ).write_to_buffer(buffer, binary_handler)
+
+            tag.write_to_buffer(buffer, binary_handler)
 
-            tag.write_to_buffer(buffer)
+        binary_handler.write_byte(buffer, TAG_END)
 
-        self.binary_handler.write_byte(buffer, TAG_END)
+    def encoded_size(self) -> int:
+        if self._raw is not None:
+            return len(self._raw[0])
+        return 1 + sum(
+            3 + _utf8_length(tag.name) + tag.encoded_size() for tag in self._tags.values()
+        )
 
     def get_tag(self, key: str, default: Optional[V] = None) -> Optional[V]:
         if not isinstance(key, str):
             raise ValueError("Key must be a string.")
-        result = default
-        if key in self:
-            result = self[key]
-        return result
+        return self._tags.get(key, default)  # type: ignore
 
     def get_value(self, key: str, default: Optional[V] = None) -> Optional[V]:
         if not isinstance(key, str):
             raise ValueError("Key must be a string.")
-        result = default
-        if key in self:
-            result = self[key].value
-        return result
+        tag = self._tags.get(key)
+        if tag is None:
+            return default
+        return tag.value
 
     def pop(self, key: str) -> Any:
         if not isinstance(key, str):
             raise ValueError("Key must be a string.")
-        result = self.get_value(key)
-        del self[key]
-
-        return result
+        tag = self._tags.pop(key, None)
+        if tag is None:
+            return None
+        return tag.value
 
     def append(self, item: BaseTag) -> None:
-        self.value.append(item)
+        self._tags[item.name] = item
 
     def __delitem__(self, key: str) -> None:
         if not isinstance(key, str):
             raise ValueError("Key must be a string.")
-        res = [tag for tag in self.value if tag.name != key]
-        self.value = res
+        self._tags.pop(key, None)
 
     def __iter__(self):
-        yield from self.value
+        yield from self._tags.values()
 
     def __getitem__(self, key: str) -> Any:
         if not isinstance(key, str):
             raise ValueError("Key must be a string.")
-        for tag in self.value:
-            if tag.name == key:
-                return tag
-        raise KeyError(f"'{key}' does not exist.")
+        try:
+            return self._tags[key]
+        except KeyError:
+            raise KeyError(f"'{key}' does not exist.")
 
     def __setitem__(self, key: str, item: Any) -> None:
         if not isinstance(key, str):
@@ -452,92 +854,127 @@ class TagCompound(BaseTag):
         if not issubclass(type(item), BaseTag):
             raise ValueError("Value must be a subclass of BaseTag.")
         item.name = key
-        self.value.append(item)
+        self._tags[key] = item
 
     def __contains__(self, key: str) -> bool:
         if not isinstance(key, str):
             raise ValueError("Key must be a string.")
-        return any(key == tag.name for tag in self.value)
+        return key in self._tags
 
     def __len__(self) -> int:
-        return len(self.value)
+        return len(self._tags)
 
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r}): {list(self._tags.values())}"
 
-class TagIntArray(BaseTag):
-    TAG_ID = TAG_INT_ARRAY
+
+class BaseArrayTag(BaseTag):
+    """Base class for TagIntArray and TagLongArray. Values are stored in `array.array` in native byte order,
+    so they are decoded and encoded with a single bulk copy (and byteswap if needed).
+    Any sequence of ints can be assigned to `value`, it is converted on write."""
+
+    __slots__ = ()
+    TYPECODE = "i"
+    ITEM_SIZE = 4
 
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
         value: Optional[Sequence] = None,
         buffer: Optional[BinaryIO] = None,
     ) -> None:
-        super().__init__(binary_handler, name, [], buffer)
+        super().__init__(binary_handler, name, array(self.TYPECODE), buffer)
         if value:
             self.value.extend(value)
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        length = self.binary_handler.read_int(buffer)
-        self.value = list(self.binary_handler.read_int_array(buffer, length))
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        length = binary_handler.read_int(buffer)
+        self.value = binary_handler.read_array(buffer, length, self.TYPECODE)
+
+    def encoded_size(self) -> int:
+        return 4 + len(self.value) * self.ITEM_SIZE
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
         lenght = len(self.value)
-        self.binary_handler.write_int(buffer, lenght)
-        self.binary_handler.write_int_array(buffer, self.value)
+        binary_handler.write_int(buffer, lenght)
+        binary_handler.write_array(buffer, self.value, self.TYPECODE)
 
-    def __iter__(self):
-        yield from self.value
+    def as_numpy(self):
+        """Returns NumPy array that shares memory with the tag value. Requires `numpy` package."""
 
+        import numpy  # type: ignore
 
-class TagLongArray(BaseTag):
-    TAG_ID = TAG_LONG_ARRAY
+        return numpy.frombuffer(self.value, dtype=numpy.dtype(self.TYPECODE))
 
-    def __init__(
-        self,
-        binary_handler: BinaryHandler,
-        name: str = "",
-        value: Optional[Sequence] = None,
-        buffer: Optional[BinaryIO] = None,
-    ) -> None:
-        super().__init__(binary_handler, name, [], buffer)
-        if value:
-            self.value.extend(value)
+    def __iter__(self):
+        yield from self.value
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        length = self.binary_handler.read_int(buffer)
-        self.value = list(self.binary_handler.read_long_array(buffer, length))
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
-        lenght = len(self.value)
-        self.binary_handler.write_int(buffer, lenght)
-        self.binary_handler.write_long_array(buffer, self.value)
+class TagIntArray(BaseArrayTag):
+    __slots__ = ()
+    TAG_ID = TAG_INT_ARRAY
+    TYPECODE = "i"
+    ITEM_SIZE = 4
 
-    def __iter__(self):
-        yield from self.value
+
+class TagLongArray(BaseArrayTag):
+    __slots__ = ()
+    TAG_ID = TAG_LONG_ARRAY
+    TYPECODE = "q"
+    ITEM_SIZE = 8
 
 
 class TagByteArray(BaseTag):
+    """Byte array tag. Value is any bytes-like object: `bytearray` by default,
+    read-only `memoryview` into the source data when decoded from `bytes` with `nbt_helper.decoder`."""
+
+    __slots__ = ()
     TAG_ID = TAG_BYTE_ARRAY
 
     def __init__(
         self,
-        binary_handler: BinaryHandler,
+        binary_handler: Optional[BinaryHandler] = None,
         name: str = "",
-        value: Optional[bytearray] = None,
+        value: Optional[Union[bytes, bytearray, memoryview]] = None,
         buffer: Optional[BinaryIO] = None,
     ) -> None:
         super().__init__(binary_handler, name, value or bytearray(), buffer)
 
-    def load_from_buffer(self, buffer: BinaryIO) -> None:
-        length = self.binary_handler.read_int(buffer)
-        self.value = bytearray(buffer.read(length))
+    def load_from_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
+        length = binary_handler.read_int(buffer)
+        # Data is read straight into the value, without an intermediate copy.
+        self.value = bytearray(max(length, 0))
+        if buffer.readinto(self.value) != len(self.value):
+            raise ValueError("Byte array data is truncated.")
+
+    def encoded_size(self) -> int:
+        return 4 + len(self.value)
 
-    def write_to_buffer(self, buffer: BinaryIO) -> None:
+    def write_to_buffer(
+        self, buffer: BinaryIO, binary_handler: BinaryHandler = _DEFAULT_HANDLER
+    ) -> None:
         lenght = len(self.value)
-        self.binary_handler.write_int(buffer, lenght)
+        binary_handler.write_int(buffer, lenght)
         buffer.write(self.value)
 
+    def as_numpy(self):
+        """Returns NumPy array of signed bytes that shares memory with the tag value. Requires `numpy` package."""
+
+        import numpy  # type: ignore
+
+        return numpy.frombuffer(self.value, dtype=numpy.int8)
+
+    def __reduce__(self):
+        # `memoryview` cannot be pickled.
+        return (TagByteArray, (None, self.name, bytearray(self.value)))
+
     def __iter__(self):
         yield from self.value
 
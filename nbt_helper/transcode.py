@@ -0,0 +1,246 @@
+__all__ = ["Transcoder", "transcode", "transcode_file"]
+
+import struct
+from array import array
+from typing import BinaryIO, Optional
+
+from nbt_helper.compression import get_codec, GZIP_COMPRESSED, ZLIB_COMPRESSED
+from nbt_helper.decoder import BytesLike, get_decoder
+from nbt_helper.file import BE_HEADER, BEDROCK_EDITION_MAGIC_NUMBER, FileTypes
+from nbt_helper.tags import (
+    ByteOrder,
+    TAG_END,
+    TAG_STRING,
+    TAG_LIST,
+    TAG_COMPOUND,
+    TAG_SIZES,
+    ARRAY_ITEM_SIZES,
+)
+
+FILE_BYTE_ORDERS = {
+    FileTypes.JE_UNCOMPRESSED: ByteOrder.BIG,
+    FileTypes.JE_GZIP_COMPRESSED: ByteOrder.BIG,
+    FileTypes.JE_ZLIB_COMPRESSED: ByteOrder.BIG,
+    FileTypes.BE_UNCOMPRESSED: ByteOrder.LITTLE,
+    FileTypes.BE_WITH_HEADER: ByteOrder.LITTLE,
+}
+FILE_COMPRESSIONS = {
+    FileTypes.JE_GZIP_COMPRESSED: GZIP_COMPRESSED,
+    FileTypes.JE_ZLIB_COMPRESSED: ZLIB_COMPRESSED,
+}
+
+# Numbers are swapped as unsigned integers of the same size (struct formats and array typecodes),
+# so float bits (including NaN payloads) are kept as is.
+_UNSIGNED_FORMATS = {2: "H", 4: "I", 8: "Q"}
+
+
+class Transcoder:
+    """Converts NBT data from one byte order to another without creating tags.
+
+    The data is copied into the result once, then the tag structure is walked with integer offsets and only the numbers
+    are byteswapped in place: lengths and fixed-size values one by one, arrays and lists of numbers in bulk.
+    Names, strings and byte arrays do not depend on byte order and are left as they are.
+    """
+
+    def __init__(self, source_order: ByteOrder = ByteOrder.BIG) -> None:
+        self._source_order = source_order
+        target = "<" if source_order is ByteOrder.BIG else ">"
+        self._swappers = {
+            size: (
+                struct.Struct(f"{source_order.value}{fmt}").unpack_from,
+                struct.Struct(f"{target}{fmt}").pack_into,
+            )
+            for size, fmt in _UNSIGNED_FORMATS.items()
+        }
+        self._ushort = struct.Struct(f"{source_order.value}H").unpack_from
+        self._int = struct.Struct(f"{source_order.value}i").unpack_from
+
+    def get_source_order(self) -> ByteOrder:
+        return self._source_order
+
+    def transcode(
+        self,
+        data: BytesLike,
+        offset: int = 0,
+        tag_id: Optional[int] = None,
+        prefix: int = 0,
+    ) -> tuple[bytearray, int]:
+        """Converts a single tag into the opposite byte order.
+
+        Args:
+            offset (int, optional): position of the tag in the data. Defaults to 0.
+            tag_id (Optional[int], optional): see `Decoder.decode`. Defaults to None.
+            prefix (int, optional): number of zero bytes reserved at the start of the result for headers. Defaults to 0.
+
+        Returns:
+            tuple[bytearray, int]: converted tag and offset right after it in the data.
+
+        Raises:
+            ValueError: if the data is truncated or contains unknown tag id.
+        """
+
+        data = memoryview(data).cast("B")
+        out = bytearray(prefix)
+        out += data[offset:]
+        # Offset of the same byte in the result.
+        delta = prefix - offset
+        try:
+            if tag_id is None:
+                tag_id = data[offset]
+                self._swap(data, out, offset + 1, 2, delta)
+                offset += 3 + self._ushort(data, offset + 1)[0]
+            end = self._payload(data, out, offset, tag_id, delta)
+        except (struct.error, IndexError) as error:
+            raise ValueError("NBT data is truncated.") from error
+        if end > len(data):
+            raise ValueError("NBT data is truncated.")
+        del out[end + delta :]
+        return out, end
+
+    def _swap(
+        self, data: memoryview, out: bytearray, offset: int, size: int, delta: int
+    ) -> None:
+        unpack_from, pack_into = self._swappers[size]
+        pack_into(out, offset + delta, *unpack_from(data, offset))
+
+    def _swap_array(
+        self,
+        data: memoryview,
+        out: bytearray,
+        offset: int,
+        length: int,
+        size: int,
+        delta: int,
+    ) -> int:
+        end = offset + max(length, 0) * size
+        if size > 1 and end > offset:
+            values = array(_UNSIGNED_FORMATS[size])
+            values.frombytes(data[offset:end])
+            values.byteswap()
+            out[offset + delta : end + delta] = memoryview(values).cast("B")
+        return end
+
+    def _payload(
+        self, data: memoryview, out: bytearray, offset: int, tag_id: int, delta: int
+    ) -> int:
+        if tag_id in TAG_SIZES:
+            size = TAG_SIZES[tag_id]
+            if size > 1:
+                self._swap(data, out, offset, size, delta)
+            return offset + size
+
+        if tag_id == TAG_STRING:
+            self._swap(data, out, offset, 2, delta)
+            return offset + 2 + self._ushort(data, offset)[0]
+
+        if tag_id in ARRAY_ITEM_SIZES:
+            (length,) = self._int(data, offset)
+            self._swap(data, out, offset, 4, delta)
+            return self._swap_array(
+                data, out, offset + 4, length, ARRAY_ITEM_SIZES[tag_id], delta
+            )
+
+        if tag_id == TAG_LIST:
+            items_tag_id = data[offset]
+            (length,) = self._int(data, offset + 1)
+            self._swap(data, out, offset + 1, 4, delta)
+            offset += 5
+            if items_tag_id in TAG_SIZES:
+                # Lists of numbers are swapped in bulk, like arrays.
+                return self._swap_array(
+                    data, out, offset, length, TAG_SIZES[items_tag_id], delta
+                )
+            for _ in range(length):
+                offset = self._payload(data, out, offset, items_tag_id, delta)
+            return offset
+
+        if tag_id == TAG_COMPOUND:
+            while True:
+                item_tag_id = data[offset]
+                if item_tag_id == TAG_END:
+                    return offset + 1
+                self._swap(data, out, offset + 1, 2, delta)
+                offset += 3 + self._ushort(data, offset + 1)[0]
+                offset = self._payload(data, out, offset, item_tag_id, delta)
+
+        raise ValueError(f"Unknown tag id {tag_id}.")
+
+    def __repr__(self) -> str:
+        return f"Transcoder({self._source_order})"
+
+
+_TRANSCODERS = {byte_order: Transcoder(byte_order) for byte_order in ByteOrder}
+
+
+def transcode(
+    data: BytesLike,
+    source_order: ByteOrder,
+    target_order: ByteOrder,
+    prefix: int = 0,
+) -> bytearray:
+    """Converts a named tag (for example, uncompressed file data) from one byte order to another, see `Transcoder.transcode`.
+
+    Data after the tag is ignored.
+    """
+
+    if source_order is target_order:
+        # Nothing to convert, the end of the tag is found without walking it twice.
+        data = memoryview(data).cast("B")
+        try:
+            (name_length,) = struct.unpack_from(f"{source_order.value}H", data, 1)
+            end = get_decoder(source_order).skip(data, 3 + name_length, data[0])
+        except (struct.error, IndexError) as error:
+            raise ValueError("NBT data is truncated.") from error
+        if end > len(data):
+            raise ValueError("NBT data is truncated.")
+        return bytearray(prefix) + data[:end]
+    return _TRANSCODERS[source_order].transcode(data, prefix=prefix)[0]
+
+
+def _read_file(buffer: BinaryIO, file_type: FileTypes) -> bytes:
+    if file_type is FileTypes.BE_WITH_HEADER:
+        header = buffer.read(BE_HEADER.size)
+        if len(header) != BE_HEADER.size:
+            raise ValueError("File header is truncated.")
+        magic_number, size = BE_HEADER.unpack(header)
+        if magic_number != BEDROCK_EDITION_MAGIC_NUMBER:
+            raise ValueError("Wrong data handler used! Unknown magic number")
+        return buffer.read(size)
+    if file_type in FILE_COMPRESSIONS:
+        return get_codec(FILE_COMPRESSIONS[file_type]).decompress(buffer.read())
+    return buffer.read()
+
+
+def transcode_file(
+    source: BinaryIO,
+    target: BinaryIO,
+    source_type: FileTypes,
+    target_type: FileTypes,
+    compression_level: Optional[int] = None,
+) -> None:
+    """Converts NBT file between Java Edition and Bedrock Edition file types without creating tags.
+
+    Compressed data is decompressed and compressed as a whole. The length prefix of `BE_WITH_HEADER` files is written
+    in the same pass: the header is reserved at the start of the result and filled in after the conversion.
+
+    Args:
+        compression_level (Optional[int], optional): compression level of compressed target types. Defaults to None.
+    """
+
+    data = _read_file(source, source_type)
+    if not data or data[0] != TAG_COMPOUND:
+        raise ValueError("File data must starts with Compound tag.")
+
+    prefix = BE_HEADER.size if target_type is FileTypes.BE_WITH_HEADER else 0
+    result = transcode(
+        data, FILE_BYTE_ORDERS[source_type], FILE_BYTE_ORDERS[target_type], prefix
+    )
+    if prefix:
+        BE_HEADER.pack_into(
+            result, 0, BEDROCK_EDITION_MAGIC_NUMBER, len(result) - prefix
+        )
+    if target_type in FILE_COMPRESSIONS:
+        codec = get_codec(FILE_COMPRESSIONS[target_type])
+        target.write(codec.compress(result, compression_level))
+    else:
+        target.write(result)
@@ -0,0 +1,337 @@
+__all__ = [
+    "REGION_FOLDERS",
+    "ScanResult",
+    "TransformResult",
+    "Dimension",
+    "World",
+    "scan_region_files",
+    "transform_region_files",
+]
+
+import os
+from pathlib import Path
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from nbt_helper.region import MCA_FILE_PATTERN, Chunk, Region, cords_from_filepath
+
+StrOrPath = Union[str, Path]
+ChunkFunction = Callable[[Chunk], Any]
+ChunkTransform = Callable[[Chunk], Optional[Chunk]]
+Reducer = Callable[[list], Any]
+ProgressCallback = Callable[[int, int, "TransformResult"], None]
+
+REGION_FOLDERS = ("region", "entities", "poi")
+
+
+class ScanResult(NamedTuple):
+    region_x: int
+    region_z: int
+    value: Any
+    """Chunk, value returned by the chunk function or value returned by the reducer."""
+    filepath: Path
+    """Region file the value comes from."""
+
+
+class TransformResult(NamedTuple):
+    filepath: Path
+    changed_chunks: int
+    """Number of chunks written back to the region file."""
+
+
+def _scan_region(
+    filepath: Path, func: Optional[ChunkFunction], reducer: Optional[Reducer]
+) -> list:
+    """Runs in a worker process: decodes chunks one by one and applies the functions."""
+
+    values = []
+    with Region(filepath=filepath, lazy=True, cache_size=0) as region:
+        for chunk in region.chunks:
+            if chunk.is_empty():
+                continue
+            values.append(chunk if func is None else func(chunk))
+    if reducer is not None:
+        return [reducer(values)]
+    return values
+
+
+def _results(filepath: Path, values: list) -> Iterator[ScanResult]:
+    region_x, region_z = cords_from_filepath(filepath)
+    for value in values:
+        yield ScanResult(region_x, region_z, value, filepath)
+
+
+def scan_region_files(
+    filepaths: Iterable[Path],
+    func: Optional[ChunkFunction] = None,
+    reducer: Optional[Reducer] = None,
+    processes: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[ScanResult]:
+    """Scans region files in a process pool and yields results as soon as a region is done.
+
+    Args:
+        func (Optional[ChunkFunction], optional): called in a worker for every non-empty chunk, the chunk itself is yielded if None. Defaults to None.
+        reducer (Optional[Reducer], optional): called in a worker with the list of values of one region,
+            only its result is yielded for the region. Defaults to None.
+        processes (Optional[int], optional): number of worker processes, `os.cpu_count()` if None.
+            If 1, regions are scanned in the current process. Defaults to None.
+        max_pending (Optional[int], optional): maximum number of regions submitted to the pool at once,
+            twice the number of processes if None. Defaults to None.
+
+    `func` and `reducer` must be picklable (defined at module level) unless `processes` is 1.
+    """
+
+    for filepath, values in _map_regions(
+        _scan_region, filepaths, (func, reducer), processes, max_pending
+    ):
+        yield from _results(filepath, values)
+
+
+def _map_regions(
+    worker: Callable,
+    filepaths: Iterable[Path],
+    args: tuple,
+    processes: Optional[int],
+    max_pending: Optional[int],
+) -> Iterator[tuple[Path, Any]]:
+    """Calls `worker(filepath, *args)` in a process pool and yields `(filepath, result)` in order of completion."""
+
+    filepaths = iter(filepaths)
+    if processes == 1:
+        for filepath in filepaths:
+            yield filepath, worker(filepath, *args)
+        return
+
+    processes = processes or os.cpu_count() or 1
+    max_pending = max_pending or processes * 2
+    pool = ProcessPoolExecutor(processes)
+    pending: dict[Future, Path] = {}
+    try:
+        while True:
+            for filepath in islice(filepaths, max_pending - len(pending)):
+                pending[pool.submit(worker, filepath, *args)] = filepath
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _changed_chunks(region: Region, func: ChunkTransform) -> Iterator[Chunk]:
+    for chunk in region.chunks:
+        if chunk.is_empty():
+            continue
+        x, z = chunk.x, chunk.z
+        result = func(chunk)
+        if result is not None:
+            chunk = result
+            chunk.x, chunk.z = x, z
+        if chunk.is_dirty():
+            yield chunk
+
+
+def _transform_region(
+    filepath: Path, func: ChunkTransform, compression_level: Optional[int]
+) -> int:
+    """Runs in a worker process: transforms chunks one by one and saves the changed ones as a single atomic update."""
+
+    # Untouched parts of chunk data are copied as is instead of being decoded and encoded again.
+    with Region(filepath=filepath, lazy=True, cache_size=0, lazy_tags=True) as region:
+        return region.save_chunks(_changed_chunks(region, func), compression_level)
+
+
+def _read_journal(journal: StrOrPath) -> set[str]:
+    if not os.path.exists(journal):
+        return set()
+    with open(journal, "r", encoding="utf-8") as file:
+        return {line.rstrip("\n") for line in file if line.strip()}
+
+
+def transform_region_files(
+    filepaths: Iterable[Path],
+    func: ChunkTransform,
+    processes: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    journal: Optional[StrOrPath] = None,
+    compression_level: Optional[int] = None,
+) -> list[TransformResult]:
+    """Applies `func` to every non-empty chunk of the region files in a process pool and writes back only changed chunks.
+
+    `func` may modify the chunk in place or return a new chunk, returning empty chunk removes it.
+    Changes are detected with `Chunk.is_dirty` and saved with `Region.save_chunks`, so every region is updated atomically:
+    an interrupted region keeps its old chunks. Untouched regions are not written at all.
+
+    Args:
+        processes (Optional[int], optional): number of worker processes, see `scan_region_files`. Defaults to None.
+        max_pending (Optional[int], optional): maximum number of regions submitted to the pool at once. Defaults to None.
+        progress (Optional[ProgressCallback], optional): called with number of done regions, total number of regions
+            and the result of the finished region. Defaults to None.
+        journal (Optional[StrOrPath], optional): text file where every finished region is recorded. Regions listed in it
+            are skipped, so a crashed job can be restarted. A region that was interrupted is transformed again from the beginning,
+            so `func` should be idempotent. Defaults to None.
+        compression_level (Optional[int], optional): compression level of changed chunks. Defaults to None.
+    """
+
+    filepaths = [Path(filepath) for filepath in filepaths]
+    total = len(filepaths)
+    if journal is not None:
+        committed = _read_journal(journal)
+        filepaths = [path for path in filepaths if str(path) not in committed]
+
+    done = total - len(filepaths)
+    results = []
+    for filepath, changed_chunks in _map_regions(
+        _transform_region, filepaths, (func, compression_level), processes, max_pending
+    ):
+        result = TransformResult(filepath, changed_chunks)
+        results.append(result)
+        if journal is not None:
+            with open(journal, "a", encoding="utf-8") as file:
+                file.write(f"{filepath}\n")
+                file.flush()
+                os.fsync(file.fileno())
+
+        done += 1
+        if progress is not None:
+            progress(done, total, result)
+    return results
+
+
+class Dimension:
+    """Folder of a single dimension: the world folder itself, "DIM-1", "DIM1" or one of "dimensions/<namespace>/<name>"."""
+
+    def __init__(self, path: StrOrPath) -> None:
+        self.path = Path(path)
+
+    def region_files(self, folders: Iterable[str] = REGION_FOLDERS) -> list[Path]:
+        """Returns region files found in the given subfolders ("region", "entities" and "poi" by default)."""
+
+        filepaths = []
+        for folder in folders:
+            folder_path = self.path.joinpath(folder)
+            if not folder_path.is_dir():
+                continue
+            filepaths.extend(
+                sorted(
+                    filepath
+                    for filepath in folder_path.iterdir()
+                    if MCA_FILE_PATTERN.fullmatch(filepath.name)
+                )
+            )
+        return filepaths
+
+    def scan(
+        self,
+        func: Optional[ChunkFunction] = None,
+        reducer: Optional[Reducer] = None,
+        folders: Iterable[str] = REGION_FOLDERS,
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[ScanResult]:
+        """Scans every region file of the dimension, see `scan_region_files`."""
+
+        return scan_region_files(
+            self.region_files(folders), func, reducer, processes, max_pending
+        )
+
+    def transform(
+        self,
+        func: ChunkTransform,
+        folders: Iterable[str] = ("region",),
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        journal: Optional[StrOrPath] = None,
+        compression_level: Optional[int] = None,
+    ) -> list[TransformResult]:
+        """Transforms every region file of the dimension, see `transform_region_files`."""
+
+        return transform_region_files(
+            self.region_files(folders),
+            func,
+            processes,
+            max_pending,
+            progress,
+            journal,
+            compression_level,
+        )
+
+    def __repr__(self) -> str:
+        return f"Dimension({str(self.path)!r})"
+
+
+class World:
+    """Minecraft Java Edition world folder."""
+
+    def __init__(self, path: StrOrPath) -> None:
+        self.path = Path(path)
+
+    def dimensions(self) -> list[Dimension]:
+        """Returns existing dimensions: the overworld, the nether, the end and custom ones."""
+
+        paths = [self.path, self.path.joinpath("DIM-1"), self.path.joinpath("DIM1")]
+        custom = self.path.joinpath("dimensions")
+        if custom.is_dir():
+            paths.extend(
+                sorted(
+                    path
+                    for namespace in custom.iterdir()
+                    if namespace.is_dir()
+                    for path in namespace.iterdir()
+                    if path.is_dir()
+                )
+            )
+        return [Dimension(path) for path in paths if path.is_dir()]
+
+    def region_files(self, folders: Iterable[str] = REGION_FOLDERS) -> list[Path]:
+        folders = tuple(folders)
+        return [
+            filepath
+            for dimension in self.dimensions()
+            for filepath in dimension.region_files(folders)
+        ]
+
+    def scan(
+        self,
+        func: Optional[ChunkFunction] = None,
+        reducer: Optional[Reducer] = None,
+        folders: Iterable[str] = REGION_FOLDERS,
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[ScanResult]:
+        """Scans every region file of every dimension, see `scan_region_files`."""
+
+        return scan_region_files(
+            self.region_files(folders), func, reducer, processes, max_pending
+        )
+
+    def transform(
+        self,
+        func: ChunkTransform,
+        folders: Iterable[str] = ("region",),
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        journal: Optional[StrOrPath] = None,
+        compression_level: Optional[int] = None,
+    ) -> list[TransformResult]:
+        """Transforms every region file of every dimension, see `transform_region_files`."""
+
+        return transform_region_files(
+            self.region_files(folders),
+            func,
+            processes,
+            max_pending,
+            progress,
+            journal,
+            compression_level,
+        )
+
+    def __repr__(self) -> str:
+        return f"World({str(self.path)!r})"
@@ -47,3 +47,49 @@ def test_io(tag_type: Type[BaseTag], value: Any, expected_bytes: bytes) -> None:
     assert tag_as_bytes(tag) == expected_bytes
     assert tag == new_tag
     assert tag.value == new_tag.value
+
+
+@pytest.mark.parametrize("byte_order", [ByteOrder.BIG, ByteOrder.LITTLE])
+def test_array_backing(byte_order: ByteOrder) -> None:
+    from array import array
+
+    from nbt_helper.decoder import decode
+    from nbt_helper.encoder import encode
+
+    handler = BinaryHandler(byte_order)
+    tag = TagLongArray(value=[1, -2, 1 << 40])
+    buffer = BytesIO()
+    tag.write_to_buffer(buffer, handler)
+    assert encode(tag, byte_order, name=None) == buffer.getvalue()
+
+    for new_tag in (
+        TagLongArray(handler, buffer=BytesIO(buffer.getvalue())),
+        decode(buffer.getvalue(), byte_order, tag_id=tag.TAG_ID)[0],
+    ):
+        assert isinstance(new_tag.value, array)
+        assert new_tag.value.tolist() == [1, -2, 1 << 40]
+
+    tag.value = [3, 4]
+    assert encode(tag, byte_order, name=None)[:4] == bytes(handler.array_bytes([2], "i"))
+
+
+def test_byte_array_view() -> None:
+    import pickle
+
+    from nbt_helper.decoder import decode
+
+    data = b"\x00\x00\x00\x02\xff\x00"
+    tag = decode(data, tag_id=TagByteArray.TAG_ID)[0]
+    assert isinstance(tag.value, memoryview)
+    assert tag.value.obj is data
+    assert tag == TagByteArray(value=bytearray((255, 0)))
+    assert pickle.loads(pickle.dumps(tag)) == tag
+
+
+def test_as_numpy() -> None:
+    numpy = pytest.importorskip("numpy")
+    tag = TagIntArray(value=[1, 2, 3])
+    values = tag.as_numpy()
+    values[0] = 10
+    assert tag.value[0] == 10
+    assert values.dtype == numpy.int32
@@ -1,3 +1,5 @@
+import pickle
+from array import array
 from io import BytesIO
 
 import pytest
@@ -6,11 +8,14 @@ from nbt_helper.tags import (
     ByteOrder,
     BinaryHandler,
     TagByte,
+    TagDouble,
+    TagInt,
     TagList,
     BaseTag,
     TAG_LIST,
     TAG_BYTE,
     TAG_END,
+    TAG_INT,
 )
 
 
@@ -69,3 +74,43 @@ def test_special_case() -> None:
     tag.append(TagByte(handler))
     assert tag_as_bytes(tag) == b"\x01\x00\x00\x00\x01\x00"
     assert tag.tag_id == TAG_BYTE
+
+
+@pytest.mark.parametrize("byte_order", [ByteOrder.BIG, ByteOrder.LITTLE])
+def test_compact_numbers(byte_order: ByteOrder) -> None:
+    handler = BinaryHandler(byte_order)
+    source = TagList(value=[TagDouble(value=0.5), TagDouble(value=-1.25)])
+    buffer = BytesIO()
+    source.write_to_buffer(buffer, handler)
+    data = buffer.getvalue()
+
+    tag = TagList(handler, buffer=BytesIO(data))
+    assert tag.is_compact()
+    assert len(tag) == 2
+    assert tag.get_numbers() == array("d", [0.5, -1.25])
+    assert tag == source
+    assert tag.encoded_size() == len(data)
+    assert pickle.loads(pickle.dumps(tag)).is_compact()
+
+    tag.append(TagDouble(value=2.0))
+    tag[0] = TagDouble(value=1.0)
+    assert tag.is_compact()
+    buffer = BytesIO()
+    tag.write_to_buffer(buffer, handler)
+    assert TagList(handler, buffer=BytesIO(buffer.getvalue())).get_numbers() == array(
+        "d", [1.0, -1.25, 2.0]
+    )
+
+    assert tag[1] == TagDouble(value=-1.25)
+    assert not tag.is_compact()
+    tag.get_numbers()[1] = 3.0
+    assert tag.is_compact()
+    assert [item.value for item in tag] == [1.0, 3.0, 2.0]
+
+
+def test_compact_value() -> None:
+    tag = TagList(tag_id=TAG_INT, value=array("i", [1, 2, 3]))
+    assert tag.is_compact()
+    assert tag.value == [TagInt(value=1), TagInt(value=2), TagInt(value=3)]
+    with pytest.raises(ValueError):
+        TagList(tag_id=TAG_LIST, value=array("i"))
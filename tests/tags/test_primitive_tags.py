@@ -1,3 +1,4 @@
+import pickle
 from io import BytesIO
 from typing import Type, Union
 
@@ -14,12 +15,13 @@ from nbt_helper.tags import (
     TagFloat,
     TagDouble,
     TagString,
+    TAGS,
 )
 
 
 def get_bytes(tag_cls: Type[BaseTag], byte_roder: ByteOrder, value) -> bytes:
     buffer = BytesIO()
-    tag_cls(BinaryHandler(byte_roder), value=value).write_to_buffer(buffer)
+    tag_cls(value=value).write_to_buffer(buffer, BinaryHandler(byte_roder))
     return buffer.getvalue()
 
 
@@ -108,3 +110,21 @@ def test_string_tag() -> None:
 
     with pytest.raises(ValueError):
         TagString(BinaryHandler(ByteOrder.BIG), buffer=BytesIO(b"\x00\x0cHello"))
+
+
+@pytest.mark.parametrize("tag_cls", list(TAGS.values()))
+def test_slots(tag_cls: Type[BaseTag]) -> None:
+    tag = tag_cls(name="Data")
+    assert not hasattr(tag, "__dict__")
+    with pytest.raises(AttributeError):
+        tag.binary_handler = BinaryHandler()  # type: ignore
+
+
+@pytest.mark.parametrize("byte_order", [ByteOrder.BIG, ByteOrder.LITTLE])
+def test_binary_handler_cache(byte_order: ByteOrder) -> None:
+    handler = BinaryHandler(byte_order)
+    assert handler is BinaryHandler(byte_order)
+    assert handler.get_byte_order() is byte_order
+    assert pickle.loads(pickle.dumps(handler)) is handler
+    with pytest.raises(AttributeError):
+        handler._order = ">"  # type: ignore
@@ -46,3 +46,51 @@ def test_io(tag: TagCompound, expected_bytes: bytes) -> None:
     new_tag = TagCompound(BinaryHandler(ByteOrder.BIG), buffer=BytesIO(expected_bytes))
     assert tag == new_tag
     assert tag.value == new_tag.value
+
+
+def test_keyed_access() -> None:
+    handler = BinaryHandler(ByteOrder.BIG)
+    tag = TagCompound(
+        handler,
+        value=[TagByte(handler, name=name, value=index) for index, name in enumerate("abc")],
+    )
+    tag["b"] = TagByte(handler, value=10)
+    tag["d"] = TagByte(handler, value=20)
+    assert len(tag) == 4
+    assert [item.name for item in tag] == ["a", "b", "c", "d"]
+    assert tag.get_value("b") == 10
+    assert tag.get_value("e", -1) == -1
+    assert tag.pop("a") == 0
+    assert "a" not in tag
+    assert tag_as_bytes(tag).startswith(b"\x01\x00\x01b\n")
+
+
+def test_value_is_list_like() -> None:
+    handler = BinaryHandler(ByteOrder.BIG)
+    tags = [TagByte(handler, name=name, value=index) for index, name in enumerate("abc")]
+    tag = TagCompound(handler, value=tags)
+    assert tag.value == tags
+    assert list(tag.value) == tags
+    assert tag.value[0] is tags[0]
+    assert tag.value[-1].name == "c"
+
+    tag.value.append(TagByte(handler, name="d", value=3))
+    tag.value.append(TagByte(handler, name="a", value=10))
+    assert [item.name for item in tag.value] == ["a", "b", "c", "d"]
+    assert tag.get_value("a") == 10
+
+    del tag.value[1]
+    tag.value.insert(0, TagByte(handler, name="e", value=4))
+    assert [item.name for item in tag] == ["e", "a", "c", "d"]
+    assert list(tag.get_tags()) == ["e", "a", "c", "d"]
+    assert tag.get_tags()["c"] is tags[2]
+
+
+def test_equality_depends_on_order() -> None:
+    handler = BinaryHandler(ByteOrder.BIG)
+    tags = [TagByte(handler, name=name, value=index) for index, name in enumerate("ab")]
+    tag = TagCompound(handler, value=tags)
+    assert tag == TagCompound(handler, value=tags)
+    assert tag.value == TagCompound(handler, value=tags).value
+    assert tag != TagCompound(handler, value=tags[::-1])
+    assert tag.value != TagCompound(handler, value=tags[::-1]).value
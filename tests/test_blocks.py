@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from nbt_helper.blocks import (
+    BIOME_VOLUME,
+    SECTION_VOLUME,
+    bits_for_palette,
+    block_histogram,
+    count_blocks,
+    get_heightmap,
+    get_sections,
+    pack_long_array,
+    unpack_long_array,
+)
+from nbt_helper.tags import (
+    TagByte,
+    TagCompound,
+    TagList,
+    TagLongArray,
+    TagString,
+)
+
+
+@pytest.mark.parametrize("bits", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
+def test_pack_unpack(bits: int) -> None:
+    values = [random.randrange(1 << bits) for _ in range(SECTION_VOLUME)]
+    packed = pack_long_array(values, bits)
+    assert len(packed) == -(-SECTION_VOLUME // (64 // bits))
+    assert unpack_long_array(packed, SECTION_VOLUME, bits).tolist() == values
+    assert unpack_long_array(list(packed), SECTION_VOLUME, bits).tolist() == values
+
+
+@pytest.mark.parametrize(
+    "palette_size, min_bits, bits",
+    [(1, 4, 4), (16, 4, 4), (17, 4, 5), (1, 1, 1), (2, 1, 1), (5, 1, 3), (64, 1, 6)],
+)
+def test_bits_for_palette(palette_size: int, min_bits: int, bits: int) -> None:
+    assert bits_for_palette(palette_size, min_bits) == bits
+
+
+def make_section(
+    y: int,
+    blocks: list[str],
+    indices: list[int],
+    biomes_names: tuple[str, ...] = ("minecraft:plains",),
+    biome_indices: tuple[int, ...] = (),
+) -> TagCompound:
+    palette = [TagCompound(value=[TagString(name="Name", value=name)]) for name in blocks]
+    block_states = TagCompound(value=[TagList(name="palette", value=palette)])
+    if len(blocks) > 1:
+        block_states["data"] = TagLongArray(
+            value=pack_long_array(indices, bits_for_palette(len(blocks), 4))
+        )
+    biomes = TagCompound(
+        value=[
+            TagList(
+                name="palette", value=[TagString(value=name) for name in biomes_names]
+            )
+        ]
+    )
+    if len(biomes_names) > 1:
+        biomes["data"] = TagLongArray(
+            value=pack_long_array(biome_indices, bits_for_palette(len(biomes_names)))
+        )
+    return TagCompound(
+        value=[
+            TagByte(name="Y", value=y),
+            TagCompound(name="block_states", value=block_states.value),
+            TagCompound(name="biomes", value=biomes.value),
+        ]
+    )
+
+
+def test_sections() -> None:
+    indices = [0] * SECTION_VOLUME
+    indices[(3 * 16 + 2) * 16 + 1] = 1
+    indices[-1] = 2
+    blocks = ["minecraft:stone", "minecraft:diamond_ore", "minecraft:air"]
+    heights = list(range(256))
+    data = TagCompound(
+        value=[
+            TagList(
+                name="sections",
+                value=[
+                    make_section(-1, blocks, indices),
+                    make_section(0, ["minecraft:air"], []),
+                ],
+            ),
+            TagCompound(
+                name="Heightmaps",
+                value=[TagLongArray(name="WORLD_SURFACE", value=pack_long_array(heights, 9))],
+            ),
+        ]
+    )
+
+    sections = get_sections(data)
+    assert [section.y for section in sections] == [-1, 0]
+    assert sections[0].get_block(1, 3, 2).get_value("Name") == "minecraft:diamond_ore"
+    assert sections[1].get_block(1, 3, 2).get_value("Name") == "minecraft:air"
+    assert sections[0].get_biome(15, 15, 15).value == "minecraft:plains"
+    assert len(sections[0].biomes.indices) == BIOME_VOLUME
+
+    histogram = block_histogram(data)
+    assert histogram["minecraft:stone"] == SECTION_VOLUME - 2
+    assert histogram["minecraft:air"] == SECTION_VOLUME + 1
+    assert count_blocks(data, "minecraft:diamond_ore") == 1
+    assert get_heightmap(data).tolist() == heights
+    assert get_heightmap(data, "OCEAN_FLOOR") is None
+
+
+def test_sections_palette_bits() -> None:
+    # 5 biomes take 3 bits (4 longs), the same length as 4 bits, and 20 blocks take 5 bits.
+    biomes = [f"minecraft:biome_{index}" for index in range(5)]
+    biome_indices = [random.randrange(len(biomes)) for _ in range(BIOME_VOLUME)]
+    blocks = [f"minecraft:block_{index}" for index in range(20)]
+    indices = [random.randrange(len(blocks)) for _ in range(SECTION_VOLUME)]
+    data = TagCompound(
+        value=[
+            TagList(
+                name="sections",
+                value=[make_section(0, blocks, indices, tuple(biomes), tuple(biome_indices))],
+            )
+        ]
+    )
+
+    (section,) = get_sections(data)
+    assert section.biomes.indices.tolist() == biome_indices
+    assert section.blocks.indices.tolist() == indices
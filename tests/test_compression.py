@@ -0,0 +1,95 @@
+import io
+import os
+from typing import Optional
+
+import pytest
+
+from nbt_helper.compression import (
+    CODECS,
+    Codec,
+    CompressingWriter,
+    DecompressingReader,
+    LZ4Codec,
+    decompress_stream,
+    get_codec,
+    register_codec,
+    lz4_block_decompress,
+    xxhash32,
+)
+
+
+@pytest.mark.parametrize(
+    ["data", "expected_hash"],
+    [
+        (b"", 0x02CC5D05),
+        (b"a", 0x550D7456),
+        (b"abc", 0x32D153FF),
+        (b"Nobody inspects the spammish repetition", 0xE2293B2F),
+    ],
+)
+def test_xxhash32(data: bytes, expected_hash: int) -> None:
+    assert xxhash32(data) == expected_hash
+
+
+def test_lz4() -> None:
+    assert lz4_block_decompress(b"\x1fa\x01\x00\x00\x50aaaaa", 25) == b"a" * 25
+
+    data = os.urandom(1000) * 100
+    codec = LZ4Codec()
+    compressed = codec.compress(data)
+    assert compressed.startswith(b"LZ4Block")
+    assert codec.decompress(compressed) == data
+
+
+@pytest.mark.parametrize("compression", [0, 1, 2, 4])
+def test_codecs(compression: int) -> None:
+    data = b"Hello world!" * 1000
+    codec = get_codec(compression)
+    for level in (None, 1, 9):
+        assert codec.decompress(codec.compress(data, level)) == data
+
+    decompressor = codec.decompressobj()
+    compressed = codec.compress(data)
+    result = decompressor.decompress(compressed[:100])
+    result += decompressor.decompress(compressed[100:]) + decompressor.flush()
+    assert result == data
+
+
+def test_register_codec() -> None:
+    class ReversedCodec(Codec):
+        def compress(self, data, level: Optional[int] = None) -> bytes:
+            return bytes(data)[::-1]
+
+        def decompress(self, data) -> bytes:
+            return bytes(data)[::-1]
+
+    with pytest.raises(ValueError):
+        get_codec(100)
+    register_codec(100, ReversedCodec())
+    try:
+        assert get_codec(100).decompress(b"olleh") == b"hello"
+    finally:
+        del CODECS[100]
+    with pytest.raises(ValueError):
+        register_codec(200, ReversedCodec())
+
+
+@pytest.mark.parametrize("compression", [0, 1, 2, 4])
+def test_streams(compression: int) -> None:
+    data = os.urandom(1000) * 300
+    codec = get_codec(compression)
+    target = io.BytesIO()
+    with CompressingWriter(target, codec, 1) as writer:
+        for start in range(0, len(data), 5000):
+            writer.write(data[start : start + 5000])
+    assert codec.decompress(target.getvalue()) == data
+
+    reader = DecompressingReader(io.BytesIO(target.getvalue()), codec)
+    assert io.BufferedReader(reader).read() == data
+
+    if compression in (1, 2):
+        truncated = target.getvalue()[:-10]
+        with pytest.raises(ValueError):
+            io.BufferedReader(DecompressingReader(io.BytesIO(truncated), codec)).read()
+        with pytest.raises(ValueError):
+            decompress_stream(io.BytesIO(truncated), codec)
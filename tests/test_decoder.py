@@ -0,0 +1,74 @@
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from nbt_helper.decoder import decode
+from nbt_helper.encoder import encode
+from nbt_helper.tags import (
+    BinaryHandler,
+    ByteOrder,
+    TagCompound,
+    TagList,
+    TagString,
+    TAG_COMPOUND,
+)
+
+FILES_DIRECTORY = Path(__file__).parent.joinpath("data", "files")
+
+
+@pytest.mark.parametrize(
+    ["filename", "byte_order"],
+    [("je_uncompressed.nbt", ByteOrder.BIG), ("pe_uncompressed.nbt", ByteOrder.LITTLE)],
+)
+def test_decode(filename: str, byte_order: ByteOrder) -> None:
+    data = FILES_DIRECTORY.joinpath(filename).read_bytes()
+    handler = BinaryHandler(byte_order)
+    buffer = BytesIO(data[1:])
+    name = TagString(handler, buffer=buffer).value
+    expected = TagCompound(handler, name=name, buffer=buffer)
+
+    tag, offset = decode(data, byte_order)
+    assert tag == expected
+    assert offset == buffer.tell() + 1
+    assert decode(memoryview(data), byte_order, 3, TAG_COMPOUND)[0].value == expected.value
+
+
+@pytest.mark.parametrize(
+    "data", [b"\x0a\x00\x00\x03\x00\x01a\x00", b"\x0a\x00\x00\x0f\x00\x00", b"\x08\x00\x05ab"]
+)
+def test_decode_errors(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+def test_compact_lists() -> None:
+    tag, _ = decode(b"\x09\x00\x00\x06\x00\x00\x00\x02" + bytes(16))
+    assert tag.is_compact()
+    assert tag.get_numbers().tolist() == [0.0, 0.0]
+
+
+@pytest.mark.parametrize(
+    ["filename", "byte_order"],
+    [("je_uncompressed.nbt", ByteOrder.BIG), ("pe_uncompressed.nbt", ByteOrder.LITTLE)],
+)
+def test_lazy_decode(filename: str, byte_order: ByteOrder) -> None:
+    data = FILES_DIRECTORY.joinpath(filename).read_bytes()
+    expected, _ = decode(data, byte_order)
+    tag, offset = decode(data, byte_order, lazy=True)
+    assert offset == len(data)
+
+    raw = [item for item in tag if isinstance(item, (TagCompound, TagList))]
+    assert raw and all(item.is_raw() for item in raw)
+    assert encode(tag, byte_order, tag.name) == data
+    assert all(item.is_raw() for item in raw)
+    buffer = BytesIO()
+    tag.write_to_buffer(buffer, BinaryHandler(byte_order))
+    assert buffer.getvalue() == data[3 + len(tag.name.encode()) :]
+
+    # Raw payload is not written with another byte order.
+    other_order = ByteOrder.LITTLE if byte_order is ByteOrder.BIG else ByteOrder.BIG
+    assert encode(tag, other_order, tag.name) == encode(expected, other_order, tag.name)
+
+    assert tag == expected
+    assert not any(item.is_raw() for item in raw)
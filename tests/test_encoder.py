@@ -0,0 +1,45 @@
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from nbt_helper.decoder import decode
+from nbt_helper.encoder import encode
+from nbt_helper.tags import (
+    BinaryHandler,
+    ByteOrder,
+    TagCompound,
+    TagList,
+    TagString,
+)
+
+FILES_DIRECTORY = Path(__file__).parent.joinpath("data", "files")
+
+
+@pytest.mark.parametrize(
+    ["filename", "byte_order"],
+    [("je_uncompressed.nbt", ByteOrder.BIG), ("pe_uncompressed.nbt", ByteOrder.LITTLE)],
+)
+def test_encode(filename: str, byte_order: ByteOrder) -> None:
+    data = FILES_DIRECTORY.joinpath(filename).read_bytes()
+    tag = decode(data, byte_order)[0]
+    buffer = BytesIO()
+    tag.write_to_buffer(buffer, BinaryHandler(byte_order))
+
+    assert tag.encoded_size() == len(buffer.getvalue())
+    assert encode(tag, byte_order, name=None) == buffer.getvalue()
+    assert encode(tag, byte_order, name="") == data
+
+    encoded = encode(tag, byte_order, prefix=4)
+    assert encoded[:4] == bytes(4)
+    assert encoded[4:] == data
+
+
+def test_encoded_size() -> None:
+    tag = TagCompound(
+        value=[
+            TagString(name="Wörld", value="🌍"),
+            TagList(name="Empty"),
+        ]
+    )
+    assert tag.encoded_size() == len(encode(tag, name=None)) == 1 + 9 + 6 + 8 + 5
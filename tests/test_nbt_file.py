@@ -1,9 +1,14 @@
+import os
 import zlib
 import gzip
 from pathlib import Path
 from io import BytesIO
 
-from nbt_helper.file import NBTFile, FileTypes
+import pytest
+
+from nbt_helper.compression import STREAM_CHUNK_SIZE
+from nbt_helper.file import COMPRESSED_FILE_TYPES, HANDLERS, NBTFile, FileTypes
+from nbt_helper.tags import TagByteArray, TagCompound, TagList, TagString
 
 
 FILES_DIRECTORY = Path(__file__).parent.joinpath("data", "files")
@@ -43,3 +48,66 @@ def test_nbt_file() -> None:
         file.save(buffer=buffer)
 
         assert compare(buffer, filepath, file.get_file_type()) == True
+
+
+class ChunkedReader(BytesIO):
+    """Fails if the whole file is requested at once."""
+
+    def read(self, size=-1):
+        assert 0 < size <= STREAM_CHUNK_SIZE
+        return super().read(size)
+
+
+@pytest.mark.parametrize("file_type", COMPRESSED_FILE_TYPES)
+def test_streaming(file_type: FileTypes) -> None:
+    file = NBTFile()
+    file.data = TagCompound(
+        value=[
+            TagByteArray(name="Data", value=os.urandom(STREAM_CHUNK_SIZE * 3)),
+            TagList(name="Items", value=[TagString(value="a" * 100)] * 2000),
+        ]
+    )
+    buffer = BytesIO()
+    file.save(buffer=buffer, type=file_type, compression_level=1)
+
+    loaded = NBTFile(buffer=ChunkedReader(buffer.getvalue()))
+    assert loaded.get_file_type() is file_type
+    assert loaded.data == file.data
+
+
+@pytest.mark.parametrize("file_type", COMPRESSED_FILE_TYPES)
+def test_tag_by_tag_streaming(file_type: FileTypes) -> None:
+    data = TagCompound(
+        value=[
+            TagByteArray(name="Data", value=os.urandom(STREAM_CHUNK_SIZE * 3)),
+            TagList(name="Items", value=[TagString(value="a" * 100)] * 2000),
+        ]
+    )
+    handler = HANDLERS[file_type]
+    buffer = BytesIO()
+    handler.write(data, buffer, level=1, streaming=True)
+    expected = BytesIO()
+    handler.write(data, expected, level=1)
+
+    assert zlib.decompress(buffer.getvalue(), zlib.MAX_WBITS | 32) == zlib.decompress(
+        expected.getvalue(), zlib.MAX_WBITS | 32
+    )
+    assert handler.read(ChunkedReader(buffer.getvalue()), streaming=True) == data
+
+
+@pytest.mark.parametrize("file_type", COMPRESSED_FILE_TYPES)
+def test_nbt_file_streaming(file_type: FileTypes) -> None:
+    file = NBTFile()
+    file.data = TagCompound(
+        value=[TagByteArray(name="Data", value=os.urandom(STREAM_CHUNK_SIZE * 3))]
+    )
+    buffer = BytesIO()
+    file.save(buffer=buffer, type=file_type, compression_level=1, streaming=True)
+
+    loaded = NBTFile(buffer=ChunkedReader(buffer.getvalue()), streaming=True)
+    assert loaded.get_file_type() is file_type
+    assert loaded.data == file.data
+
+    # Stream that ends too early is not parsed as shorter data.
+    with pytest.raises(ValueError):
+        NBTFile(buffer=BytesIO(buffer.getvalue()[:-100]), streaming=True)
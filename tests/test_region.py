@@ -0,0 +1,396 @@
+import os
+import pickle
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from nbt_helper.region import (
+    Region,
+    RegionReader,
+    Chunk,
+    CompressionTypes,
+    location_from_cords,
+    read_chunk_infos,
+)
+from nbt_helper.tags import (
+    BinaryHandler,
+    ByteOrder,
+    TagByteArray,
+    TagCompound,
+    TagInt,
+    TagList,
+    TagString,
+)
+
+
+def make_chunk(x: int, z: int) -> Chunk:
+    handler = BinaryHandler(ByteOrder.BIG)
+    data = TagCompound(
+        handler,
+        value=[
+            TagInt(handler, name="xPos", value=x),
+            TagInt(handler, name="zPos", value=z),
+            TagString(handler, name="Status", value="minecraft:full"),
+        ],
+    )
+    return Chunk(x, z, timestamp=1000 + x, compression=2, data=data)
+
+
+@pytest.fixture
+def region_file(tmp_path: Path) -> Path:
+    region = Region(1, -2)
+    region.chunks = [make_chunk(x, z) for x, z in ((0, 0), (5, 3), (31, 31))]
+    region.write_region_file(tmp_path)
+    return tmp_path.joinpath("r.1.-2.mca")
+
+
+def test_eager_load(region_file: Path) -> None:
+    region = Region(filepath=region_file)
+    assert (region.x, region.z) == (1, -2)
+    assert len(region.chunks) == 1024
+    chunk = region.get_chunk(5, 3)
+    assert chunk == make_chunk(5, 3)
+    assert chunk.timestamp == 1005
+    assert chunk.compression == CompressionTypes.ZLIB_COMPRESSED.value
+    assert region.get_chunk(1, 1).is_empty()
+
+
+def test_lazy_load(region_file: Path) -> None:
+    region = Region(filepath=region_file, lazy=True, cache_size=2)
+    assert region.is_lazy()
+    assert len(region.chunks) == 1024
+
+    chunk = region.get_chunk(5, 3)
+    assert chunk == make_chunk(5, 3)
+    assert region.get_chunk(5, 3) is chunk
+
+    region.get_chunk(0, 0)
+    region.get_chunk(31, 31)
+    assert region.get_chunk(5, 3) is not chunk
+
+    eager = Region(filepath=region_file)
+    assert list(region.chunks) == eager.chunks
+
+
+def test_lazy_cache_keeps_modified_chunks(region_file: Path, tmp_path: Path) -> None:
+    region = Region(filepath=region_file, lazy=True, cache_size=1)
+    chunk = region.get_chunk(5, 3)
+    chunk.data["Status"].value = "minecraft:features"
+    region.get_chunk(0, 0)
+    region.get_chunk(31, 31)
+    assert region.get_chunk(5, 3) is chunk
+
+    output = tmp_path.joinpath("output")
+    output.mkdir()
+    region.write_region_file(output)
+    saved = Region(filepath=output.joinpath(region_file.name))
+    assert saved.get_chunk(5, 3).data["Status"].value == "minecraft:features"
+
+    # Saved chunk is clean and can be evicted again.
+    region.save_chunk(chunk)
+    assert not chunk.is_dirty()
+    region.get_chunk(0, 0)
+    region.get_chunk(31, 31)
+    assert region.get_chunk(5, 3) is not chunk
+    assert region.get_chunk(5, 3) == chunk
+
+
+def test_lazy_write_region_file(region_file: Path, tmp_path: Path) -> None:
+    region = Region(filepath=region_file, lazy=True, cache_size=1)
+    chunk = region.get_chunk(5, 3)
+    chunk.data["Status"].value = "minecraft:features"
+    region.get_chunk(0, 0)
+
+    output = tmp_path.joinpath("output")
+    output.mkdir()
+    region.write_region_file(output)
+    written = output.joinpath(region_file.name)
+    # Chunks that were not modified are copied without decoding them.
+    with RegionReader(region_file) as source, RegionReader(written) as target:
+        for index in (location_from_cords(0, 0), location_from_cords(31, 31)):
+            assert bytes(source.read_raw(index)[1]) == bytes(target.read_raw(index)[1])
+    saved = Region(filepath=written)
+    assert saved.get_chunk(5, 3) == chunk
+    assert saved.get_chunk(31, 31) == make_chunk(31, 31)
+
+    with pytest.raises(ValueError):
+        Region(filepath=region_file, lazy=True, cache_size=0).write_region_file(output)
+
+
+def test_concurrent_lazy_reads(region_file: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cords = [(0, 0), (5, 3), (31, 31)] * 20
+    with Region(filepath=region_file, lazy=True, cache_size=1) as region:
+        with ThreadPoolExecutor(4) as pool:
+            chunks = list(pool.map(lambda cord: region.get_chunk(*cord), cords))
+    assert chunks == [make_chunk(*cord) for cord in cords]
+
+
+
+def test_lazy_reads_during_save(region_file: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cords = [(0, 0), (31, 31)] * 50
+    with Region(filepath=region_file, lazy=True, cache_size=0) as region:
+        with ThreadPoolExecutor(4) as pool:
+            reads = pool.map(lambda cord: region.get_chunk(*cord), cords)
+            for _ in range(20):
+                region.save_chunk(make_chunk(5, 3))
+            chunks = list(reads)
+    assert chunks == [make_chunk(*cord) for cord in cords]
+
+
+def test_pickle_chunk(region_file: Path) -> None:
+    with RegionReader(region_file) as reader:
+        raw = reader.read_chunk(location_from_cords(5, 3), decode=False)
+        decoded = reader.read_chunk(location_from_cords(5, 3))
+
+    copy = pickle.loads(pickle.dumps(raw))
+    assert copy._raw == raw._raw and not copy.is_dirty()
+    copy = pickle.loads(pickle.dumps(decoded))
+    assert copy._raw is None and copy.is_dirty()
+    assert copy == decoded == make_chunk(5, 3)
+
+def test_chunk_infos(region_file: Path) -> None:
+    infos = read_chunk_infos(region_file)
+    assert [(info.x, info.z) for info in infos] == [(0, 0), (5, 3), (31, 31)]
+    assert [info.offset for info in infos] == [2, 3, 4]
+    assert all(info.sector_count == 1 for info in infos)
+    assert all(info.compression == 2 for info in infos)
+    assert infos[1].timestamp == 1005
+
+    with RegionReader(region_file) as reader:
+        compression, payload = reader.read_raw(location_from_cords(5, 3))
+        assert len(payload) == infos[1].length
+        payload.release()
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_save_chunk(region_file: Path, lazy: bool) -> None:
+    region = Region(filepath=region_file, lazy=lazy)
+    chunk = region.get_chunk(5, 3)
+    chunk.data["Status"].value = "minecraft:features"
+    region.save_chunk(chunk)
+    assert read_chunk_infos(region_file)[1].offset == 3
+
+    chunk.data["Big"] = TagString(BinaryHandler(ByteOrder.BIG), value=os.urandom(3000).hex())
+    chunk.compression = CompressionTypes.UNCOMPRESSED.value
+    region.save_chunk(chunk)
+    infos = read_chunk_infos(region_file)
+    assert (infos[1].offset, infos[1].sector_count) == (5, 2)
+
+    region.save_chunk(Chunk(0, 0))
+    new_chunk = make_chunk(1, 0)
+    region.save_chunk(new_chunk)
+    assert [(info.x, info.z, info.offset) for info in read_chunk_infos(region_file)] == [
+        (1, 0, 2),
+        (5, 3, 5),
+        (31, 31, 4),
+    ]
+
+    assert region.get_chunk(5, 3) == chunk
+    region.close()
+    reloaded = Region(filepath=region_file)
+    assert reloaded.get_chunk(5, 3) == chunk
+    assert reloaded.get_chunk(1, 0) == new_chunk
+    assert reloaded.get_chunk(0, 0).is_empty()
+
+
+def test_dirty_tracking(region_file: Path) -> None:
+    with RegionReader(region_file) as reader:
+        index = location_from_cords(5, 3)
+        compression, payload = reader.read_raw(index)
+        raw = bytes(payload)
+        payload.release()
+
+        chunk = reader.read_chunk(index, decode=False)
+        assert not chunk.is_dirty()
+        assert chunk._encode_payload() == raw
+
+        chunk = reader.read_chunk(index)
+        assert not chunk.is_dirty()
+        chunk.data["Status"].value = "minecraft:empty"
+        assert chunk.is_dirty()
+        assert chunk._encode_payload() != raw
+
+        chunk = reader.read_chunk(index)
+        chunk.mark_dirty()
+        assert chunk.is_dirty()
+        assert zlib.decompress(chunk._encode_payload()) == zlib.decompress(raw)
+
+    assert make_chunk(0, 0).is_dirty()
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_save_chunks(region_file: Path, lazy: bool) -> None:
+    region = Region(filepath=region_file, lazy=lazy)
+    original = region_file.read_bytes()
+
+    def interrupted():
+        chunk = region.get_chunk(5, 3)
+        chunk.data["Status"].value = "minecraft:features"
+        yield chunk
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        region.save_chunks(interrupted())
+    # Chunk data was written into new sectors, the header and old chunks are untouched.
+    assert region_file.read_bytes()[: len(original)] == original
+    assert Region(filepath=region_file).get_chunk(5, 3) == make_chunk(5, 3)
+
+    region = Region(filepath=region_file, lazy=lazy)
+    chunk = region.get_chunk(5, 3)
+    chunk.data["Status"].value = "minecraft:features"
+    assert region.save_chunks([chunk, Chunk(0, 0), make_chunk(1, 0)]) == 3
+    assert region.save_chunks([]) == 0
+    infos = read_chunk_infos(region_file)
+    assert [(info.x, info.z) for info in infos] == [(1, 0), (5, 3), (31, 31)]
+    assert infos[1].offset not in (2, 3)
+    assert Region(filepath=region_file).get_chunk(5, 3) == chunk
+    assert region.get_chunk(1, 0) == make_chunk(1, 0)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_compact(region_file: Path, lazy: bool) -> None:
+    region = Region(filepath=region_file, lazy=lazy)
+    region.save_chunk(Chunk(0, 0))
+    region.save_chunk(Chunk(5, 3))
+    assert os.path.getsize(region_file) == 5 * 4096
+
+    report = region.compact(dry_run=True)
+    assert (report.free_sectors, report.reclaimed_bytes) == (2, 2 * 4096)
+    assert os.path.getsize(region_file) == 5 * 4096
+
+    report = region.compact()
+    assert report.reclaimed_bytes == 2 * 4096
+    assert os.path.getsize(region_file) == 3 * 4096
+    assert [(info.x, info.z, info.offset) for info in read_chunk_infos(region_file)] == [
+        (31, 31, 2)
+    ]
+    assert region.get_chunk(31, 31) == make_chunk(31, 31)
+    region.close()
+    assert Region(filepath=region_file).get_chunk(31, 31) == make_chunk(31, 31)
+
+
+def test_copy_chunk_from(region_file: Path, tmp_path: Path) -> None:
+    source = Region(filepath=region_file, lazy=True)
+    target_file = tmp_path.joinpath("r.0.0.mca")
+    target_file.write_bytes(bytes(8192))
+    target = Region(filepath=target_file, lazy=True)
+
+    copied = target.copy_chunk_from(source, 5, 3)
+    target.copy_chunk_from(source, 0, 0, 7, 9, patch_position=True)
+    source.close()
+    target.close()
+
+    with RegionReader(region_file) as reader:
+        original = reader.read_raw(location_from_cords(5, 3))[1].tobytes()
+    with RegionReader(target_file) as reader:
+        assert reader.read_raw(location_from_cords(5, 3))[1].tobytes() == original
+
+    target = Region(filepath=target_file)
+    assert target.get_chunk(5, 3) == copied == make_chunk(5, 3)
+    moved = target.get_chunk(7, 9).data
+    assert (moved["xPos"].value, moved["zPos"].value) == (7, 9)
+    assert moved["Status"].value == "minecraft:full"
+
+
+def test_external_chunk(region_file: Path) -> None:
+    region = Region(filepath=region_file)
+    chunk = region.get_chunk(5, 3)
+    chunk.data["Big"] = TagByteArray(
+        BinaryHandler(ByteOrder.BIG), value=bytearray(os.urandom(1100000))
+    )
+    region.save_chunk(chunk)
+
+    external_file = region_file.parent.joinpath("c.37.-61.mcc")
+    assert external_file.exists()
+    info = read_chunk_infos(region_file)[1]
+    assert (info.sector_count, info.length, info.compression) == (1, 1, 130)
+
+    region.write_region_file(region_file.parent)
+    external_file.unlink()
+    region.write_region_file(region_file.parent)
+    assert external_file.exists()
+
+    reloaded = Region(filepath=region_file, lazy=True)
+    assert reloaded.get_chunk(5, 3) == chunk
+    assert reloaded.get_chunk(5, 3).compression == 2
+
+    # Untouched external chunk keeps its payload, also through the legacy buffer reader.
+    assert not Region(filepath=region_file).get_chunk(5, 3).is_dirty()
+    legacy = Chunk()
+    with open(region_file, "rb") as file:
+        legacy.read_chunk(location_from_cords(5, 3), file)
+    assert legacy == chunk and not legacy.is_dirty()
+    with pytest.raises(ValueError):
+        with open(region_file, "rb") as file:
+            Chunk().read_chunk(location_from_cords(5, 3), BytesIO(file.read()))
+
+    # Chunk that fits into the region file again no longer needs the external file.
+    del chunk.data["Big"]
+    region.save_chunks([chunk])
+    assert not external_file.exists()
+    assert Region(filepath=region_file).get_chunk(5, 3) == make_chunk(5, 3)
+
+
+def test_lz4_chunk(region_file: Path) -> None:
+    region = Region(filepath=region_file)
+    chunk = region.get_chunk(5, 3)
+    chunk.compression = CompressionTypes.LZ4_COMPRESSED.value
+    region.save_chunk(chunk, compression_level=1)
+    assert read_chunk_infos(region_file)[1].compression == 4
+    assert Region(filepath=region_file).get_chunk(5, 3) == make_chunk(5, 3)
+
+
+def test_workers(region_file: Path, tmp_path: Path) -> None:
+    region = Region(filepath=region_file, workers=4)
+    assert region.chunks == Region(filepath=region_file).chunks
+
+    for chunk in region.chunks:
+        chunk.mark_dirty()
+    serial_folder = tmp_path.joinpath("serial")
+    parallel_folder = tmp_path.joinpath("parallel")
+    serial_folder.mkdir()
+    parallel_folder.mkdir()
+    region.write_region_file(serial_folder, compression_level=9)
+    region.write_region_file(parallel_folder, compression_level=9, workers=4)
+    assert (
+        serial_folder.joinpath(region_file.name).read_bytes()
+        == parallel_folder.joinpath(region_file.name).read_bytes()
+    )
+
+
+def test_chunk_read_paths(region_file: Path) -> None:
+    with RegionReader(region_file) as reader:
+        chunk = reader.read_chunk(location_from_cords(5, 3), decode=False)
+        result = chunk.read_paths(["Status", "zPos", "Level/Status"])
+        assert not chunk._is_decoded()
+        assert result == {"Status": chunk.data["Status"], "zPos": chunk.data["zPos"]}
+        assert chunk.read_paths(["Status", "zPos", "Level/Status"]) == result
+
+
+def test_lazy_tags(tmp_path: Path) -> None:
+    chunk = make_chunk(5, 3)
+    chunk.data["Level"] = TagCompound(
+        value=[TagList(name="Entities", value=[TagCompound(value=[TagInt(name="id")])])]
+    )
+    region = Region(1, -2)
+    region.chunks = [chunk]
+    region.write_region_file(tmp_path)
+    filepath = tmp_path.joinpath("r.1.-2.mca")
+
+    region = Region(filepath=filepath, lazy=True, lazy_tags=True)
+    lazy_chunk = region.get_chunk(5, 3)
+    assert lazy_chunk.data["Level"].is_raw()
+    assert not lazy_chunk.is_dirty()
+    lazy_chunk.data["Status"].value = "minecraft:empty"
+    region.save_chunk(lazy_chunk)
+    assert lazy_chunk.data["Level"].is_raw()
+    region.close()
+
+    chunk.data["Status"].value = "minecraft:empty"
+    assert Region(filepath=filepath).get_chunk(5, 3) == chunk
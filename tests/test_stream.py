@@ -0,0 +1,139 @@
+from array import array
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from nbt_helper.file import JE_Uncompressed, BE_Uncompressed
+from nbt_helper.stream import Event, EventTypes, iterparse, read_paths
+from nbt_helper.tags import (
+    BinaryHandler,
+    ByteOrder,
+    TagByte,
+    TagCompound,
+    TagIntArray,
+    TagList,
+    TagString,
+    TAG_BYTE,
+    TAG_COMPOUND,
+    TAG_INT_ARRAY,
+    TAG_LIST,
+    TAG_STRING,
+)
+
+FILES_DIRECTORY = Path(__file__).parent.joinpath("data", "files")
+
+
+def make_data(byte_order: ByteOrder) -> TagCompound:
+    handler = BinaryHandler(byte_order)
+    return TagCompound(
+        handler,
+        name="Root",
+        value=[
+            TagList(
+                handler,
+                name="Items",
+                value=[
+                    TagCompound(handler, value=[TagByte(handler, name="Count", value=3)]),
+                    TagCompound(handler, value=[TagByte(handler, name="Count", value=5)]),
+                ],
+            ),
+            TagString(handler, name="Name", value="Chest"),
+            TagIntArray(handler, name="Pos", value=[1, -2, 3]),
+        ],
+    )
+
+
+EXPECTED_EVENTS = [
+    Event(EventTypes.START, TAG_COMPOUND, "Root"),
+    Event(EventTypes.START, TAG_LIST, "Items", (TAG_COMPOUND, 2)),
+    Event(EventTypes.START, TAG_COMPOUND, ""),
+    Event(EventTypes.VALUE, TAG_BYTE, "Count", 3),
+    Event(EventTypes.END, TAG_COMPOUND, ""),
+    Event(EventTypes.START, TAG_COMPOUND, ""),
+    Event(EventTypes.VALUE, TAG_BYTE, "Count", 5),
+    Event(EventTypes.END, TAG_COMPOUND, ""),
+    Event(EventTypes.END, TAG_LIST, "Items"),
+    Event(EventTypes.VALUE, TAG_STRING, "Name", "Chest"),
+    Event(EventTypes.VALUE, TAG_INT_ARRAY, "Pos", array("i", [1, -2, 3])),
+    Event(EventTypes.END, TAG_COMPOUND, "Root"),
+]
+
+
+@pytest.mark.parametrize(
+    ["handler", "byte_order"],
+    [(JE_Uncompressed, ByteOrder.BIG), (BE_Uncompressed, ByteOrder.LITTLE)],
+)
+def test_iterparse(handler, byte_order: ByteOrder) -> None:
+    buffer = BytesIO()
+    handler.write(make_data(byte_order), buffer)
+    buffer.seek(0)
+    events = list(iterparse(buffer, byte_order))
+    # The root name is not written by file handlers.
+    assert events[1:-1] == EXPECTED_EVENTS[1:-1]
+    assert buffer.read() == b""
+
+    buffer = BytesIO()
+    make_data(byte_order).write_to_buffer(buffer, BinaryHandler(byte_order))
+    buffer.seek(0)
+    events = list(iterparse(buffer, byte_order, tag_id=TAG_COMPOUND))
+    assert events[1:-1] == EXPECTED_EVENTS[1:-1]
+
+
+def test_iterparse_file() -> None:
+    filepath = FILES_DIRECTORY.joinpath("je_uncompressed.nbt")
+    with open(filepath, "rb") as file:
+        data = JE_Uncompressed.read(file)
+        file.seek(0)
+        events = list(iterparse(file))
+
+    depth, names = 0, []
+    for event in events:
+        if event.type is EventTypes.END:
+            depth -= 1
+            continue
+        if depth == 1:
+            names.append(event.name)
+        if event.type is EventTypes.START:
+            depth += 1
+
+    assert depth == 0
+    assert names == [tag.name for tag in data]
+
+
+@pytest.mark.parametrize("byte_order", [ByteOrder.BIG, ByteOrder.LITTLE])
+def test_read_paths(byte_order: ByteOrder) -> None:
+    handler = BinaryHandler(byte_order)
+    data = make_data(byte_order)
+    data["Level"] = TagCompound(
+        handler,
+        value=[
+            TagString(handler, name="Status", value="full"),
+            TagByte(handler, name="Light", value=1),
+        ],
+    )
+    buffer = BytesIO()
+    data.write_to_buffer(buffer, handler)
+
+    buffer.seek(0)
+    result = read_paths(
+        buffer, ["Name", ("Level", "Status"), "Pos/X", "Missing"], byte_order, TAG_COMPOUND
+    )
+    assert result == {
+        "Name": data["Name"],
+        ("Level", "Status"): data["Level"]["Status"],
+    }
+
+    buffer.seek(0)
+    result = read_paths(buffer, ["Level", "Level/Light"], byte_order, TAG_COMPOUND)
+    assert result["Level"] == data["Level"]
+    assert result["Level/Light"] == data["Level"]["Light"]
+
+
+def test_read_paths_stops_early() -> None:
+    data = make_data(ByteOrder.BIG)
+    buffer = BytesIO()
+    JE_Uncompressed.write(data, buffer)
+    buffer.seek(0)
+    assert read_paths(buffer, ["Items"]) == {"Items": data["Items"]}
+    assert buffer.read(1) == bytes([TAG_STRING])
@@ -0,0 +1,53 @@
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from nbt_helper.decoder import decode
+from nbt_helper.encoder import encode
+from nbt_helper.file import FileTypes, NBTFile
+from nbt_helper.tags import ByteOrder
+from nbt_helper.transcode import transcode, transcode_file
+
+FILES_DIRECTORY = Path(__file__).parent.joinpath("data", "files")
+
+
+@pytest.mark.parametrize(
+    ["filename", "byte_order"],
+    [("je_uncompressed.nbt", ByteOrder.BIG), ("pe_uncompressed.nbt", ByteOrder.LITTLE)],
+)
+def test_transcode(filename: str, byte_order: ByteOrder) -> None:
+    data = FILES_DIRECTORY.joinpath(filename).read_bytes()
+    tag, _ = decode(data, byte_order)
+    for target_order in ByteOrder:
+        result = transcode(data + b"\x00", byte_order, target_order, prefix=2)
+        assert result == bytes(2) + encode(tag, target_order, tag.name)
+
+    for target_order in ByteOrder:
+        with pytest.raises(ValueError):
+            transcode(data[:-5], byte_order, target_order)
+
+
+@pytest.mark.parametrize(
+    ["filename", "target_type"],
+    [
+        ("je_gzip.nbt", FileTypes.BE_WITH_HEADER),
+        ("je_uncompressed.nbt", FileTypes.BE_UNCOMPRESSED),
+        ("pe_uncompressed_with_header.nbt", FileTypes.JE_ZLIB_COMPRESSED),
+        ("pe_uncompressed.nbt", FileTypes.BE_WITH_HEADER),
+    ],
+)
+def test_transcode_file(filename: str, target_type: FileTypes) -> None:
+    source = NBTFile(filepath=FILES_DIRECTORY.joinpath(filename))
+    source_type = source.get_file_type()
+    expected = BytesIO()
+    source.save(buffer=expected, type=target_type)
+
+    target = BytesIO()
+    with open(FILES_DIRECTORY.joinpath(filename), "rb") as file:
+        transcode_file(file, target, source_type, target_type)
+    result = NBTFile(buffer=BytesIO(target.getvalue()))
+    assert result.get_file_type() is target_type
+    assert result.data == source.data
+    if target_type not in (FileTypes.JE_ZLIB_COMPRESSED, FileTypes.JE_GZIP_COMPRESSED):
+        assert target.getvalue() == expected.getvalue()
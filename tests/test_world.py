@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from nbt_helper.region import Chunk, Region
+from nbt_helper.world import World, Dimension
+from nbt_helper.tags import BinaryHandler, ByteOrder, TagCompound, TagInt
+
+
+def make_chunk(x: int, z: int, value: int) -> Chunk:
+    handler = BinaryHandler(ByteOrder.BIG)
+    data = TagCompound(handler, value=[TagInt(handler, name="Value", value=value)])
+    return Chunk(x, z, compression=2, data=data)
+
+
+def chunk_value(chunk: Chunk) -> int:
+    return chunk.data["Value"].value
+
+
+@pytest.fixture
+def world(tmp_path: Path) -> World:
+    for folder, region_x, values in (
+        ("region", 0, [1, 2]),
+        ("region", -1, [3]),
+        ("entities", 0, [4]),
+        ("DIM-1/region", 0, [5, 6]),
+    ):
+        path = tmp_path.joinpath(folder)
+        path.mkdir(parents=True, exist_ok=True)
+        region = Region(region_x, 0)
+        region.chunks = [make_chunk(x, 0, value) for x, value in enumerate(values)]
+        region.write_region_file(path)
+    tmp_path.joinpath("region", "not_a_region.txt").write_text("")
+    return World(tmp_path)
+
+
+def test_region_files(world: World) -> None:
+    assert [dimension.path for dimension in world.dimensions()] == [
+        world.path,
+        world.path.joinpath("DIM-1"),
+    ]
+    assert [path.name for path in Dimension(world.path).region_files()] == [
+        "r.-1.0.mca",
+        "r.0.0.mca",
+        "r.0.0.mca",
+    ]
+    assert len(world.region_files(["region"])) == 3
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_scan(world: World, processes: int) -> None:
+    results = world.scan(chunk_value, processes=processes, max_pending=1)
+    assert sorted((r.region_x, r.value) for r in results) == [
+        (-1, 3),
+        (0, 1),
+        (0, 2),
+        (0, 4),
+        (0, 5),
+        (0, 6),
+    ]
+
+    results = world.scan(chunk_value, sum, folders=["region"], processes=processes)
+    assert sorted(result.value for result in results) == [3, 3, 11]
+
+    chunks = [result.value for result in Dimension(world.path).scan(processes=processes)]
+    assert sorted(chunk_value(chunk) for chunk in chunks) == [1, 2, 3, 4]
+
+
+def increment_odd(chunk: Chunk) -> None:
+    if chunk.data["Value"].value % 2:
+        chunk.data["Value"].value += 10
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_transform(world: World, processes: int) -> None:
+    journal = world.path.joinpath("journal.txt")
+    region_files = world.region_files(["region"])
+    journal.write_text(f"{region_files[0]}\n")
+
+    progress = []
+    results = world.transform(
+        increment_odd,
+        processes=processes,
+        journal=journal,
+        progress=lambda done, total, result: progress.append((done, total)),
+    )
+    assert sorted(result.changed_chunks for result in results) == [1, 1]
+    assert progress == [(2, 3), (3, 3)]
+    assert sorted(journal.read_text().splitlines()) == sorted(map(str, region_files))
+
+    values = [r.value for r in world.scan(chunk_value, folders=["region"], processes=1)]
+    assert sorted(values) == [2, 3, 6, 11, 15]
+    assert world.transform(increment_odd, processes=processes, journal=journal) == []